@@ -0,0 +1,369 @@
+"""Store benchmark baselines and flag regressions against them.
+
+Baselines are JSON records under ``<store>/<machine>/<kind>/<engine>/<commit>.json``:
+
+* ``kind`` is ``perf`` (a ``benchmarks.perf --json`` report, one record
+  per engine) or ``accuracy`` (a ``benchmarks.run --json`` result);
+* ``machine`` is a short hash of CPU model, core count, OS and Python
+  version (``machine_fingerprint``), so timings are only compared with
+  timings from the same kind of machine;
+* ``commit`` is ``git rev-parse HEAD`` (``+dirty`` with local changes).
+
+``check`` compares a new report with the most recently created baseline
+(by the record's ``created`` timestamp, which survives copies and cache
+restores that rewrite file times) or ``--baseline-commit``:
+
+* perf — per-document latencies of all timed passes, each divided by
+  the baseline median of the same document (documents differ in length
+  by orders of magnitude), are compared with a one-sided Mann-Whitney U
+  test; an engine regresses when it is slower with ``p < --alpha``
+  *and* its warm docs/sec dropped by more than ``--threshold``
+  (relative);
+* accuracy — exact and overlap span F1 regress when they drop by more
+  than ``--f1-threshold`` (absolute).
+
+The command exits with status 1 on any regression.  An engine without a
+baseline is reported as not compared (a warning on stderr); with
+``--require-baseline`` that is an error, exit status 2.
+
+The default store is a per-user cache directory, outside the checkout,
+so that baselines recorded on ``main`` are still there for later runs.
+In CI, persist ``BENCH_BASELINE_DIR`` (e.g. with a cache action) or the
+check has nothing to compare with.
+
+Usage:
+    python -m benchmarks.compare save REPORT.json [--store DIR]
+    python -m benchmarks.compare check REPORT.json [--store DIR] [OPTIONS]
+
+Examples:
+    python -m benchmarks.perf --json -o perf.json
+    python -m benchmarks.compare save perf.json                  # on main
+    python -m benchmarks.compare check perf.json --threshold 0.1 # on a PR
+    python -m benchmarks.run -d benchmarks/fixtures --json -o acc.json
+    python -m benchmarks.compare check acc.json --f1-threshold 0.005
+
+Environment:
+    BENCH_BASELINE_DIR  Override the default store
+                        (``$XDG_CACHE_HOME/refex/baselines``, by default
+                        ``~/.cache/refex/baselines``)
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+from datetime import UTC, datetime
+from pathlib import Path
+
+
+def get_store_dir() -> Path:
+    """Resolve the baseline store from env or default."""
+    env = os.environ.get("BENCH_BASELINE_DIR")
+    if env:
+        return Path(env)
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    return (Path(xdg) if xdg else Path.home() / ".cache") / "refex" / "baselines"
+
+
+def machine_description() -> dict:
+    """CPU, core count, OS and Python version of this machine."""
+    cpu = platform.processor() or platform.machine()
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    cpu = line.split(":", 1)[1].strip()
+                    break
+    except OSError:
+        pass
+    return {
+        "cpu": cpu,
+        "cores": os.cpu_count() or 1,
+        "system": f"{platform.system()} {platform.machine()}",
+        "python": f"{platform.python_implementation()} {platform.python_version_tuple()[0]}."
+        f"{platform.python_version_tuple()[1]}",
+    }
+
+
+def machine_fingerprint(description: dict | None = None) -> str:
+    """Short stable hash of ``machine_description()``."""
+    description = description or machine_description()
+    return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def git_commit(cwd: Path | None = None) -> str:
+    """Current commit hash, ``+dirty`` with uncommitted changes, ``unknown`` outside git."""
+    cwd = cwd or Path(__file__).parent
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=cwd, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(["git", "diff", "--quiet", "HEAD"], cwd=cwd, capture_output=True).returncode != 0
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return commit + ("+dirty" if dirty else "")
+
+
+def report_kind(report: dict) -> str:
+    """``"perf"`` for ``benchmarks.perf`` reports, ``"accuracy"`` for ``benchmarks.run`` results."""
+    if "engines" in report:
+        return "perf"
+    if "span_exact" in report:
+        return "accuracy"
+    msg = "Unrecognised report: expected benchmarks.perf or benchmarks.run JSON output"
+    raise ValueError(msg)
+
+
+def split_report(report: dict) -> dict[str, dict]:
+    """Per-engine payloads of a report (skipped perf engines are dropped)."""
+    if report_kind(report) == "accuracy":
+        return {report.get("engine", "regex"): report}
+    shared = {k: v for k, v in report.items() if k != "engines"}
+    return {
+        engine: {**shared, "engine": engine, **entry}
+        for engine, entry in report["engines"].items()
+        if "skipped" not in entry
+    }
+
+
+def save_baseline(report: dict, store: Path | None = None, commit: str | None = None) -> list[Path]:
+    """Write one baseline record per engine of ``report``; returns the paths."""
+    store = store or get_store_dir()
+    kind = report_kind(report)
+    description = machine_description()
+    machine = machine_fingerprint(description)
+    commit = commit or git_commit()
+    paths = []
+    for engine, payload in split_report(report).items():
+        record = {
+            "kind": kind,
+            "engine": engine,
+            "commit": commit,
+            "machine": machine,
+            "machine_description": description,
+            "created": datetime.now().astimezone().isoformat(timespec="microseconds"),
+            "result": payload,
+        }
+        path = store / machine / kind / engine / f"{commit}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(record, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def load_baseline(
+    engine: str,
+    kind: str,
+    store: Path | None = None,
+    machine: str | None = None,
+    commit: str | None = None,
+) -> dict | None:
+    """Baseline record for ``engine`` (``commit``, or the one with the latest ``created`` time)."""
+    directory = (store or get_store_dir()) / (machine or machine_fingerprint()) / kind / engine
+    pattern = f"{commit}*.json" if commit is not None else "*.json"
+    records = [json.loads(p.read_text(encoding="utf-8")) for p in sorted(directory.glob(pattern))]
+    if not records:
+        return None
+    return max(records, key=_created)
+
+
+def _created(record: dict) -> datetime:
+    """``created`` time of a baseline record (the earliest possible one when missing or malformed)."""
+    try:
+        created = datetime.fromisoformat(record["created"])
+    except (KeyError, TypeError, ValueError):
+        return datetime.min.replace(tzinfo=UTC)
+    # Records without an offset are taken as local time
+    return created if created.tzinfo is not None else created.astimezone()
+
+
+def mann_whitney_greater(x: list[float], y: list[float]) -> tuple[float, float]:
+    """One-sided Mann-Whitney U test that ``x`` tends to be larger than ``y``.
+
+    Returns ``(U, p)`` with ``U`` for ``x``.  Uses the normal
+    approximation with tie and continuity correction.
+    """
+    n1, n2 = len(x), len(y)
+    if not n1 or not n2:
+        return math.nan, 1.0
+    pooled = sorted([(v, 0) for v in x] + [(v, 1) for v in y])
+    ranks = [0.0] * len(pooled)
+    tie_term = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        t = j - i + 1
+        tie_term += t**3 - t
+        i = j + 1
+    r1 = sum(r for r, (_, group) in zip(ranks, pooled) if group == 0)
+    u = r1 - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1))))
+    if sigma == 0:
+        return u, 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / sigma
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def relative_latencies(new: dict, base: dict) -> tuple[list[float], list[float]]:
+    """Per-pass latencies of documents in both reports, relative to the baseline per-document median."""
+    base_median = dict(zip(base["doc_ids"], base["warm"]["doc_latency_ms"]))
+
+    def samples(report: dict) -> list[float]:
+        out = []
+        for latencies in report["warm"]["pass_latency_ms"]:
+            for doc_id, ms in zip(report["doc_ids"], latencies):
+                if base_median.get(doc_id):
+                    out.append(ms / base_median[doc_id])
+        return out
+
+    return samples(new), samples(base)
+
+
+def compare_perf(new: dict, base: dict, threshold: float = 0.10, alpha: float = 0.01) -> dict:
+    """Compare the warm timings of one engine against its baseline."""
+    new_warm, base_warm = new["warm"], base["warm"]
+    ratio = new_warm["docs_per_second"] / base_warm["docs_per_second"]
+    _, p = mann_whitney_greater(*relative_latencies(new, base))
+    return {
+        "docs_per_second": new_warm["docs_per_second"],
+        "baseline_docs_per_second": base_warm["docs_per_second"],
+        "change": round(ratio - 1, 4),
+        "p_slower": round(p, 6),
+        "regression": ratio < 1 - threshold and p < alpha,
+    }
+
+
+def compare_accuracy(new: dict, base: dict, f1_threshold: float = 0.005) -> dict:
+    """Compare span F1 of one engine against its baseline."""
+    out: dict = {"regression": False}
+    for metric in ("span_exact", "span_overlap"):
+        delta = new[metric]["f1"] - base[metric]["f1"]
+        out[metric] = {"f1": new[metric]["f1"], "baseline_f1": base[metric]["f1"], "change": round(delta, 4)}
+        out["regression"] = out["regression"] or delta < -f1_threshold
+    return out
+
+
+def compare_report(
+    report: dict,
+    store: Path | None = None,
+    baseline_commit: str | None = None,
+    threshold: float = 0.10,
+    alpha: float = 0.01,
+    f1_threshold: float = 0.005,
+) -> dict:
+    """Compare every engine of ``report`` with its stored baseline."""
+    kind = report_kind(report)
+    store = store or get_store_dir()
+    out: dict = {
+        "kind": kind,
+        "machine": machine_fingerprint(),
+        "store": str(store),
+        "engines": {},
+        "missing_baseline": [],
+        "regression": False,
+    }
+    for engine, payload in split_report(report).items():
+        baseline = load_baseline(engine, kind, store=store, commit=baseline_commit)
+        if baseline is None:
+            out["engines"][engine] = {"baseline": None}
+            out["missing_baseline"].append(engine)
+            continue
+        if kind == "perf":
+            result = compare_perf(payload, baseline["result"], threshold=threshold, alpha=alpha)
+        else:
+            result = compare_accuracy(payload, baseline["result"], f1_threshold=f1_threshold)
+        result["baseline"] = baseline["commit"]
+        out["engines"][engine] = result
+        out["regression"] = out["regression"] or result["regression"]
+    return out
+
+
+def format_comparison(comparison: dict) -> str:
+    lines = [f"{comparison['kind']} comparison (machine {comparison['machine']})"]
+    for engine, r in comparison["engines"].items():
+        if r["baseline"] is None:
+            lines.append(f"  {engine:12s} NOT COMPARED: no baseline")
+            continue
+        status = "REGRESSION" if r["regression"] else "ok"
+        if comparison["kind"] == "perf":
+            lines.append(
+                f"  {engine:12s} {r['docs_per_second']:10.1f} docs/s vs {r['baseline_docs_per_second']:.1f}"
+                f"  ({r['change']:+.1%}, p={r['p_slower']:.4f})  {status}"
+            )
+        else:
+            ex, ov = r["span_exact"], r["span_overlap"]
+            lines.append(
+                f"  {engine:12s} exact F1 {ex['f1']:.4f} ({ex['change']:+.4f})"
+                f"  overlap F1 {ov['f1']:.4f} ({ov['change']:+.4f})  {status}"
+            )
+        lines.append(f"  {'':12s} baseline {r['baseline']}")
+    if comparison["missing_baseline"]:
+        lines.append(f"No baseline for {', '.join(comparison['missing_baseline'])} in {comparison['store']}")
+    return "\n".join(lines) + "\n"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Store benchmark baselines and check reports against them.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    save = sub.add_parser("save", help="Store a report as baseline for the current commit")
+    save.add_argument("report", type=Path, help="benchmarks.perf or benchmarks.run JSON output")
+    save.add_argument("--store", type=Path, default=None, help=f"Baseline store (default: {get_store_dir()})")
+    save.add_argument("--commit", default=None, help="Record under this commit (default: git HEAD)")
+
+    check = sub.add_parser("check", help="Compare a report with the stored baseline")
+    check.add_argument("report", type=Path, help="benchmarks.perf or benchmarks.run JSON output")
+    check.add_argument("--store", type=Path, default=None, help=f"Baseline store (default: {get_store_dir()})")
+    check.add_argument("--baseline-commit", default=None, help="Baseline commit (default: latest stored)")
+    check.add_argument("--threshold", type=float, default=0.10, help="Max relative docs/sec drop (default: 0.10)")
+    check.add_argument("--alpha", type=float, default=0.01, help="Significance level (default: 0.01)")
+    check.add_argument("--f1-threshold", type=float, default=0.005, help="Max absolute F1 drop (default: 0.005)")
+    check.add_argument(
+        "--require-baseline", action="store_true", help="Fail (exit status 2) when an engine has no baseline"
+    )
+    check.add_argument("--json", action="store_true", help="Output the comparison as JSON")
+    args = parser.parse_args()
+
+    report = json.loads(args.report.read_text(encoding="utf-8"))
+
+    if args.command == "save":
+        for path in save_baseline(report, store=args.store, commit=args.commit):
+            print(f"Baseline written to {path}", file=sys.stderr)
+        return
+
+    comparison = compare_report(
+        report,
+        store=args.store,
+        baseline_commit=args.baseline_commit,
+        threshold=args.threshold,
+        alpha=args.alpha,
+        f1_threshold=args.f1_threshold,
+    )
+    if args.json:
+        sys.stdout.write(json.dumps(comparison, indent=2) + "\n")
+    else:
+        sys.stdout.write(format_comparison(comparison))
+    if comparison["missing_baseline"]:
+        print(
+            f"warning: {', '.join(comparison['missing_baseline'])} not compared, "
+            f"no baseline in {comparison['store']} (set BENCH_BASELINE_DIR to a persisted store)",
+            file=sys.stderr,
+        )
+        if args.require_baseline:
+            sys.exit(2)
+    sys.exit(1 if comparison["regression"] else 0)
+
+
+if __name__ == "__main__":
+    main()
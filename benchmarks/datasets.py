@@ -14,15 +14,41 @@ Supports two formats:
 
 Default data path: ``../german-legal-references-benchmark/data/benchmark_10k_hf``
 Override via: ``BENCH_DATA_DIR`` environment variable or ``--data-dir`` CLI flag.
+
+Loading is lazy: the Arrow table stays memory-mapped, and JSONL files are
+indexed by line offset as far as they are read.
+``Document`` / ``AnnotationSet`` objects are built on access and not kept,
+so iterating a split streams it and ``--limit N`` only reads the first
+``N`` rows.
+
+Gold annotations are cached: the first load of a split parses all of
+them once and writes a binary file to the cache directory, keyed by a
+fingerprint of the annotation source files (path, size, mtime), the
+split and ``GOLD_CACHE_VERSION``.  Later loads read only its doc_id
+index and unpickle a document's compact citation tuples when it is
+looked up, instead of JSON-decoding every citation list again.  The
+directory is ``BENCH_CACHE_DIR`` (default ``~/.cache/refex/benchmarks``);
+``BENCH_CACHE_DIR=off`` disables the cache.
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
+import logging
 import os
+import pickle
+import re
+from collections.abc import Iterator, Mapping, Sequence
 from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+# Bump when the cache file layout or the packed annotation tuples change
+GOLD_CACHE_VERSION = 2
+
 # Default: sibling project's 10k HF dataset
 _DEFAULT_DATA_DIR = (
     Path(__file__).resolve().parent.parent.parent / "german-legal-references-benchmark" / "data" / "benchmark_10k_hf"
@@ -37,6 +63,15 @@ def get_data_dir() -> Path:
     return _DEFAULT_DATA_DIR
 
 
+def get_cache_dir() -> Path | None:
+    """Resolve the gold-annotation cache directory; None when disabled."""
+    env = os.environ.get("BENCH_CACHE_DIR")
+    if env is not None:
+        return None if env.strip().lower() in ("", "0", "off", "none") else Path(env)
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    return (Path(xdg) if xdg else Path.home() / ".cache") / "refex" / "benchmarks"
+
+
 @dataclass
 class Span:
     start: int
@@ -95,33 +130,393 @@ class AnnotationSet:
 
 @dataclass
 class BenchmarkDataset:
-    """A loaded benchmark dataset with documents and gold annotations."""
+    """A loaded benchmark dataset with documents and gold annotations.
 
-    documents: list[Document]
-    annotations: dict[str, AnnotationSet]  # keyed by doc_id
+    ``load_dataset`` fills it with ``LazyDocuments`` / ``LazyAnnotations``;
+    plain lists and dicts work as well.
+    """
+
+    documents: Sequence[Document]
+    annotations: Mapping[str, AnnotationSet]  # keyed by doc_id
 
     @property
     def doc_ids(self) -> list[str]:
+        if isinstance(self.documents, LazyDocuments):
+            return self.documents.doc_ids
         return [d.doc_id for d in self.documents]
 
     def __len__(self) -> int:
         return len(self.documents)
 
 
+# ``{"doc_id": "..."`` at the start of a JSONL line (ids with escapes fall back to json.loads)
+_LEADING_DOC_ID_RE = re.compile(rb'\{\s*"doc_id"\s*:\s*"([^"\\]*)"')
+
+
+class _JsonlRows:
+    """Rows of a JSONL file, indexed by line offset on demand.
+
+    The index is extended only as far as a row lookup needs, so reading
+    the first rows of a large file does not scan the rest.  A ``doc_id``
+    lookup indexes the whole file (without parsing it), since the last
+    row wins when a ``doc_id`` occurs twice, as in a dict built from the
+    rows.  Lines are read with plain seeks rather than an mmap, which
+    would keep every page it touched resident.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = open(path, "rb")  # closed in __del__
+        self._offsets: list[tuple[int, int]] = []  # (start, length) per non-empty line
+        self._line_ids: list[str] = []
+        self._last: dict[str, int] = {}  # doc_id -> row
+        self._pos = 0  # scanned up to here
+        self._scanned = False  # reached end of file
+
+    def __del__(self):
+        file = getattr(self, "_file", None)
+        if file is not None:
+            file.close()
+
+    def _scan_line(self) -> bool:
+        """Index the next non-empty line; False at end of file."""
+        f = self._file
+        f.seek(self._pos)
+        while True:
+            start = self._pos
+            line = f.readline()
+            if not line:
+                return False
+            self._pos += len(line)
+            if line.strip():
+                break
+        m = _LEADING_DOC_ID_RE.match(line)
+        doc_id = m.group(1).decode("utf-8") if m else json.loads(line)["doc_id"]
+        self._last[doc_id] = len(self._offsets)
+        self._offsets.append((start, len(line)))
+        self._line_ids.append(doc_id)
+        return True
+
+    def _has_row(self, i: int) -> bool:
+        while len(self._offsets) <= i:
+            if not self._scan_line():
+                return False
+        return True
+
+    def _scan_all(self) -> None:
+        while not self._scanned:
+            self._scanned = not self._scan_line()
+
+    def __len__(self) -> int:
+        self._scan_all()
+        return len(self._offsets)
+
+    def row(self, i: int) -> dict:
+        if i < 0 or not self._has_row(i):
+            raise IndexError(i)
+        start, length = self._offsets[i]
+        self._file.seek(start)
+        return json.loads(self._file.read(length))
+
+    def rows(self) -> Iterator[dict]:
+        return self.rows_from(0)
+
+    def rows_from(self, start: int) -> Iterator[dict]:
+        i = start
+        while self._has_row(i):
+            yield self.row(i)
+            i += 1
+
+    def find(self, doc_id: str) -> int | None:
+        """Last row of ``doc_id``."""
+        self._scan_all()
+        return self._last.get(doc_id)
+
+    def ids(self) -> list[str]:
+        """``doc_id`` of every row, in file order."""
+        self._scan_all()
+        return list(self._line_ids)
+
+    def unique_ids(self) -> Iterator[str]:
+        self._scan_all()
+        return iter(self._last)
+
+
+class _ArrowRows:
+    """Rows of a memory-mapped HF ``Dataset`` split (restricted to some columns)."""
+
+    def __init__(self, ds):
+        self._ds = ds
+        self._last: dict[str, int] | None = None
+
+    def _index(self) -> dict[str, int]:
+        if self._last is None:
+            self._last = {}
+            for i, doc_id in enumerate(self._ds["doc_id"]):  # reads only the doc_id column
+                self._last[doc_id] = i
+        return self._last
+
+    def __len__(self) -> int:
+        return len(self._ds)
+
+    def row(self, i: int) -> dict:
+        if i < 0 or i >= len(self._ds):
+            raise IndexError(i)
+        return self._ds[i]
+
+    def rows(self) -> Iterator[dict]:
+        return iter(self._ds)
+
+    def rows_from(self, start: int) -> Iterator[dict]:
+        for i in range(start, len(self._ds)):
+            yield self._ds[i]
+
+    def find(self, doc_id: str) -> int | None:
+        return self._index().get(doc_id)
+
+    def ids(self) -> list[str]:
+        return list(self._ds["doc_id"])
+
+    def unique_ids(self) -> Iterator[str]:
+        return iter(self._index())
+
+
+class LazyDocuments(Sequence):
+    """Documents of a split, parsed from their row on each access.
+
+    Iteration streams rows in order.  Slices with non-negative bounds are
+    read the same way, so ``documents[:50]`` only touches the first 50
+    rows.
+    """
+
+    def __init__(self, rows: _JsonlRows | _ArrowRows):
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.start or 0, index.stop, index.step
+            if start >= 0 and (stop is None or stop >= 0) and step in (None, 1):
+                # Rows before ``start`` are skipped without being parsed
+                count = None if stop is None else max(stop - start, 0)
+                return [_document_from_row(row) for row in islice(self._rows.rows_from(start), count)]
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return _document_from_row(self._rows.row(index))
+
+    def __iter__(self) -> Iterator[Document]:
+        for row in self._rows.rows():
+            yield _document_from_row(row)
+
+    @property
+    def doc_ids(self) -> list[str]:
+        """Document ids in order, without parsing the documents."""
+        return self._rows.ids()
+
+
+class LazyAnnotations(Mapping):
+    """Gold annotations keyed by ``doc_id``, parsed on each lookup.
+
+    Keys are in first-occurrence order and a duplicated ``doc_id`` maps to
+    its last row, as in a dict built from the rows.
+    """
+
+    def __init__(self, rows: _JsonlRows | _ArrowRows | None):
+        self._rows = rows
+
+    def __getitem__(self, doc_id: str) -> AnnotationSet:
+        i = self._rows.find(doc_id) if self._rows is not None else None
+        if i is None:
+            raise KeyError(doc_id)
+        return _annotation_from_row(self._rows.row(i))
+
+    def __contains__(self, doc_id) -> bool:
+        return self._rows is not None and self._rows.find(doc_id) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return self._rows.unique_ids() if self._rows is not None else iter(())
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class CachedAnnotations(Mapping):
+    """Gold annotations read from a gold cache file (see ``build_gold_cache``).
+
+    Only the doc_id index is loaded up front; a document's annotations
+    are unpickled from their own record on each lookup.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = open(path, "rb")  # closed in __del__
+        header = pickle.load(self._file)
+        if header.get("version") != GOLD_CACHE_VERSION:
+            self._file.close()
+            msg = f"{path}: gold cache version {header.get('version')}, expected {GOLD_CACHE_VERSION}"
+            raise ValueError(msg)
+        self.fingerprint: str = header["fingerprint"]
+        self._base = self._file.tell()
+        self._index: dict[str, tuple[int, int]] = header["index"]  # doc_id -> (offset, length), in file order
+
+    def __del__(self):
+        file = getattr(self, "_file", None)
+        if file is not None:
+            file.close()
+
+    def _load(self, offset: int, length: int) -> tuple:
+        self._file.seek(self._base + offset)
+        return pickle.loads(self._file.read(length))
+
+    def __getitem__(self, doc_id: str) -> AnnotationSet:
+        return _unpack_annotation(doc_id, self._load(*self._index[doc_id]))
+
+    def __contains__(self, doc_id) -> bool:
+        return doc_id in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+def _pack_annotation(ann: AnnotationSet) -> tuple:
+    """Compact tuples of an annotation set (field order of ``Citation`` / ``Relation``)."""
+    citations = tuple(
+        (
+            c.id,
+            c.type,
+            c.kind,
+            c.span.start,
+            c.span.end,
+            c.span.text,
+            c.unit,
+            c.delimiter,
+            c.book,
+            c.number,
+            c.structure or None,
+            c.court,
+            c.file_number,
+            c.date,
+            c.reporter,
+            c.reporter_volume,
+            c.reporter_page,
+            c.resolves_to,
+            c.confidence,
+        )
+        for c in ann.citations
+    )
+    relations = tuple(
+        (r.source_id, r.target_id, r.relation, (r.span.start, r.span.end, r.span.text) if r.span else None)
+        for r in ann.relations
+    )
+    return citations, relations
+
+
+def _unpack_annotation(doc_id: str, packed: tuple) -> AnnotationSet:
+    citations, relations = packed
+    return AnnotationSet(
+        doc_id=doc_id,
+        citations=[
+            # Positional, in field order (a third faster than keywords)
+            Citation(*c[:3], Span(c[3], c[4], c[5]), *c[6:10], dict(c[10]) if c[10] else {}, *c[11:])
+            for c in citations
+        ],
+        relations=[
+            Relation(source_id=r[0], target_id=r[1], relation=r[2], span=Span(*r[3]) if r[3] else None)
+            for r in relations
+        ],
+    )
+
+
+def gold_fingerprint(sources: list[Path], split: str) -> str:
+    """Cache key of the annotations in ``sources``: path, size and mtime of each file."""
+    h = hashlib.sha256(f"v{GOLD_CACHE_VERSION}|{split}".encode())
+    for path in sorted(sources):
+        st = path.stat()
+        h.update(f"|{path.resolve()}|{st.st_size}|{st.st_mtime_ns}".encode())
+    return h.hexdigest()[:16]
+
+
+def build_gold_cache(annotations: Mapping[str, AnnotationSet], path: Path, fingerprint: str) -> None:
+    """Write ``annotations`` to a gold cache file at ``path``.
+
+    Layout: a pickled header (version, fingerprint, doc_id index) followed
+    by one pickled record per document.  Strings repeated across
+    citations (types, books, courts, …) are interned so records stay
+    small.  Written through a temporary file and ``os.replace``.
+    """
+    strings: dict[str, str] = {}
+
+    def intern(value):
+        return strings.setdefault(value, value) if isinstance(value, str) else value
+
+    index: dict[str, tuple[int, int]] = {}
+    records: list[bytes] = []
+    offset = 0
+    for doc_id, ann in annotations.items():
+        citations, relations = _pack_annotation(ann)
+        citations = tuple(tuple(intern(v) for v in c) for c in citations)
+        record = pickle.dumps((citations, relations), protocol=pickle.HIGHEST_PROTOCOL)
+        index[doc_id] = (offset, len(record))
+        records.append(record)
+        offset += len(record)
+
+    header = {"version": GOLD_CACHE_VERSION, "fingerprint": fingerprint, "index": index}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        for record in records:
+            f.write(record)
+    os.replace(tmp, path)
+
+
+def _cached(annotations: LazyAnnotations, sources: list[Path], split: str) -> Mapping[str, AnnotationSet]:
+    """``annotations`` from the gold cache, building it on a miss; unchanged if the cache is off."""
+    cache_dir = get_cache_dir()
+    if cache_dir is None:
+        return annotations
+    fingerprint = gold_fingerprint(sources, split)
+    path = cache_dir / f"gold-{fingerprint}.pkl"
+    try:
+        return CachedAnnotations(path)
+    except FileNotFoundError:
+        pass
+    except (OSError, EOFError, ValueError, KeyError, AttributeError, pickle.UnpicklingError) as exc:
+        logger.warning("Ignoring unreadable gold cache %s: %s", path, exc)
+    logger.info("Building gold cache %s", path)
+    try:
+        build_gold_cache(annotations, path, fingerprint)
+        return CachedAnnotations(path)
+    except OSError as exc:
+        logger.warning("Could not write gold cache %s: %s", path, exc)
+        return annotations
+
+
 def load_dataset(
     data_dir: Path | None = None,
     split: str = "test",
+    cache: bool = True,
 ) -> BenchmarkDataset:
     """Load a benchmark dataset from HF Arrow format or JSONL.
 
     Auto-detects format: if a ``dataset_dict.json`` exists, loads as HF
-    dataset; otherwise falls back to JSONL.
+    dataset; otherwise falls back to JSONL.  A path to a single
+    documents ``.jsonl`` file (e.g. ``fixtures/html_documents.jsonl``)
+    loads its documents without annotations.
 
     Args:
         data_dir: Path to the dataset directory. If None, uses the default
                   resolved via ``get_data_dir()``.
         split: Which split to load (train/validation/test). Only used for
                HF datasets and split JSONL directories.
+        cache: Read gold annotations through the gold cache (see the
+               module docstring).  False parses them from the source.
 
     Raises:
         FileNotFoundError: If the data directory or required files don't exist.
@@ -131,20 +526,23 @@ def load_dataset(
 
     data_dir = Path(data_dir)
 
+    if data_dir.is_file() and data_dir.suffix == ".jsonl":
+        return BenchmarkDataset(documents=LazyDocuments(_JsonlRows(data_dir)), annotations=LazyAnnotations(None))
+
     # Auto-detect format
     if (data_dir / "dataset_dict.json").exists():
-        return _load_hf_dataset(data_dir, split)
+        return _load_hf_dataset(data_dir, split, cache)
 
     # Check for split JSONL directories (train/dev/test)
     split_dir_map = {"train": "train", "validation": "dev", "test": "test"}
     dir_name = split_dir_map.get(split, split)
     split_dir = data_dir / dir_name
     if split_dir.exists() and (split_dir / "documents.jsonl").exists():
-        return _load_jsonl_dataset(split_dir)
+        return _load_jsonl_dataset(split_dir, cache)
 
     # Legacy flat JSONL
     if (data_dir / "documents.jsonl").exists():
-        return _load_jsonl_dataset(data_dir)
+        return _load_jsonl_dataset(data_dir, cache)
 
     msg = (
         f"Benchmark data not found at {data_dir}\n"
@@ -154,7 +552,7 @@ def load_dataset(
     raise FileNotFoundError(msg)
 
 
-def _load_hf_dataset(data_dir: Path, split: str) -> BenchmarkDataset:
+def _load_hf_dataset(data_dir: Path, split: str, cache: bool = True) -> BenchmarkDataset:
     """Load from HF Arrow format saved via datasets.save_to_disk()."""
     hf_cache = os.environ.get("HF_DATASETS_CACHE", "/tmp/hf-cache")
     os.environ.setdefault("HF_DATASETS_CACHE", hf_cache)
@@ -170,32 +568,44 @@ def _load_hf_dataset(data_dir: Path, split: str) -> BenchmarkDataset:
         raise ValueError(msg)
 
     ds = ds_dict[split]
+    annotation_columns = {"doc_id", "citations", "relations"}
+    doc_ds = ds.remove_columns([c for c in ds.column_names if c in ("citations", "relations")])
+    ann_ds = ds.remove_columns([c for c in ds.column_names if c not in annotation_columns])
+
+    annotations = LazyAnnotations(_ArrowRows(ann_ds))
+    if cache:
+        split_dir = data_dir / split
+        sources = [data_dir / "dataset_dict.json"]
+        if split_dir.is_dir():
+            sources.extend(p for p in split_dir.iterdir() if p.is_file())
+        annotations = _cached(annotations, sources, split)
+    return BenchmarkDataset(documents=LazyDocuments(_ArrowRows(doc_ds)), annotations=annotations)
+
+
+def _document_from_row(d: dict) -> Document:
+    return Document(
+        doc_id=d["doc_id"],
+        text=d["text"],
+        raw=d.get("raw", ""),
+        court=d.get("court"),
+        decision_date=d.get("decision_date"),
+        decision_type=d.get("decision_type"),
+    )
 
-    documents = []
-    annotations = {}
-
-    for row in ds:
-        doc_id = row["doc_id"]
-        documents.append(
-            Document(
-                doc_id=doc_id,
-                text=row["text"],
-                raw=row.get("raw", ""),
-                court=row.get("court"),
-                decision_date=row.get("decision_date"),
-                decision_type=row.get("decision_type"),
-            )
-        )
-
-        cit_data = json.loads(row.get("citations", "[]"))
-        rel_data = json.loads(row.get("relations", "[]"))
-
-        citations = [_parse_citation(c) for c in cit_data]
-        rels = [_parse_relation(r) for r in rel_data]
-
-        annotations[doc_id] = AnnotationSet(doc_id=doc_id, citations=citations, relations=rels)
 
-    return BenchmarkDataset(documents=documents, annotations=annotations)
+def _annotation_from_row(a: dict) -> AnnotationSet:
+    """Annotations of a JSONL row (lists) or an Arrow row (JSON-encoded strings)."""
+    cit_data = a.get("citations") or []
+    rel_data = a.get("relations") or []
+    if isinstance(cit_data, str):
+        cit_data = json.loads(cit_data)
+    if isinstance(rel_data, str):
+        rel_data = json.loads(rel_data)
+    return AnnotationSet(
+        doc_id=a["doc_id"],
+        citations=[_parse_citation(c) for c in cit_data],
+        relations=[_parse_relation(r) for r in rel_data],
+    )
 
 
 def _parse_citation(c: dict) -> Citation:
@@ -231,33 +641,14 @@ def _parse_relation(r: dict) -> Relation:
     )
 
 
-def _load_jsonl_dataset(data_dir: Path) -> BenchmarkDataset:
+def _load_jsonl_dataset(data_dir: Path, cache: bool = True) -> BenchmarkDataset:
     """Load from a directory with documents.jsonl + annotations.jsonl."""
     docs_file = data_dir / "documents.jsonl"
     anns_file = data_dir / "annotations.jsonl"
 
-    documents = []
-    with open(docs_file, encoding="utf-8") as f:
-        for line in f:
-            d = json.loads(line)
-            documents.append(
-                Document(
-                    doc_id=d["doc_id"],
-                    text=d["text"],
-                    raw=d.get("raw", ""),
-                    court=d.get("court"),
-                    decision_date=d.get("decision_date"),
-                    decision_type=d.get("decision_type"),
-                )
-            )
-
-    annotations = {}
-    if anns_file.exists():
-        with open(anns_file, encoding="utf-8") as f:
-            for line in f:
-                a = json.loads(line)
-                citations = [_parse_citation(c) for c in a.get("citations", [])]
-                rels = [_parse_relation(r) for r in a.get("relations", [])]
-                annotations[a["doc_id"]] = AnnotationSet(doc_id=a["doc_id"], citations=citations, relations=rels)
-
-    return BenchmarkDataset(documents=documents, annotations=annotations)
+    if not anns_file.exists():
+        return BenchmarkDataset(documents=LazyDocuments(_JsonlRows(docs_file)), annotations=LazyAnnotations(None))
+    annotations = LazyAnnotations(_JsonlRows(anns_file))
+    if cache:
+        annotations = _cached(annotations, [anns_file], data_dir.name)
+    return BenchmarkDataset(documents=LazyDocuments(_JsonlRows(docs_file)), annotations=annotations)
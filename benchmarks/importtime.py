@@ -0,0 +1,121 @@
+"""Check the cold-start import cost of refex against a budget.
+
+Runs ``python -X importtime -c "import <module>"`` in fresh interpreters,
+reports the median cumulative import time per module, and fails when a
+module exceeds its budget or eagerly imports an engine module.
+
+Usage:
+    python -m benchmarks.importtime [OPTIONS]
+
+Examples:
+    python -m benchmarks.importtime                 # default budgets
+    python -m benchmarks.importtime --repeat 9      # more stable medians
+    python -m benchmarks.importtime --json          # machine-readable
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+
+# Cumulative import time budgets in milliseconds.  Measured on a laptop-class
+# CPU (Python 3.11): ``refex`` ≈ 2 ms, ``refex.orchestrator`` ≈ 55 ms, of
+# which ≈ 35 ms is stdlib (logging, re, dataclasses, typing).  The budgets
+# leave ~2x headroom for slower CI runners.
+DEFAULT_BUDGETS_MS: dict[str, float] = {
+    "refex": 10.0,
+    "refex.orchestrator": 120.0,
+}
+
+# Modules that must not be imported as a side effect of importing the
+# budgeted modules — engines are built lazily via ``refex.engines``.
+LAZY_MODULES: tuple[str, ...] = (
+    "refex.extractors.law",
+    "refex.extractors.case",
+    "refex.engines.regex",
+    "refex.engines.crf",
+    "refex.engines.transformer",
+)
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def measure_import(module: str, python: str = sys.executable) -> tuple[float, set[str]]:
+    """Import ``module`` in a fresh interpreter.
+
+    Returns ``(cumulative_ms, imported_modules)`` parsed from the
+    ``-X importtime`` trace.
+    """
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative_ms = 0.0
+    imported: set[str] = set()
+    for line in proc.stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if not m:
+            continue
+        imported.add(m.group(4))
+        if m.group(4) == module:
+            cumulative_ms = int(m.group(2)) / 1000
+    return cumulative_ms, imported
+
+
+def check_budgets(
+    budgets: dict[str, float] | None = None,
+    repeat: int = 5,
+) -> dict:
+    """Measure every budgeted module and return a report dict."""
+    budgets = budgets or DEFAULT_BUDGETS_MS
+    report: dict = {"modules": {}, "ok": True}
+
+    for module, budget in budgets.items():
+        times = []
+        imported: set[str] = set()
+        for _ in range(repeat):
+            ms, imported = measure_import(module)
+            times.append(ms)
+        median = statistics.median(times)
+        eager = sorted(m for m in LAZY_MODULES if m in imported)
+        ok = median <= budget and not eager
+        report["modules"][module] = {
+            "median_ms": round(median, 1),
+            "min_ms": round(min(times), 1),
+            "budget_ms": budget,
+            "eager_engine_imports": eager,
+            "ok": ok,
+        }
+        report["ok"] = report["ok"] and ok
+
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check refex import time against a budget.")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Fresh interpreters per module (default: 5)")
+    parser.add_argument("--json", action="store_true", help="Output the report as JSON")
+    args = parser.parse_args()
+
+    report = check_budgets(repeat=args.repeat)
+
+    if args.json:
+        sys.stdout.write(json.dumps(report, indent=2) + "\n")
+    else:
+        for module, r in report["modules"].items():
+            status = "ok" if r["ok"] else "OVER BUDGET"
+            print(f"  {module:24s} {r['median_ms']:7.1f} ms (budget {r['budget_ms']:.0f} ms)  {status}")
+            if r["eager_engine_imports"]:
+                print(f"    eagerly imports: {', '.join(r['eager_engine_imports'])}")
+
+    sys.exit(0 if report["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Memory profile of extraction: tracemalloc peaks, allocation sites, RSS.
+
+``MemoryProfile`` wraps an extract function.  Every call records the
+traced peak above the memory that was live before the call, grouped by
+the document-length buckets of ``benchmarks.perf``.  ``report()`` then
+re-runs the document with the largest peak of each bucket under a
+profile hook that snapshots the heap whenever it grows past its previous
+high-water mark.  At a function's return its locals are still alive, so
+the last snapshot shows what was held at the peak (e.g. the
+``offset_map`` and per-character tuples of HTML normalisation); the top
+source lines by growth since the call started are reported.  The process
+RSS high-water mark (``ru_maxrss``) is added on platforms that have it.
+
+tracemalloc slows allocation-heavy code several-fold, so timings taken
+while profiling are not comparable with normal runs.
+
+    profile = MemoryProfile(extract_fn)
+    for text in texts:
+        profile(text)
+    report = profile.report()
+    profile.stop()
+"""
+
+from __future__ import annotations
+
+import sys
+import tracemalloc
+from collections.abc import Callable
+
+from benchmarks.perf import LENGTH_BUCKETS, length_bucket
+
+# Take a new snapshot only once the growth since the call started exceeds
+# that of the last snapshot by this factor plus this many bytes
+_SNAPSHOT_GROWTH = 1.1
+_SNAPSHOT_MIN_BYTES = 4 * 1024
+
+
+def rss_high_water_mb() -> float | None:
+    """Peak resident set size of this process in MiB, or None if unavailable."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _short_path(filename: str) -> str:
+    for marker in ("/site-packages/", "/src/", "/lib/python"):
+        if marker in filename:
+            return filename.split(marker, 1)[1]
+    return filename
+
+
+class MemoryProfile:
+    """Per-document peak memory of ``fn``, by document-length bucket.
+
+    Starts tracemalloc on the first call if it is not already tracing;
+    ``stop()`` stops it again.  ``top`` is the number of allocation sites
+    reported per bucket.
+    """
+
+    def __init__(self, fn: Callable[[str], object], top: int = 10):
+        self.fn = fn
+        self.top = top
+        self._started = False
+        self._buckets: dict[str, dict] = {}
+
+    def __call__(self, text: str):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started = True
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        out = self.fn(text)
+        peak = tracemalloc.get_traced_memory()[1] - base
+
+        bucket = self._buckets.setdefault(
+            length_bucket(len(text)), {"docs": 0, "chars": 0, "peak_sum": 0, "peak_max": -1, "largest": ""}
+        )
+        bucket["docs"] += 1
+        bucket["chars"] += len(text)
+        bucket["peak_sum"] += peak
+        if peak > bucket["peak_max"]:
+            bucket["peak_max"] = peak
+            bucket["largest"] = text
+        return out
+
+    def stop(self) -> None:
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+    def peak_sites(self, text: str) -> list[dict]:
+        """Source lines holding the most memory (allocated during the call) at the peak of ``fn(text)``."""
+        if not tracemalloc.is_tracing():
+            return []
+        before = tracemalloc.take_snapshot()
+        base = tracemalloc.get_traced_memory()[0]
+        state = {"high": 0, "snapshot": None}
+
+        def hook(frame, event, arg):
+            if event == "return" or event == "c_return":
+                growth = tracemalloc.get_traced_memory()[0] - base
+                if growth > state["high"] * _SNAPSHOT_GROWTH + _SNAPSHOT_MIN_BYTES:
+                    state["high"] = growth
+                    state["snapshot"] = tracemalloc.take_snapshot()
+
+        previous = sys.getprofile()
+        sys.setprofile(hook)
+        try:
+            self.fn(text)
+        finally:
+            sys.setprofile(previous)
+
+        snapshot = state["snapshot"]
+        if snapshot is None:
+            return []
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        diffs = snapshot.filter_traces(ignore).compare_to(before.filter_traces(ignore), "lineno")
+        sites = []
+        for diff in sorted(diffs, key=lambda d: d.size_diff, reverse=True)[: self.top]:
+            if diff.size_diff <= 0:
+                break
+            frame = diff.traceback[0]
+            sites.append(
+                {
+                    "site": f"{_short_path(frame.filename)}:{frame.lineno}",
+                    "kib": round(diff.size_diff / 1024, 1),
+                    "blocks": diff.count_diff,
+                }
+            )
+        return sites
+
+    def report(self, sites: bool = True) -> dict:
+        """Peak KiB per bucket (with allocation sites of its largest peak) and the RSS high-water mark."""
+        buckets = {}
+        for label, _ in LENGTH_BUCKETS:
+            b = self._buckets.get(label)
+            if b is None:
+                continue
+            entry = {
+                "docs": b["docs"],
+                "peak_kib_mean": round(b["peak_sum"] / b["docs"] / 1024, 1),
+                "peak_kib_max": round(b["peak_max"] / 1024, 1),
+                "bytes_per_char": round(b["peak_sum"] / b["chars"], 1) if b["chars"] else 0.0,
+                "largest_peak_chars": len(b["largest"]),
+            }
+            if sites:
+                entry["sites"] = self.peak_sites(b["largest"])
+            buckets[label] = entry
+        docs = sum(b["docs"] for b in self._buckets.values())
+        return {
+            "docs": docs,
+            "peak_kib_max": max((b["peak_kib_max"] for b in buckets.values()), default=0.0),
+            "buckets": buckets,
+            "rss_high_water_mb": rss_high_water_mb(),
+        }
+
+
+def format_memory(report: dict, indent: str = "  ") -> list[str]:
+    """Summary lines for a ``MemoryProfile.report()``."""
+    rss = report["rss_high_water_mb"]
+    lines = [
+        f"{indent}peak {report['peak_kib_max']:.1f} KiB traced per document"
+        + (f", RSS high-water {rss:.1f} MiB" if rss is not None else "")
+    ]
+    for label, b in report["buckets"].items():
+        lines.append(
+            f"{indent}  {label:>8s} ({b['docs']:4d} docs)  peak mean {b['peak_kib_mean']:9.1f} KiB"
+            f"  max {b['peak_kib_max']:9.1f} KiB  {b['bytes_per_char']:6.1f} B/char"
+        )
+        for site in b.get("sites", [])[:5]:
+            lines.append(f"{indent}      {site['kib']:9.1f} KiB  {site['blocks']:7d} blocks  {site['site']}")
+    return lines
@@ -3,10 +3,17 @@
 All metrics compare predicted citations (from the extractor) against gold
 citations (from the benchmark dataset). Matching is done at the span level
 first, then field accuracy is computed on matched pairs.
+
+Overlap matching is greedy: predictions in order of start offset each take
+the first (by start offset) still unmatched gold span they overlap.  All
+overlap metrics share ``greedy_overlap_pairs``, which finds that gold span
+with a max-end segment tree in O((n + m) log n) instead of scanning every
+gold span per prediction.
 """
 
 from __future__ import annotations
 
+from bisect import bisect_left
 from dataclasses import dataclass, field
 
 from benchmarks.datasets import Citation, Relation
@@ -33,6 +40,11 @@ class PRF:
         p, r = self.precision, self.recall
         return 2 * p * r / (p + r) if (p + r) > 0 else 0.0
 
+    def merge(self, other: PRF) -> None:
+        self.tp += other.tp
+        self.fp += other.fp
+        self.fn += other.fn
+
 
 @dataclass
 class FieldAccuracy:
@@ -52,6 +64,12 @@ class FieldAccuracy:
     def total(self) -> int:
         return self.correct + self.incorrect + self.missing_gold + self.missing_pred
 
+    def merge(self, other: FieldAccuracy) -> None:
+        self.correct += other.correct
+        self.incorrect += other.incorrect
+        self.missing_gold += other.missing_gold
+        self.missing_pred += other.missing_pred
+
 
 @dataclass
 class BenchmarkResult:
@@ -81,6 +99,26 @@ class BenchmarkResult:
     total_pred_relations: int = 0
     total_docs: int = 0
 
+    def merge(self, other: BenchmarkResult) -> None:
+        """Add ``other``'s counters to this result.
+
+        New per-type / per-field entries are appended in ``other``'s order,
+        so merging per-document results in document order reproduces the
+        result of scoring the documents serially, key order included.
+        """
+        self.span_exact.merge(other.span_exact)
+        self.span_overlap.merge(other.span_overlap)
+        self.relation_exact.merge(other.relation_exact)
+        for key, prf in other.span_by_type.items():
+            self.span_by_type.setdefault(key, PRF()).merge(prf)
+        for key, fa in other.field_accuracy.items():
+            self.field_accuracy.setdefault(key, FieldAccuracy()).merge(fa)
+        self.total_gold += other.total_gold
+        self.total_pred += other.total_pred
+        self.total_gold_relations += other.total_gold_relations
+        self.total_pred_relations += other.total_pred_relations
+        self.total_docs += other.total_docs
+
     def summary(self) -> str:
         """Human-readable summary."""
         lines = [
@@ -190,21 +228,10 @@ def score_document(
     gold_list = sorted(gold_citations, key=lambda c: c.span.start)
     pred_list = sorted(pred_citations, key=lambda c: c.span.start)
 
-    overlap_matched_gold: set[int] = set()
-    overlap_matched_pred: set[int] = set()
-
-    for pi, pc in enumerate(pred_list):
-        for gi, gc in enumerate(gold_list):
-            if gi in overlap_matched_gold:
-                continue
-            if _spans_overlap(pc.span.start, pc.span.end, gc.span.start, gc.span.end):
-                result.span_overlap.tp += 1
-                overlap_matched_gold.add(gi)
-                overlap_matched_pred.add(pi)
-                break
-
-    result.span_overlap.fp += len(pred_list) - len(overlap_matched_pred)
-    result.span_overlap.fn += len(gold_list) - len(overlap_matched_gold)
+    n_overlap = len(_overlap_pairs(pred_list, gold_list))
+    result.span_overlap.tp += n_overlap
+    result.span_overlap.fp += len(pred_list) - n_overlap
+    result.span_overlap.fn += len(gold_list) - n_overlap
 
     for ctype in ("law", "case"):
         if ctype not in result.span_by_type:
@@ -222,33 +249,88 @@ def score_document(
         if key not in result.span_by_type:
             result.span_by_type[key] = PRF()
         prf = result.span_by_type[key]
-        gold_t = [c for c in gold_citations if c.type == ctype]
-        pred_t = [c for c in pred_citations if c.type == ctype]
-        gold_t.sort(key=lambda c: c.span.start)
-        pred_t.sort(key=lambda c: c.span.start)
-        omg: set[int] = set()
-        omp: set[int] = set()
-        for pi, pc in enumerate(pred_t):
-            for gi, gc in enumerate(gold_t):
-                if gi in omg:
-                    continue
-                if _spans_overlap(pc.span.start, pc.span.end, gc.span.start, gc.span.end):
-                    prf.tp += 1
-                    omg.add(gi)
-                    omp.add(pi)
-                    break
-        prf.fp += len(pred_t) - len(omp)
-        prf.fn += len(gold_t) - len(omg)
+        gold_t = [c for c in gold_list if c.type == ctype]
+        pred_t = [c for c in pred_list if c.type == ctype]
+        tp = len(_overlap_pairs(pred_t, gold_t))
+        prf.tp += tp
+        prf.fp += len(pred_t) - tp
+        prf.fn += len(gold_t) - tp
 
     _score_fields(gold_spans, pred_spans, matched_gold, result)
 
-    _score_fields_overlap(gold_citations, pred_citations, result)
+    _score_fields_overlap(gold_list, pred_list, result)
 
 
 def _spans_overlap(s1: int, e1: int, s2: int, e2: int) -> bool:
     return s1 < e2 and s2 < e1
 
 
+def greedy_overlap_pairs(pred_spans: list[tuple[int, int]], gold_spans: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Greedy overlap matching of ``(start, end)`` spans, as ``(pred_index, gold_index)`` pairs.
+
+    Predictions are matched in list order; each takes the lowest-index
+    unmatched gold span it overlaps (``_spans_overlap``).  ``gold_spans``
+    must be sorted by start.  The gold spans starting before a prediction
+    ends are a prefix of the list, so the match is the leftmost index in
+    that prefix whose end lies after the prediction's start: a descent in
+    a segment tree of gold ends, with matched spans set to -1.
+    """
+    n = len(gold_spans)
+    if n == 0 or not pred_spans:
+        return []
+    size = 1
+    while size < n:
+        size *= 2
+    tree = [-1] * (2 * size)
+    tree[size : size + n] = [e for _, e in gold_spans]
+    for node in range(size - 1, 0, -1):
+        left, right = tree[2 * node], tree[2 * node + 1]
+        tree[node] = left if left > right else right
+    starts = [s for s, _ in gold_spans]
+
+    pairs = []
+    for pi, (p_start, p_end) in enumerate(pred_spans):
+        limit = bisect_left(starts, p_end)  # gold[:limit] start before the prediction ends
+        if limit == 0 or tree[1] <= p_start:
+            continue
+        gi = _leftmost_above(tree, size, limit, p_start)
+        if gi < 0:
+            continue
+        pairs.append((pi, gi))
+        node = size + gi
+        tree[node] = -1
+        node //= 2
+        while node:
+            left, right = tree[2 * node], tree[2 * node + 1]
+            tree[node] = left if left > right else right
+            node //= 2
+    return pairs
+
+
+def _leftmost_above(tree: list[int], size: int, limit: int, value: int) -> int:
+    """Leftmost leaf index ``< limit`` whose value is ``> value``, or -1."""
+    stack = [(1, 0, size)]
+    while stack:
+        node, lo, hi = stack.pop()
+        if lo >= limit or tree[node] <= value:
+            continue
+        if node >= size:
+            return lo
+        mid = (lo + hi) // 2
+        # Right child first, so the left one is popped (and searched) first
+        stack.append((2 * node + 1, mid, hi))
+        stack.append((2 * node, lo, mid))
+    return -1
+
+
+def _overlap_pairs(pred_list: list[Citation], gold_list: list[Citation]) -> list[tuple[int, int]]:
+    """``greedy_overlap_pairs`` on citations (``gold_list`` sorted by start)."""
+    return greedy_overlap_pairs(
+        [(c.span.start, c.span.end) for c in pred_list],
+        [(c.span.start, c.span.end) for c in gold_list],
+    )
+
+
 def _score_fields(
     gold_spans: dict[tuple[int, int], Citation],
     pred_spans: dict[tuple[int, int], Citation],
@@ -304,42 +386,31 @@ def _score_structure(
 
 
 def _score_fields_overlap(
-    gold_citations: list[Citation],
-    pred_citations: list[Citation],
+    gold_list: list[Citation],
+    pred_list: list[Citation],
     result: BenchmarkResult,
 ) -> None:
-    """Score field accuracy on overlap-matched citation pairs."""
-    gold_list = sorted(gold_citations, key=lambda c: c.span.start)
-    pred_list = sorted(pred_citations, key=lambda c: c.span.start)
+    """Score field accuracy on overlap-matched citation pairs of the same type.
 
-    matched_gold: set[int] = set()
-
-    for pc in pred_list:
-        for gi, gc in enumerate(gold_list):
-            if gi in matched_gold:
-                continue
-            if gc.type != pc.type:
-                continue
-            if _spans_overlap(pc.span.start, pc.span.end, gc.span.start, gc.span.end):
-                matched_gold.add(gi)
-                # Score fields on this overlap-matched pair
-                if gc.type == "law":
-                    for fname in ("book", "number"):
-                        _score_field(
-                            f"{fname}_overlap",
-                            getattr(gc, fname),
-                            getattr(pc, fname),
-                            result,
-                        )
-                elif gc.type == "case":
-                    for fname in ("court", "file_number"):
-                        _score_field(
-                            f"{fname}_overlap",
-                            getattr(gc, fname),
-                            getattr(pc, fname),
-                            result,
-                        )
-                break
+    Both lists are sorted by start.
+    """
+    # A prediction can only match gold of its own type, so the greedy
+    # matching splits by type; pairs are scored in prediction order.
+    pairs: list[tuple[Citation, Citation]] = []
+    for ctype in dict.fromkeys(c.type for c in pred_list):
+        pred_t = [(pi, c) for pi, c in enumerate(pred_list) if c.type == ctype]
+        gold_t = [c for c in gold_list if c.type == ctype]
+        for pi, gi in _overlap_pairs([c for _, c in pred_t], gold_t):
+            pairs.append((pred_t[pi], gold_t[gi]))
+    pairs.sort(key=lambda pair: pair[0][0])
+
+    for (_, pc), gc in pairs:
+        if gc.type == "law":
+            for fname in ("book", "number"):
+                _score_field(f"{fname}_overlap", getattr(gc, fname), getattr(pc, fname), result)
+        elif gc.type == "case":
+            for fname in ("court", "file_number"):
+                _score_field(f"{fname}_overlap", getattr(gc, fname), getattr(pc, fname), result)
 
 
 def _score_field(
@@ -0,0 +1,357 @@
+"""Throughput and latency benchmark, separate from accuracy scoring.
+
+Times each engine's ``extract`` over the documents of a split without
+loading gold scoring into the loop:
+
+* **warm** — one engine instance, ``--warmup`` untimed passes, then
+  ``--repeat`` timed passes; docs/sec and chars/sec are reported as the
+  mean over passes with a 95% confidence interval, per-document latency
+  as p50/p95/p99 over all timed passes, overall and per document-length
+  bucket.
+* **cold** — ``--cold-runs`` fresh interpreters, each building the
+  engine and making one pass (includes imports, grammar compilation and
+  model loading).
+* **memory** (``--memory``) — one more pass of the warm engine under
+  tracemalloc: peak memory per document-length bucket, the allocation
+  sites held at the peak and the RSS high-water mark (see
+  ``benchmarks.memory``).
+
+Engines: ``regex-law`` (``RegexLawExtractor``), ``regex-case``
+(``RegexCaseExtractor``), ``crf`` (``CRFExtractor``), ``transformer``
+(``TransformerExtractor``) and ``full`` (``CitationExtractor`` with its
+default engines).  Engines that cannot be built (missing extra or model)
+are reported as skipped.
+
+Usage:
+    python -m benchmarks.perf [OPTIONS]
+
+Examples:
+    python -m benchmarks.perf                          # fixtures, all engines
+    python -m benchmarks.perf -e regex-law -e full -r 10
+    python -m benchmarks.perf --cold-runs 0 --json -o perf.json
+    python -m benchmarks.perf -d /path/to/dataset -s validation -n 500
+    python -m benchmarks.perf -e full --memory -d benchmarks/fixtures/html_documents.jsonl
+
+Environment:
+    REFEX_TRANSFORMER_* as for ``benchmarks.run``
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from benchmarks.datasets import load_dataset
+
+ENGINES = ("regex-law", "regex-case", "crf", "transformer", "full")
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Upper bounds (exclusive, in characters) of the document-length buckets
+LENGTH_BUCKETS: tuple[tuple[str, float], ...] = (
+    ("<2k", 2_000),
+    ("2k-10k", 10_000),
+    ("10k-25k", 25_000),
+    (">=25k", math.inf),
+)
+
+# Two-sided 95% Student t critical values by degrees of freedom
+_T95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262, 10: 2.228}
+_T95.update({12: 2.179, 15: 2.131, 20: 2.086, 25: 2.060, 30: 2.042, 60: 2.000, 120: 1.980})
+
+
+def build_engine(name: str, crf_model: Path | None = None) -> Callable[[str], object]:
+    """Build the ``text -> result`` function timed for engine ``name``."""
+    if name == "full":
+        from refex.orchestrator import CitationExtractor
+
+        extractor = CitationExtractor()
+        return extractor.extract
+
+    from refex.engines import create_engine
+
+    kwargs: dict = {}
+    if name == "crf" and crf_model is not None:
+        kwargs["model_path"] = crf_model
+    elif name == "transformer":
+        from benchmarks.run import _transformer_kwargs_from_env
+
+        kwargs = _transformer_kwargs_from_env()
+
+    engine = create_engine(name, **kwargs)
+    if name == "crf":
+        engine._load_model()  # fail here, not inside the timed loop
+    elif name == "transformer":
+        engine._load()
+    return engine.extract
+
+
+def time_pass(fn: Callable[[str], object], texts: list[str]) -> list[float]:
+    """Per-document wall time (seconds) of one pass over ``texts``."""
+    times = []
+    for text in texts:
+        t0 = time.perf_counter()
+        fn(text)
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Linearly interpolated ``q``-th percentile (0-100) of sorted values."""
+    if not sorted_values:
+        return math.nan
+    pos = (len(sorted_values) - 1) * q / 100
+    lo = math.floor(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+def mean_ci(values: list[float]) -> tuple[float, float]:
+    """Mean and half-width of its 95% confidence interval (Student t)."""
+    mean = statistics.fmean(values)
+    if len(values) < 2:
+        return mean, math.nan
+    df = len(values) - 1
+    t = _T95.get(df) or _T95[max(k for k in _T95 if k <= df)]
+    return mean, t * statistics.stdev(values) / math.sqrt(len(values))
+
+
+def length_bucket(n_chars: int) -> str:
+    for label, upper in LENGTH_BUCKETS:
+        if n_chars < upper:
+            return label
+    return LENGTH_BUCKETS[-1][0]
+
+
+def _latency_ms(times: list[float]) -> dict:
+    s = sorted(times)
+    return {
+        "p50": round(percentile(s, 50) * 1000, 3),
+        "p95": round(percentile(s, 95) * 1000, 3),
+        "p99": round(percentile(s, 99) * 1000, 3),
+        "max": round(s[-1] * 1000, 3) if s else math.nan,
+    }
+
+
+def measure_warm(fn: Callable[[str], object], texts: list[str], warmup: int = 1, repeat: int = 5) -> dict:
+    """Warm throughput and latency of ``fn`` over ``texts``."""
+    for _ in range(warmup):
+        time_pass(fn, texts)
+    passes = [time_pass(fn, texts) for _ in range(repeat)]
+
+    chars = sum(len(t) for t in texts)
+    docs_per_sec, docs_ci = mean_ci([len(texts) / sum(p) for p in passes])
+    chars_per_sec, chars_ci = mean_ci([chars / sum(p) for p in passes])
+
+    buckets: dict[str, dict] = {}
+    for label, _ in LENGTH_BUCKETS:
+        idx = [i for i, t in enumerate(texts) if length_bucket(len(t)) == label]
+        if not idx:
+            continue
+        bucket_times = [p[i] for p in passes for i in idx]
+        bucket_chars = sum(len(texts[i]) for i in idx) * len(passes)
+        buckets[label] = {
+            "docs": len(idx),
+            "latency_ms": _latency_ms(bucket_times),
+            "chars_per_second": round(bucket_chars / sum(bucket_times), 0),
+        }
+
+    return {
+        "passes": repeat,
+        "docs_per_second": round(docs_per_sec, 2),
+        "docs_per_second_ci95": round(docs_ci, 2),
+        "chars_per_second": round(chars_per_sec, 0),
+        "chars_per_second_ci95": round(chars_ci, 0),
+        "latency_ms": _latency_ms([t for p in passes for t in p]),
+        "buckets": buckets,
+        # in document order, for run-to-run comparison (benchmarks.compare)
+        "doc_latency_ms": [round(statistics.median(ts) * 1000, 4) for ts in zip(*passes)],
+        "pass_latency_ms": [[round(t * 1000, 4) for t in p] for p in passes],
+    }
+
+
+def measure_cold(
+    engine: str,
+    data_dir: Path,
+    split: str,
+    limit: int | None,
+    runs: int = 3,
+    crf_model: Path | None = None,
+) -> dict:
+    """Cold-start timings of ``engine``: each run in a fresh interpreter."""
+    cmd = [sys.executable, "-m", "benchmarks.perf", "--cold-child", engine, "-d", str(data_dir), "-s", split]
+    if limit is not None:
+        cmd += ["-n", str(limit)]
+    if crf_model is not None:
+        cmd += ["--crf-model", str(crf_model)]
+
+    results = []
+    for _ in range(runs):
+        proc = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        results.append(json.loads(proc.stdout))
+    init = [r["init_seconds"] for r in results]
+    total = [r["init_seconds"] + r["pass_seconds"] for r in results]
+    docs = results[0]["docs"]
+    docs_per_sec, ci = mean_ci([docs / t for t in total])
+    return {
+        "runs": runs,
+        "init_seconds": round(statistics.median(init), 3),
+        "first_pass_seconds": round(statistics.median(r["pass_seconds"] for r in results), 3),
+        "docs_per_second": round(docs_per_sec, 2),
+        "docs_per_second_ci95": round(ci, 2),
+    }
+
+
+def _cold_child(engine: str, texts: list[str], crf_model: Path | None) -> None:
+    t0 = time.perf_counter()
+    fn = build_engine(engine, crf_model)
+    init = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for text in texts:
+        fn(text)
+    report = {"init_seconds": init, "pass_seconds": time.perf_counter() - t0, "docs": len(texts)}
+    sys.stdout.write(json.dumps(report) + "\n")
+
+
+def measure_memory(fn: Callable[[str], object], texts: list[str]) -> dict:
+    """One pass of ``fn`` under tracemalloc; see ``benchmarks.memory``."""
+    from benchmarks.memory import MemoryProfile
+
+    profile = MemoryProfile(fn)
+    try:
+        for text in texts:
+            profile(text)
+        return profile.report()
+    finally:
+        profile.stop()
+
+
+def run_perf(
+    engines: list[str],
+    data_dir: Path = FIXTURES_DIR,
+    split: str = "test",
+    limit: int | None = None,
+    warmup: int = 1,
+    repeat: int = 5,
+    cold_runs: int = 3,
+    crf_model: Path | None = None,
+    memory: bool = False,
+) -> dict:
+    """Measure every engine and return a report dict."""
+    dataset = load_dataset(data_dir, split=split)
+    documents = dataset.documents[:limit]
+    texts = [doc.text for doc in documents]
+    report: dict = {
+        "data_dir": str(data_dir),
+        "split": split,
+        "docs": len(texts),
+        "chars": sum(len(t) for t in texts),
+        "doc_ids": [doc.doc_id for doc in documents],
+        "engines": {},
+    }
+
+    for engine in engines:
+        try:
+            fn = build_engine(engine, crf_model)
+        except (ImportError, OSError) as exc:
+            report["engines"][engine] = {"skipped": f"{type(exc).__name__}: {exc}".splitlines()[0]}
+            continue
+        entry = {"warm": measure_warm(fn, texts, warmup=warmup, repeat=repeat)}
+        if cold_runs > 0:
+            entry["cold"] = measure_cold(engine, data_dir, split, limit, runs=cold_runs, crf_model=crf_model)
+        if memory:
+            entry["memory"] = measure_memory(fn, texts)
+        report["engines"][engine] = entry
+    return report
+
+
+def format_report(report: dict) -> str:
+    lines = [f"Dataset: {report['data_dir']} ({report['split']}, {report['docs']} docs, {report['chars']} chars)", ""]
+    for engine, entry in report["engines"].items():
+        if "skipped" in entry:
+            lines.append(f"{engine}: skipped ({entry['skipped']})")
+            lines.append("")
+            continue
+        warm = entry["warm"]
+        lat = warm["latency_ms"]
+        lines.append(f"{engine}")
+        lines.append(
+            f"  warm  {warm['docs_per_second']:10.1f} ± {warm['docs_per_second_ci95']:.1f} docs/s"
+            f"  {warm['chars_per_second']:12.0f} chars/s  ({warm['passes']} passes)"
+        )
+        if "cold" in entry:
+            cold = entry["cold"]
+            lines.append(
+                f"  cold  {cold['docs_per_second']:10.1f} ± {cold['docs_per_second_ci95']:.1f} docs/s"
+                f"  init {cold['init_seconds']:.3f}s  first pass {cold['first_pass_seconds']:.3f}s"
+            )
+        lines.append(f"  latency  p50 {lat['p50']:.2f} ms  p95 {lat['p95']:.2f} ms  p99 {lat['p99']:.2f} ms")
+        for label, bucket in warm["buckets"].items():
+            bl = bucket["latency_ms"]
+            lines.append(
+                f"    {label:>8s} ({bucket['docs']:4d} docs)  p50 {bl['p50']:9.2f} ms  p95 {bl['p95']:9.2f} ms"
+                f"  {bucket['chars_per_second']:12.0f} chars/s"
+            )
+        if "memory" in entry:
+            from benchmarks.memory import format_memory
+
+            lines.extend(format_memory(entry["memory"]))
+        lines.append("")
+    return "\n".join(lines).rstrip() + "\n"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Throughput and latency benchmark (no accuracy scoring).")
+    parser.add_argument(
+        "-e",
+        "--engine",
+        action="append",
+        choices=ENGINES,
+        help="Engine to measure (repeatable; default: all)",
+    )
+    parser.add_argument("-d", "--data-dir", type=Path, default=FIXTURES_DIR, help="Dataset (default: fixtures)")
+    parser.add_argument("-s", "--split", default="test", help="Dataset split (default: test)")
+    parser.add_argument("-n", "--limit", type=int, default=None, metavar="N", help="Use at most N documents")
+    parser.add_argument("-w", "--warmup", type=int, default=1, help="Untimed warm-up passes (default: 1)")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Timed warm passes (default: 5)")
+    parser.add_argument("--cold-runs", type=int, default=3, help="Fresh-interpreter runs, 0 to skip (default: 3)")
+    parser.add_argument("--crf-model", type=Path, default=None, help="CRF model path (default: bundled)")
+    parser.add_argument("--memory", action="store_true", help="Add a tracemalloc pass: peak memory and top sites")
+    parser.add_argument("--json", action="store_true", help="Output the report as JSON")
+    parser.add_argument("-o", "--output", type=Path, default=None, help="Write output to file")
+    parser.add_argument("--cold-child", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.cold_child:
+        dataset = load_dataset(args.data_dir, split=args.split)
+        _cold_child(args.cold_child, [d.text for d in dataset.documents[: args.limit]], args.crf_model)
+        return
+
+    report = run_perf(
+        args.engine or list(ENGINES),
+        data_dir=args.data_dir,
+        split=args.split,
+        limit=args.limit,
+        warmup=args.warmup,
+        repeat=args.repeat,
+        cold_runs=args.cold_runs,
+        crf_model=args.crf_model,
+        memory=args.memory,
+    )
+    output = json.dumps(report, indent=2) + "\n" if args.json else format_report(report)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(output, encoding="utf-8")
+    else:
+        sys.stdout.write(output)
+
+
+if __name__ == "__main__":
+    main()
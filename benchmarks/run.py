@@ -9,9 +9,26 @@ Examples:
     python -m benchmarks.run --limit 50 --split validation  # quick dev check
     python -m benchmarks.run --json --output results.json   # machine-readable
     python -m benchmarks.run --data-dir /path/to/hf_dataset --split test
+    python -m benchmarks.run --phase-stats --split validation  # regex phase timings
+    python -m benchmarks.run --workers 8 --split validation    # 8 processes
+    python -m benchmarks.run --memory --limit 200              # peak memory per doc size
 
 Environment:
     BENCH_DATA_DIR  Override the default data directory
+    BENCH_CACHE_DIR Gold-annotation cache directory (``off`` to disable;
+                    see ``benchmarks.datasets``)
+    REFEX_TRANSFORMER_MODEL / REFEX_TRANSFORMER_DEVICE
+                    Transformer model and device for the transformer engines
+    REFEX_TRANSFORMER_ENCODING_CACHE
+                    Directory for cached transformer encodings (reused
+                    across checkpoints that share a tokenizer)
+    REFEX_TRANSFORMER_WINDOWS / REFEX_TRANSFORMER_MERGE
+                    Window strategy (``overflow``, ``adaptive``) and overlap
+                    merge (``first``, ``center``, ``max_logit``); compare
+                    two runs for the throughput and F1 delta
+    REFEX_TRANSFORMER_THREADS
+                    Intra-op threads per transformer extractor (with
+                    ``--workers``, defaults to cores / workers)
 """
 
 from __future__ import annotations
@@ -19,6 +36,7 @@ from __future__ import annotations
 import argparse
 import json
 import logging
+import os
 import statistics
 import sys
 import time
@@ -37,6 +55,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+ENGINES = ("regex", "crf", "regex+crf", "transformer", "regex+transformer")
+
 
 def _crf_citation_to_benchmark(cit) -> BenchmarkCitation:
     """Convert a refex CRF Citation to the benchmark's Citation format."""
@@ -54,15 +74,34 @@ def _crf_citation_to_benchmark(cit) -> BenchmarkCitation:
     return BenchmarkCitation(**kwargs)
 
 
-def _build_extract_fn(engine: str):
+def _transformer_kwargs_from_env() -> dict:
+    """``TransformerExtractor`` keyword arguments from ``REFEX_TRANSFORMER_*``."""
+    env = {
+        "model": "REFEX_TRANSFORMER_MODEL",
+        "device": "REFEX_TRANSFORMER_DEVICE",
+        "encoding_cache": "REFEX_TRANSFORMER_ENCODING_CACHE",
+        "window_strategy": "REFEX_TRANSFORMER_WINDOWS",
+        "overlap_merge": "REFEX_TRANSFORMER_MERGE",
+        "intra_op_threads": "REFEX_TRANSFORMER_THREADS",
+    }
+    kwargs: dict = {key: os.environ[var] for key, var in env.items() if os.environ.get(var)}
+    if "intra_op_threads" in kwargs:
+        kwargs["intra_op_threads"] = int(kwargs["intra_op_threads"])
+    return kwargs
+
+
+def _build_extract_fn(engine: str, phase_stats=None):
     """Build a `text -> list[Citation]` function for the chosen engine.
 
     Returns benchmark-format Citations (benchmarks.datasets.Citation).
+    ``phase_stats`` (a ``refex.extractors.stats.PhaseStats``) is attached
+    to the regex extractor of the engines that use one.
     """
     if engine == "regex":
         from refex.extractor import RefExtractor
 
         extractor = RefExtractor()
+        extractor.phase_stats = phase_stats
 
         def extract(text: str):
             markers = []
@@ -91,6 +130,7 @@ def _build_extract_fn(engine: str):
         from refex.extractor import RefExtractor
 
         regex_ext = RefExtractor()
+        regex_ext.phase_stats = phase_stats
         crf = CRFExtractor()
 
         def extract(text: str):
@@ -118,18 +158,9 @@ def _build_extract_fn(engine: str):
         return extract
 
     if engine == "transformer":
-        import os
-
         from refex.engines.transformer import TransformerExtractor
 
-        model = os.environ.get("REFEX_TRANSFORMER_MODEL")
-        device = os.environ.get("REFEX_TRANSFORMER_DEVICE")
-        kwargs = {}
-        if model:
-            kwargs["model"] = model
-        if device:
-            kwargs["device"] = device
-        tx = TransformerExtractor(**kwargs)
+        tx = TransformerExtractor(**_transformer_kwargs_from_env())
 
         def extract(text: str):
             cits, _ = tx.extract(text)
@@ -138,20 +169,12 @@ def _build_extract_fn(engine: str):
         return extract
 
     if engine == "regex+transformer":
-        import os
-
         from refex.engines.transformer import TransformerExtractor
         from refex.extractor import RefExtractor
 
         regex_ext = RefExtractor()
-        model = os.environ.get("REFEX_TRANSFORMER_MODEL")
-        device = os.environ.get("REFEX_TRANSFORMER_DEVICE")
-        kwargs = {}
-        if model:
-            kwargs["model"] = model
-        if device:
-            kwargs["device"] = device
-        tx = TransformerExtractor(**kwargs)
+        regex_ext.phase_stats = phase_stats
+        tx = TransformerExtractor(**_transformer_kwargs_from_env())
 
         def extract(text: str):
             content = regex_ext.remove_markers(text)
@@ -181,6 +204,188 @@ def _build_extract_fn(engine: str):
     raise ValueError(msg)
 
 
+def _extract(extract_fn, text: str) -> tuple[list, list, float]:
+    """Run ``extract_fn`` on ``text``; returns ``(citations, relations, seconds)``."""
+    t_doc_start = time.perf_counter()
+    pred = extract_fn(text)
+    t_doc = time.perf_counter() - t_doc_start
+
+    # A2d — extract_fn may return either a plain ``list[Citation]``
+    # (legacy) or a ``(citations, relations)`` tuple (for engines that
+    # emit relations).  Normalise here so the scorer sees both.
+    if isinstance(pred, tuple):
+        pred_citations, pred_relations = pred
+    else:
+        pred_citations = pred
+        pred_relations = []
+    return pred_citations, pred_relations, t_doc
+
+
+def _score(gold_ann, pred_citations: list, pred_relations: list, result: BenchmarkResult) -> None:
+    # Filter gold to law + case only (refex doesn't extract literature)
+    gold_citations = [c for c in gold_ann.citations if c.type in ("law", "case")]
+    gold_relations: list[BenchmarkRelation] = list(gold_ann.relations)
+
+    score_document(gold_citations, pred_citations, result)
+    score_relations(gold_citations, gold_relations, pred_citations, pred_relations, result)
+
+
+def _serial_outcomes(dataset, extract_fn, result: BenchmarkResult):
+    """Extract and score annotated documents in order, into ``result``.
+
+    Yields ``(seconds, chars, worker)`` per scored document and ``None``
+    per extraction error.
+    """
+    for doc in dataset.documents:
+        gold_ann = dataset.annotations.get(doc.doc_id)
+        if not gold_ann:
+            continue
+        try:
+            pred_citations, pred_relations, t_doc = _extract(extract_fn, doc.text)
+        except Exception:
+            logger.exception("Failed to extract from %s", doc.doc_id)
+            yield None
+            continue
+        _score(gold_ann, pred_citations, pred_relations, result)
+        yield t_doc, len(doc.text), None
+
+
+# Per-process state of a ``--workers`` pool process (set by ``_init_worker``)
+_worker_state: dict = {}
+
+
+def _init_worker(data_dir: Path | None, split: str, engine: str, phase_stats: bool, threads: int) -> None:
+    # Split the cores between the workers unless set explicitly
+    os.environ.setdefault("REFEX_TRANSFORMER_THREADS", str(threads))
+    t0 = time.perf_counter()
+    stats = None
+    if phase_stats:
+        from refex.extractors.stats import PhaseStats
+
+        stats = PhaseStats()
+    _worker_state.update(
+        dataset=load_dataset(data_dir, split=split),
+        extract_fn=_build_extract_fn(engine, phase_stats=stats),
+        stats=stats,
+        init_seconds=time.perf_counter() - t0,
+    )
+
+
+def _score_chunk(bounds: tuple[int, int]) -> dict:
+    """Extract and score documents ``start:stop`` in a pool process.
+
+    Each annotated document gets its own ``BenchmarkResult`` (``None`` on
+    an extraction error), so the parent can merge them in document order.
+    """
+    dataset, extract_fn, stats = _worker_state["dataset"], _worker_state["extract_fn"], _worker_state["stats"]
+    start, stop = bounds
+    docs: list[tuple[BenchmarkResult, float, int] | None] = []
+    for doc in dataset.documents[start:stop]:
+        gold_ann = dataset.annotations.get(doc.doc_id)
+        if not gold_ann:
+            continue
+        try:
+            pred_citations, pred_relations, t_doc = _extract(extract_fn, doc.text)
+        except Exception:
+            logger.exception("Failed to extract from %s", doc.doc_id)
+            docs.append(None)
+            continue
+        doc_result = BenchmarkResult()
+        _score(gold_ann, pred_citations, pred_relations, doc_result)
+        docs.append((doc_result, t_doc, len(doc.text)))
+
+    phases = None
+    if stats is not None:
+        phases = stats.to_dict()
+        stats.reset()
+    from benchmarks.memory import rss_high_water_mb
+
+    return {
+        "pid": os.getpid(),
+        "init_seconds": _worker_state["init_seconds"],
+        "docs": docs,
+        "phases": phases,
+        "rss_high_water_mb": rss_high_water_mb(),
+    }
+
+
+def _docs_to_schedule(dataset, limit: int | None) -> int:
+    """Leading documents the workers need: all, or up to the ``limit``-th annotated one.
+
+    With a limit the split is read only that far, not indexed to the end.
+    Extraction errors count towards the limit here, so a run with errors
+    may score fewer documents than a serial one.
+    """
+    if limit is None:
+        return len(dataset.documents)
+    n_docs = annotated = 0
+    for doc in dataset.documents:
+        if annotated >= limit:
+            break
+        n_docs += 1
+        if dataset.annotations.get(doc.doc_id):
+            annotated += 1
+    return n_docs
+
+
+def _parallel_outcomes(
+    data_dir: Path | None,
+    split: str,
+    engine: str,
+    n_docs: int,
+    workers: int,
+    chunk_size: int,
+    result: BenchmarkResult,
+    worker_rows: dict[int, dict],
+    phase_counters=None,
+):
+    """``_serial_outcomes`` over a pool of ``workers`` processes.
+
+    Chunks of ``chunk_size`` documents are handed out on demand and their
+    per-document results merged into ``result`` in document order, so the
+    metrics equal a serial run.  Per-process timings are collected in
+    ``worker_rows`` (keyed by pid).
+    """
+    import multiprocessing
+
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    threads = max(1, cores // workers)
+    ranges = [(start, min(start + chunk_size, n_docs)) for start in range(0, n_docs, chunk_size)]
+    ctx = multiprocessing.get_context("spawn")
+    initargs = (data_dir, split, engine, phase_counters is not None, threads)
+    with ctx.Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+        for chunk in pool.imap(_score_chunk, ranges):
+            row = worker_rows.setdefault(
+                chunk["pid"],
+                {
+                    "worker": len(worker_rows),
+                    "init_seconds": round(chunk["init_seconds"], 3),
+                    "docs": 0,
+                    "errors": 0,
+                    "chars": 0,
+                    "extract_seconds": 0.0,
+                    "rss_high_water_mb": None,
+                },
+            )
+            if chunk["rss_high_water_mb"] is not None:
+                row["rss_high_water_mb"] = max(row["rss_high_water_mb"] or 0.0, chunk["rss_high_water_mb"])
+            if phase_counters is not None and chunk["phases"]:
+                from refex.extractors.stats import PhaseStats
+
+                phase_counters.merge(PhaseStats.from_dict(chunk["phases"]))
+            for outcome in chunk["docs"]:
+                if outcome is None:
+                    row["errors"] += 1
+                    yield None
+                    continue
+                doc_result, t_doc, n_chars = outcome
+                result.merge(doc_result)
+                row["docs"] += 1
+                row["chars"] += n_chars
+                row["extract_seconds"] += t_doc
+                yield t_doc, n_chars, row["worker"]
+
+
 def run_benchmark(
     data_dir: Path | None = None,
     limit: int | None = None,
@@ -188,6 +393,10 @@ def run_benchmark(
     engine: str = "regex",
     profile: bool = False,
     profile_output: Path | None = None,
+    phase_stats: bool = False,
+    workers: int = 1,
+    chunk_size: int = 8,
+    memory: bool = False,
 ) -> tuple[BenchmarkResult, dict]:
     """Run the full benchmark pipeline.
 
@@ -204,20 +413,59 @@ def run_benchmark(
             (and to ``profile_output`` when provided). Off by default.
         profile_output: Optional path to write the full cProfile stats
             (human-readable text). Ignored when ``profile`` is False.
+        phase_stats: If True, record per-phase time, match counts and
+            mask sizes of the regex extractors under ``timing["phases"]``.
+        workers: Extract and score in this many processes (each builds
+            its own extractor).  Metrics are identical to a serial run;
+            ``timing["workers"]`` has per-process timings and peak RSS,
+            and ``timing["rss_high_water_mb"]`` sums the workers' peaks
+            with this process's.
+        chunk_size: Documents per task handed to a worker.
+        memory: If True, trace allocations (see ``benchmarks.memory``) and
+            report peak memory per document-size bucket, the top
+            allocation sites and the RSS high-water mark under
+            ``timing["memory"]``.  Extraction times are inflated.
 
     Returns:
         (BenchmarkResult, timing_stats) tuple.
     """
+    if workers > 1 and profile:
+        msg = "profile is not supported with workers > 1"
+        raise ValueError(msg)
+    if workers > 1 and memory:
+        msg = "memory is not supported with workers > 1"
+        raise ValueError(msg)
+
     t_load_start = time.perf_counter()
     dataset = load_dataset(data_dir, split=split)
     t_load = time.perf_counter() - t_load_start
 
-    t_init_start = time.perf_counter()
-    extract_fn = _build_extract_fn(engine)
-    t_init = time.perf_counter() - t_init_start
-    logger.info("Using engine: %s (init %.3fs)", engine, t_init)
+    phase_counters = None
+    if phase_stats:
+        from refex.extractors.stats import PhaseStats
+
+        phase_counters = PhaseStats()
 
     result = BenchmarkResult()
+    memory_profile = None
+    worker_rows: dict[int, dict] = {}
+    if workers > 1:
+        t_init = 0.0  # per worker, see timing["workers"]
+        n_docs = _docs_to_schedule(dataset, limit)
+        outcomes = _parallel_outcomes(
+            data_dir, split, engine, n_docs, workers, chunk_size, result, worker_rows, phase_counters
+        )
+    else:
+        t_init_start = time.perf_counter()
+        extract_fn = _build_extract_fn(engine, phase_stats=phase_counters)
+        t_init = time.perf_counter() - t_init_start
+        logger.info("Using engine: %s (init %.3fs)", engine, t_init)
+        if memory:
+            from benchmarks.memory import MemoryProfile
+
+            extract_fn = memory_profile = MemoryProfile(extract_fn)
+        outcomes = _serial_outcomes(dataset, extract_fn, result)
+
     processed = 0
     errors = 0
     doc_times: list[float] = []
@@ -225,7 +473,8 @@ def run_benchmark(
 
     t_extract_start = time.perf_counter()
 
-    total_docs = len(dataset.documents) if limit is None else min(limit, len(dataset.documents))
+    # Only for the progress line; with a limit, avoid indexing the whole split
+    total_docs = len(dataset.documents) if limit is None else limit
 
     profiler = None
     if profile:
@@ -234,47 +483,22 @@ def run_benchmark(
         profiler = cProfile.Profile()
         profiler.enable()
 
-    for doc in dataset.documents:
-        if limit is not None and processed >= limit:
-            break
-
-        gold_ann = dataset.annotations.get(doc.doc_id)
-        if not gold_ann:
-            continue
-
-        # Filter gold to law + case only (refex doesn't extract literature)
-        gold_citations = [c for c in gold_ann.citations if c.type in ("law", "case")]
-        gold_relations: list[BenchmarkRelation] = list(gold_ann.relations)
-
-        try:
-            t_doc_start = time.perf_counter()
-            pred = extract_fn(doc.text)
-            t_doc = time.perf_counter() - t_doc_start
-            doc_times.append(t_doc)
-            doc_chars.append(len(doc.text))
-        except Exception:
-            logger.exception("Failed to extract from %s", doc.doc_id)
+    if limit is not None and limit <= 0:
+        outcomes.close()
+    for outcome in outcomes:
+        if outcome is None:
             errors += 1
             continue
-
-        # A2d — extract_fn may return either a plain ``list[Citation]``
-        # (legacy) or a ``(citations, relations)`` tuple (for engines that
-        # emit relations).  Normalise here so the scorer sees both.
-        if isinstance(pred, tuple):
-            pred_citations, pred_relations = pred
-        else:
-            pred_citations = pred
-            pred_relations = []
-
-        score_document(gold_citations, pred_citations, result)
-        score_relations(gold_citations, gold_relations, pred_citations, pred_relations, result)
+        t_doc, n_chars, _ = outcome
+        doc_times.append(t_doc)
+        doc_chars.append(n_chars)
         processed += 1
 
         # Progress logging
         if processed % 100 == 0 or t_doc > 1.0:
             elapsed = time.perf_counter() - t_extract_start
             rate = processed / elapsed if elapsed > 0 else 0
-            slow_tag = f" [SLOW {t_doc * 1000:.0f}ms len={len(doc.text)}]" if t_doc > 1.0 else ""
+            slow_tag = f" [SLOW {t_doc * 1000:.0f}ms len={n_chars}]" if t_doc > 1.0 else ""
             print(
                 f"\r  {processed}/{total_docs} docs  ({rate:.0f} docs/s, {elapsed:.1f}s elapsed){slow_tag}",
                 end="",
@@ -282,6 +506,11 @@ def run_benchmark(
                 file=sys.stderr,
             )
 
+        # Checked after the document, so no further one is extracted
+        if limit is not None and processed >= limit:
+            break
+    outcomes.close()
+
     if processed > 100:
         print(file=sys.stderr)  # newline after progress
 
@@ -331,6 +560,28 @@ def run_benchmark(
             "total_chars": total_chars,
         }
 
+    if worker_rows:
+        timing["init_seconds"] = max(row["init_seconds"] for row in worker_rows.values())
+        timing["workers"] = []
+        for row in worker_rows.values():
+            busy = row["extract_seconds"]
+            row["extract_seconds"] = round(busy, 3)
+            row["docs_per_second"] = round(row["docs"] / busy, 1) if busy > 0 else 0.0
+            timing["workers"].append(row)
+    if phase_counters is not None and phase_counters.phases:
+        timing["phases"] = phase_counters.to_dict()
+    if memory_profile is not None:
+        timing["memory"] = memory_profile.report()
+        memory_profile.stop()
+    from benchmarks.memory import rss_high_water_mb
+
+    # Peak RSS of this process plus, with workers, each worker's own peak
+    # (they run side by side, and the models live in the workers)
+    rss = rss_high_water_mb()
+    if rss is not None and worker_rows:
+        rss = round(rss + sum(row["rss_high_water_mb"] or 0.0 for row in worker_rows.values()), 1)
+    timing["rss_high_water_mb"] = rss
+
     result.total_docs = processed
     return result, timing
 
@@ -369,6 +620,21 @@ def format_summary(result: BenchmarkResult, timing: dict, split: str, data_dir:
                 f"  {tp['chars_per_second']:.0f} chars/s",
             ]
         )
+    if "workers" in timing:
+        lines.extend(["", f"--- Workers ({len(timing['workers'])}) ---"])
+        for row in timing["workers"]:
+            lines.append(
+                f"  #{row['worker']:<3d} {row['docs']:6d} docs  {row['extract_seconds']:8.1f}s extract"
+                f"  {row['docs_per_second']:7.1f} docs/s  init {row['init_seconds']:.1f}s"
+            )
+    if "phases" in timing:
+        from refex.extractors.stats import PhaseStats
+
+        lines.extend(["", "--- Regex phases ---", PhaseStats.from_dict(timing["phases"]).format()])
+    if "memory" in timing:
+        from benchmarks.memory import format_memory
+
+        lines.extend(["", "--- Memory (tracemalloc) ---", *format_memory(timing["memory"])])
     return "\n".join(lines)
 
 
@@ -422,7 +688,7 @@ def main() -> None:
     parser.add_argument(
         "-e",
         "--engine",
-        choices=["regex", "crf", "regex+crf", "transformer", "regex+transformer"],
+        choices=ENGINES,
         default="regex",
         help="Which extraction engine to use (default: regex)",
     )
@@ -444,8 +710,31 @@ def main() -> None:
         metavar="FILE",
         help="With --profile, also write the full cProfile stats (top 60 by cumulative + tottime) to this file.",
     )
+    parser.add_argument(
+        "--phase-stats",
+        action="store_true",
+        help="Record per-phase time, matches and mask sizes of the regex extractors.",
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Extract and score in N processes; metrics are identical to a serial run (default: 1)",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Trace allocations: peak memory per document size, top allocation sites, RSS high-water mark.",
+    )
     args = parser.parse_args()
 
+    if args.workers > 1 and args.profile:
+        parser.error("--profile cannot be combined with --workers")
+    if args.workers > 1 and args.memory:
+        parser.error("--memory cannot be combined with --workers")
+
     if args.verbose:
         logging.getLogger().setLevel(logging.INFO)
 
@@ -458,6 +747,9 @@ def main() -> None:
         engine=args.engine,
         profile=args.profile,
         profile_output=args.profile_output,
+        phase_stats=args.phase_stats,
+        workers=args.workers,
+        memory=args.memory,
     )
 
     if args.json:
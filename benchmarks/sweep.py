@@ -0,0 +1,225 @@
+"""Accuracy versus cost across engine configurations, with a Pareto frontier.
+
+Runs ``benchmarks.run --json`` once per engine configuration, each in a
+fresh interpreter so that one configuration's models and caches do not
+count towards the next one's memory, and collects per configuration:
+
+* span F1, precision and recall (``--metric``, exact or overlap match)
+* docs/sec of the extract-and-score loop and extractor init time
+* peak RSS of the run (``ru_maxrss``; with ``-j`` the sum of the main
+  process and every worker, since the models live in the workers)
+
+A configuration is on the Pareto frontier when no other one is at
+least as good on F1, docs/sec and RSS and strictly better on one of
+them.  With ``--min-recall`` the report names the cheapest
+configuration meeting it: the fastest one, then the one with the
+smallest RSS.  Configurations whose engine cannot be built (missing
+extra or model) or that exceed ``--timeout`` are reported as skipped.
+
+Usage:
+    python -m benchmarks.sweep [OPTIONS]
+
+Examples:
+    python -m benchmarks.sweep -d benchmarks/fixtures             # all engines
+    python -m benchmarks.sweep -s validation -n 500 --min-recall 0.9
+    python -m benchmarks.sweep -e regex -e regex+crf --json -o sweep.json --markdown sweep.md
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.run import ENGINES
+
+METRICS = ("span_exact", "span_overlap")
+
+
+def run_config(
+    engine: str,
+    data_dir: Path | None = None,
+    split: str = "test",
+    limit: int | None = None,
+    workers: int = 1,
+    timeout: float | None = None,
+) -> dict:
+    """Accuracy and cost of one engine configuration, from a fresh ``benchmarks.run`` process."""
+    cmd = [sys.executable, "-m", "benchmarks.run", "--json", "-e", engine, "-s", split]
+    if data_dir is not None:
+        cmd += ["-d", str(data_dir)]
+    if limit is not None:
+        cmd += ["-n", str(limit)]
+    if workers > 1:
+        cmd += ["-j", str(workers)]
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"engine": engine, "skipped": f"timed out after {timeout:g}s"}
+    if proc.returncode != 0:
+        lines = [line for line in proc.stderr.splitlines() if line.strip()]
+        return {"engine": engine, "skipped": lines[-1] if lines else f"exit status {proc.returncode}"}
+    out = json.loads(proc.stdout)
+    if out["timing"]["docs_processed"] == 0:
+        return {"engine": engine, "skipped": f"no document extracted ({out['timing']['docs_errored']} errors)"}
+    return _config_row(engine, out)
+
+
+def _config_row(engine: str, out: dict) -> dict:
+    timing = out["timing"]
+    throughput = timing.get("throughput", {})
+    row = {
+        "engine": engine,
+        "docs": timing["docs_processed"],
+        "errors": timing["docs_errored"],
+        "docs_per_second": throughput.get("docs_per_second", 0.0),
+        "init_seconds": timing["init_seconds"],
+        "rss_mb": timing.get("rss_high_water_mb"),
+    }
+    for metric in METRICS:
+        m = out[metric]
+        row[metric] = {"p": round(m["p"], 4), "r": round(m["r"], 4), "f1": round(m["f1"], 4)}
+    return row
+
+
+def _dominates(a: dict, b: dict, metric: str) -> bool:
+    """``a`` is at least as good as ``b`` on F1, docs/sec and RSS, and better on one."""
+    rss_a = a["rss_mb"] if a["rss_mb"] is not None else float("inf")
+    rss_b = b["rss_mb"] if b["rss_mb"] is not None else float("inf")
+    ge = (a[metric]["f1"] >= b[metric]["f1"], a["docs_per_second"] >= b["docs_per_second"], rss_a <= rss_b)
+    gt = (a[metric]["f1"] > b[metric]["f1"], a["docs_per_second"] > b["docs_per_second"], rss_a < rss_b)
+    return all(ge) and any(gt)
+
+
+def pareto_frontier(rows: list[dict], metric: str = "span_exact") -> list[str]:
+    """Engines of the configurations no other configuration dominates, by F1 descending."""
+    frontier = [r for r in rows if not any(_dominates(o, r, metric) for o in rows if o is not r)]
+    frontier.sort(key=lambda r: (-r[metric]["f1"], -r["docs_per_second"]))
+    return [r["engine"] for r in frontier]
+
+
+def cheapest_meeting(rows: list[dict], min_recall: float, metric: str = "span_exact") -> str | None:
+    """Fastest configuration (then smallest RSS) with recall at least ``min_recall``."""
+    eligible = [r for r in rows if r[metric]["r"] >= min_recall]
+    if not eligible:
+        return None
+    best = min(eligible, key=lambda r: (-r["docs_per_second"], r["rss_mb"] if r["rss_mb"] is not None else 0.0))
+    return best["engine"]
+
+
+def run_sweep(
+    engines: list[str],
+    data_dir: Path | None = None,
+    split: str = "test",
+    limit: int | None = None,
+    metric: str = "span_exact",
+    min_recall: float | None = None,
+    workers: int = 1,
+    timeout: float | None = None,
+) -> dict:
+    """Run every configuration and return a report dict."""
+    rows, skipped = [], {}
+    for engine in engines:
+        print(f"  {engine} ...", file=sys.stderr, flush=True)
+        row = run_config(engine, data_dir, split, limit, workers, timeout)
+        if "skipped" in row:
+            skipped[engine] = row["skipped"]
+        else:
+            rows.append(row)
+
+    frontier = pareto_frontier(rows, metric)
+    for row in rows:
+        row["pareto"] = row["engine"] in frontier
+    report: dict = {
+        "data_dir": str(data_dir) if data_dir is not None else None,
+        "split": split,
+        "limit": limit,
+        "metric": metric,
+        "configs": rows,
+        "skipped": skipped,
+        "frontier": frontier,
+    }
+    if min_recall is not None:
+        report["min_recall"] = min_recall
+        report["recommended"] = cheapest_meeting(rows, min_recall, metric)
+    return report
+
+
+def format_markdown(report: dict) -> str:
+    """Markdown table of all configurations, frontier first, plus the recommendation."""
+    metric = report["metric"]
+    rank = {engine: i for i, engine in enumerate(report["frontier"])}
+    rows = sorted(report["configs"], key=lambda r: (rank.get(r["engine"], len(rank)), -r[metric]["f1"]))
+    lines = [
+        f"### Engine sweep ({report['split']}, {metric})",
+        "",
+        "| Engine | Pareto | F1 | P | R | docs/s | init s | RSS MiB |",
+        "|--------|:------:|---:|--:|--:|-------:|-------:|--------:|",
+    ]
+    for r in rows:
+        m = r[metric]
+        rss = f"{r['rss_mb']:.0f}" if r["rss_mb"] is not None else "–"
+        lines.append(
+            f"| `{r['engine']}` | {'✓' if r['pareto'] else ''} | {m['f1']:.4f} | {m['p']:.4f} | {m['r']:.4f} "
+            f"| {r['docs_per_second']:.1f} | {r['init_seconds']:.2f} | {rss} |"
+        )
+    if report["skipped"]:
+        lines.append("")
+        lines.extend(f"Skipped `{engine}`: {reason}" for engine, reason in report["skipped"].items())
+    if "min_recall" in report:
+        recommended = report["recommended"]
+        lines.append("")
+        if recommended is None:
+            lines.append(f"No configuration reaches recall ≥ {report['min_recall']}.")
+        else:
+            lines.append(f"Cheapest configuration with recall ≥ {report['min_recall']}: `{recommended}`.")
+    return "\n".join(lines) + "\n"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Accuracy versus cost of engine configurations (Pareto frontier).")
+    parser.add_argument(
+        "-e",
+        "--engine",
+        action="append",
+        choices=ENGINES,
+        help="Configuration to run (repeatable; default: all)",
+    )
+    parser.add_argument("-d", "--data-dir", type=Path, default=None, help="Dataset (default: as benchmarks.run)")
+    parser.add_argument("-s", "--split", default="test", help="Dataset split (default: test)")
+    parser.add_argument("-n", "--limit", type=int, default=None, metavar="N", help="Use at most N documents")
+    parser.add_argument("-j", "--workers", type=int, default=1, metavar="N", help="Processes per run (default: 1)")
+    parser.add_argument("--timeout", type=float, default=None, help="Skip a config after this many seconds")
+    parser.add_argument("--metric", choices=METRICS, default="span_exact", help="Span match (default: span_exact)")
+    parser.add_argument("--min-recall", type=float, default=None, help="Recommend the cheapest config with this recall")
+    parser.add_argument("--json", action="store_true", help="Output the report as JSON")
+    parser.add_argument("-o", "--output", type=Path, default=None, help="Write output to file")
+    parser.add_argument("--markdown", type=Path, default=None, metavar="FILE", help="Also write a Markdown table")
+    args = parser.parse_args()
+
+    report = run_sweep(
+        args.engine or list(ENGINES),
+        data_dir=args.data_dir,
+        split=args.split,
+        limit=args.limit,
+        metric=args.metric,
+        min_recall=args.min_recall,
+        workers=args.workers,
+        timeout=args.timeout,
+    )
+    markdown = format_markdown(report)
+    output = json.dumps(report, indent=2, ensure_ascii=False) + "\n" if args.json else markdown
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(output, encoding="utf-8")
+    else:
+        sys.stdout.write(output)
+    if args.markdown:
+        args.markdown.parent.mkdir(parents=True, exist_ok=True)
+        args.markdown.write_text(markdown, encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+"""Synthetic scaling corpus and extraction-time scaling benchmark.
+
+``generate_document`` builds deterministic German legal-style documents
+of a given length, citation density and structure:
+
+* ``prose`` — filler sentences with law and case citations at
+  ``density`` citations per 1,000 characters
+* ``section_lists`` — long comma-separated ``§§ 1, 2, 3, …`` lists,
+  half of them not followed by a book (the case the ``multi`` pattern's
+  bounded character class guards against)
+* ``qualifier_runs`` — ``§ 1 Abs. 2 Satz 3 Nr. 4 …`` runs and digit
+  runs without a book (the ``single_any_book`` / ``single_ivm`` patterns)
+* ``file_numbers`` — thousands of file numbers next to court names
+* ``html`` — prose wrapped in HTML markup with entity-encoded ``§``,
+  timed through HTML normalisation (``Document(format="html")``: tag
+  stripping, entity decoding, offset map) as well as extraction
+
+The benchmark times each engine on documents of geometrically growing
+size per structure, fits ``time ∝ size^k`` on a log-log scale and flags
+``k`` above ``--max-slope`` (super-linear behaviour, e.g. catastrophic
+backtracking).  The exit status is 1 when anything is flagged.
+
+Usage:
+    python -m benchmarks.synthetic [OPTIONS]
+
+Examples:
+    python -m benchmarks.synthetic                              # regex engines, up to 256k chars
+    python -m benchmarks.synthetic --max-chars 1048576 -e full
+    python -m benchmarks.synthetic --kind section_lists --json
+    python -m benchmarks.synthetic --plot scaling.png           # needs matplotlib
+    python -m benchmarks.synthetic --write-corpus /tmp/corpus   # JSONL documents only
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+KINDS = ("prose", "section_lists", "qualifier_runs", "file_numbers", "html")
+
+_WORDS = (
+    "der die das und oder nicht auch wird wurde ist sind hat haben nach gemäß zur zum "
+    "Klägerin Beklagte Gericht Senat Verfahren Anspruch Vertrag Antrag Bescheid Entscheidung "
+    "Berufung Revision Beschwerde Kosten Urteil Vorschrift Auslegung Rechtsprechung Frist "
+    "insoweit jedoch daher bereits hiernach vorliegend ausdrücklich unbegründet zulässig"
+).split()
+_BOOKS = ("BGB", "ZPO", "StGB", "VwGO", "HGB", "AufenthG", "SGB V", "AsylG", "VwVfG", "GVG")
+_COURTS = ("BGH", "BVerwG", "BVerfG", "BSG", "OVG NRW", "VG Köln", "LG Berlin", "OLG München", "BAG", "BFH")
+_REGISTERS = ("ZR", "C", "BvR", "AZR", "R", "A", "K", "U", "StR", "B")
+
+
+def _sentence(rng: random.Random) -> str:
+    text = " ".join(rng.choices(_WORDS, k=rng.randint(8, 20)))
+    return text[0].upper() + text[1:] + "."
+
+
+def _law_citation(rng: random.Random) -> str:
+    n, book = rng.randint(1, 999), rng.choice(_BOOKS)
+    form = rng.randrange(5)
+    if form == 0:
+        return f"§ {n} {book}"
+    if form == 1:
+        return f"§ {n} Abs. {rng.randint(1, 5)} Satz {rng.randint(1, 3)} {book}"
+    if form == 2:
+        return f"§§ {n}, {n + 1}, {n + 3} {book}"
+    if form == 3:
+        return f"Art. {rng.randint(1, 146)} Abs. {rng.randint(1, 3)} GG"
+    return f"§ {n} i.V.m. § {n + 2} {book}"
+
+
+def _file_number(rng: random.Random) -> str:
+    chamber = rng.choice(("I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X", str(rng.randint(1, 30))))
+    return f"{chamber} {rng.choice(_REGISTERS)} {rng.randint(1, 999)}/{rng.randint(0, 99):02d}"
+
+
+def _case_citation(rng: random.Random) -> str:
+    date = f"{rng.randint(1, 28)}.{rng.randint(1, 12)}.{rng.randint(1990, 2024)}"
+    kind = rng.choice(("Urteil", "Beschluss"))
+    return f"{rng.choice(_COURTS)}, {kind} vom {date} - {_file_number(rng)}"
+
+
+def _prose_chunk(rng: random.Random, density: float) -> str:
+    """One paragraph with on average ``density`` citations per 1,000 characters."""
+    parts = []
+    for _ in range(rng.randint(3, 8)):
+        sentence = _sentence(rng)
+        if rng.random() < density * len(sentence) / 1000:
+            cite = _law_citation(rng) if rng.random() < 0.7 else _case_citation(rng)
+            sentence = sentence[:-1] + f" ({cite})."
+        parts.append(sentence)
+    return " ".join(parts)
+
+
+def _section_list_chunk(rng: random.Random, density: float) -> str:
+    length = rng.randint(20, 400)
+    start = rng.randint(1, 500)
+    sections = ", ".join(str(start + i) for i in range(length))
+    tail = f" {rng.choice(_BOOKS)}" if rng.random() < 0.5 else " und weitere"
+    return f"Vgl. §§ {sections}{tail}. {_sentence(rng)}"
+
+
+def _qualifier_run_chunk(rng: random.Random, density: float) -> str:
+    qualifiers = []
+    for _ in range(rng.randint(10, 80)):
+        qualifiers.append(
+            rng.choice(
+                (
+                    f"Abs. {rng.randint(1, 9)}",
+                    f"Satz {rng.randint(1, 9)}",
+                    f"Nr. {rng.randint(1, 99)}",
+                    f"Alt. {rng.randint(1, 3)}",
+                    f"und {rng.randint(1, 9)}",
+                    f"bis {rng.randint(10, 99)}",
+                    str(rng.randint(10_000, 99_999)),
+                    rng.choice(("I", "II", "IV", "XIV")),
+                )
+            )
+        )
+    tail = f" {rng.choice(_BOOKS)}" if rng.random() < 0.3 else ""
+    return f"§ {rng.randint(1, 999)} {' '.join(qualifiers)}{tail}. {_sentence(rng)}"
+
+
+def _file_number_chunk(rng: random.Random, density: float) -> str:
+    court = rng.choice(_COURTS)
+    numbers = ", ".join(_file_number(rng) for _ in range(rng.randint(5, 50)))
+    return f"{court} {numbers}; {_case_citation(rng)}."
+
+
+def _html_chunk(rng: random.Random, density: float) -> str:
+    text = _prose_chunk(rng, density).replace("§", "&#167;")
+    tag = rng.choice(("p", "div", "li"))
+    return f'<{tag} class="absatz"><span>{text}</span> <a href="#rn{rng.randint(1, 999)}">Rn.</a></{tag}>'
+
+
+_CHUNKS = {
+    "prose": _prose_chunk,
+    "section_lists": _section_list_chunk,
+    "qualifier_runs": _qualifier_run_chunk,
+    "file_numbers": _file_number_chunk,
+    "html": _html_chunk,
+}
+
+
+def generate_document(n_chars: int, kind: str = "prose", density: float = 2.0, seed: int = 0) -> str:
+    """A deterministic synthetic document of exactly ``n_chars`` characters.
+
+    ``density`` is the approximate number of citations per 1,000
+    characters in prose paragraphs.  The same arguments always give the
+    same document; a prefix of a longer document is not guaranteed to
+    equal a shorter one.
+    """
+    if kind not in _CHUNKS:
+        msg = f"Unknown kind: {kind!r}. Expected one of: {', '.join(KINDS)}"
+        raise ValueError(msg)
+    rng = random.Random(f"{kind}:{density}:{seed}")
+    chunk = _CHUNKS[kind]
+    sep = "\n" if kind == "html" else "\n\n"
+    parts: list[str] = []
+    size = 0
+    while size < n_chars:
+        part = chunk(rng, density)
+        parts.append(part)
+        size += len(part) + len(sep)
+    text = sep.join(parts)
+    if kind == "html":
+        text = "<html><body>\n" + text
+    # Cut at a word boundary where possible, then pad to the exact size
+    text = text[:n_chars]
+    cut = text.rfind(" ", max(0, n_chars - 40))
+    if cut > 0:
+        text = text[:cut]
+    return text.ljust(n_chars)
+
+
+def scaling_sizes(min_chars: int, max_chars: int, factor: int = 4) -> list[int]:
+    sizes = []
+    size = min_chars
+    while size <= max_chars:
+        sizes.append(size)
+        size *= factor
+    return sizes
+
+
+def loglog_slope(sizes: list[int], seconds: list[float]) -> float:
+    """Least-squares slope of ``log(seconds)`` against ``log(size)``."""
+    points = [(math.log(n), math.log(t)) for n, t in zip(sizes, seconds) if t > 0]
+    if len(points) < 2:
+        return math.nan
+    mx = statistics.fmean(x for x, _ in points)
+    my = statistics.fmean(y for _, y in points)
+    sxx = sum((x - mx) ** 2 for x, _ in points)
+    return sum((x - mx) * (y - my) for x, y in points) / sxx
+
+
+def _timed_fn(fn: Callable[[str], object], engine: str, kind: str) -> Callable[[str], object]:
+    """``fn`` for the documents of ``kind``; HTML goes through its ``Document`` entry point."""
+    if kind != "html":
+        return fn
+    from refex.document import Document
+
+    if engine == "full":
+        # CitationExtractor.extract takes the Document and maps spans back to the markup
+        return lambda raw: fn(Document(raw=raw, format="html"))
+    return lambda raw: fn(Document(raw=raw, format="html").text)
+
+
+def run_scaling(
+    engines: list[str],
+    kinds: list[str],
+    sizes: list[int],
+    repeat: int = 3,
+    density: float = 2.0,
+    max_slope: float = 1.3,
+    max_seconds: float = 30.0,
+) -> dict:
+    """Time every engine on every kind and size; returns a report dict.
+
+    Sizes for an engine and kind stop growing once one document takes
+    longer than ``max_seconds``, which is flagged as well.
+    """
+    from benchmarks.perf import build_engine
+
+    report: dict = {"sizes": sizes, "max_slope": max_slope, "results": [], "flagged": []}
+    for engine in engines:
+        try:
+            fn = build_engine(engine)
+        except (ImportError, OSError) as exc:
+            print(f"  {engine}: skipped ({type(exc).__name__})", file=sys.stderr)
+            continue
+        fn(generate_document(1_000))  # warm-up: grammar compilation, lazy loads
+        for kind in kinds:
+            timed = _timed_fn(fn, engine, kind)
+            measured_sizes, seconds = [], []
+            too_slow = False
+            for size in sizes:
+                text = generate_document(size, kind=kind, density=density)
+                times = []
+                for _ in range(repeat):
+                    t0 = time.perf_counter()
+                    timed(text)
+                    times.append(time.perf_counter() - t0)
+                measured_sizes.append(size)
+                seconds.append(min(times))
+                if seconds[-1] > max_seconds:
+                    too_slow = True
+                    break
+            slope = loglog_slope(measured_sizes, seconds)
+            # Only the upper half of the size range: fixed per-call costs
+            # flatten the curve at small sizes.
+            half = len(measured_sizes) // 2
+            tail_slope = loglog_slope(measured_sizes[half:], seconds[half:]) if half >= 1 else slope
+            flagged = too_slow or max(slope, tail_slope) > max_slope
+            row = {
+                "engine": engine,
+                "kind": kind,
+                "sizes": measured_sizes,
+                "seconds": [round(s, 6) for s in seconds],
+                "slope": round(slope, 3),
+                "tail_slope": round(tail_slope, 3),
+                "too_slow": too_slow,
+                "flagged": flagged,
+            }
+            report["results"].append(row)
+            if flagged:
+                report["flagged"].append(f"{engine}/{kind}")
+    return report
+
+
+def format_report(report: dict) -> str:
+    lines = [f"Sizes: {', '.join(str(s) for s in report['sizes'])} chars (flag slope > {report['max_slope']})", ""]
+    lines.append(
+        f"  {'engine':12s} {'kind':15s} {'largest':>9s} {'seconds':>10s} {'chars/s':>12s} {'slope':>6s} {'tail':>6s}"
+    )
+    for r in report["results"]:
+        status = "  SUPER-LINEAR" if r["flagged"] else ""
+        if r["too_slow"]:
+            status = "  TOO SLOW"
+        size, seconds = r["sizes"][-1], r["seconds"][-1]
+        lines.append(
+            f"  {r['engine']:12s} {r['kind']:15s} {size:9d} {seconds:10.4f} {size / max(seconds, 1e-9):12.0f}"
+            f" {r['slope']:6.2f} {r['tail_slope']:6.2f}{status}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def plot_report(report: dict, path: Path) -> None:
+    """Write a log-log plot of time against size (requires matplotlib)."""
+    try:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError as exc:
+        msg = "--plot requires matplotlib (pip install matplotlib)"
+        raise ImportError(msg) from exc
+
+    engines = sorted({r["engine"] for r in report["results"]})
+    fig, axes = plt.subplots(1, len(engines), figsize=(5 * len(engines), 4), squeeze=False)
+    for ax, engine in zip(axes[0], engines):
+        for r in report["results"]:
+            if r["engine"] == engine:
+                ax.loglog(r["sizes"], r["seconds"], marker="o", label=f"{r['kind']} (k={r['slope']:.2f})")
+        ax.set_title(engine)
+        ax.set_xlabel("document size (chars)")
+        ax.set_ylabel("seconds")
+        ax.legend(fontsize="small")
+    fig.tight_layout()
+    fig.savefig(path)
+
+
+def write_corpus(out_dir: Path, kinds: list[str], sizes: list[int], density: float = 2.0) -> Path:
+    """Write the synthetic documents as ``documents.jsonl`` (benchmark schema, no annotations)."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path = out_dir / "documents.jsonl"
+    with path.open("w", encoding="utf-8") as f:
+        for kind in kinds:
+            for size in sizes:
+                doc = {"doc_id": f"synthetic-{kind}-{size}", "text": generate_document(size, kind, density)}
+                f.write(json.dumps(doc, ensure_ascii=False) + "\n")
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Synthetic scaling benchmark: extraction time against size.")
+    parser.add_argument(
+        "-e",
+        "--engine",
+        action="append",
+        help="Engine to measure, as in benchmarks.perf (repeatable; default: regex-law, regex-case)",
+    )
+    parser.add_argument("-k", "--kind", action="append", choices=KINDS, help="Document structure (default: all)")
+    parser.add_argument("--min-chars", type=int, default=1_000, help="Smallest document (default: 1000)")
+    parser.add_argument("--max-chars", type=int, default=256_000, help="Largest document (default: 256000)")
+    parser.add_argument("--density", type=float, default=2.0, help="Citations per 1k chars in prose (default: 2)")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Timings per size, best is used (default: 3)")
+    parser.add_argument("--max-slope", type=float, default=1.3, help="Flag log-log slopes above this (default: 1.3)")
+    parser.add_argument("--max-seconds", type=float, default=30.0, help="Flag and stop above this per document")
+    parser.add_argument("--plot", type=Path, default=None, help="Write a log-log plot (needs matplotlib)")
+    parser.add_argument("--write-corpus", type=Path, default=None, metavar="DIR", help="Only write documents.jsonl")
+    parser.add_argument("--json", action="store_true", help="Output the report as JSON")
+    args = parser.parse_args()
+
+    kinds = args.kind or list(KINDS)
+    sizes = scaling_sizes(args.min_chars, args.max_chars)
+
+    if args.write_corpus:
+        path = write_corpus(args.write_corpus, kinds, sizes, density=args.density)
+        print(f"Corpus written to {path}", file=sys.stderr)
+        return
+
+    report = run_scaling(
+        args.engine or ["regex-law", "regex-case"],
+        kinds,
+        sizes,
+        repeat=args.repeat,
+        density=args.density,
+        max_slope=args.max_slope,
+        max_seconds=args.max_seconds,
+    )
+    if args.plot:
+        plot_report(report, args.plot)
+    if args.json:
+        sys.stdout.write(json.dumps(report, indent=2) + "\n")
+    else:
+        sys.stdout.write(format_report(report))
+    sys.exit(1 if report["flagged"] else 0)
+
+
+if __name__ == "__main__":
+    main()
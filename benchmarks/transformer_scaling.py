@@ -0,0 +1,127 @@
+"""Measure transformer throughput (docs/sec) against CPU core count.
+
+For each core count ``n`` two layouts are timed on the same documents:
+
+* ``threads``  — one replica pinned to ``n`` cores with ``n`` intra-op threads
+* ``replicas`` — ``n`` single-threaded replicas, one per core
+
+Both run through ``TransformerReplicaPool``, so process start-up and
+model loading are excluded from the timings.  ``speedup`` is relative to
+the ``threads`` layout at the smallest core count that was run.
+
+Usage:
+    python -m benchmarks.transformer_scaling [OPTIONS]
+
+Examples:
+    python -m benchmarks.transformer_scaling -d benchmarks/fixtures
+    python -m benchmarks.transformer_scaling --cores 1,2,4,8 --limit 200
+    python -m benchmarks.transformer_scaling --backend onnx --model ./onnx-model --json
+
+Environment:
+    REFEX_TRANSFORMER_* as for ``benchmarks.run`` (model, device,
+    window strategy, …)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.datasets import load_dataset
+from benchmarks.run import _transformer_kwargs_from_env
+
+
+def available_cores() -> list[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def measure(texts: list[str], core_sets: list[list[int]], batch_size: int, repeat: int, **kwargs) -> float:
+    """Best docs/sec over ``repeat`` passes of ``texts`` on a replica pool."""
+    from refex.engines.transformer import TransformerReplicaPool
+
+    best = 0.0
+    with TransformerReplicaPool(cores=core_sets, batch_size=batch_size, **kwargs) as pool:
+        pool.extract_batch(texts[: batch_size * len(core_sets)])  # warm-up
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            pool.extract_batch(texts)
+            best = max(best, len(texts) / (time.perf_counter() - t0))
+    return best
+
+
+def run_scaling(
+    texts: list[str],
+    core_counts: list[int],
+    batch_size: int = 8,
+    repeat: int = 3,
+    **kwargs,
+) -> list[dict]:
+    cores = available_cores()
+    rows = []
+    for n in sorted(core_counts):
+        if n > len(cores):
+            print(f"  skipping {n} cores: only {len(cores)} available", file=sys.stderr)
+            continue
+        layouts = {"threads": [cores[:n]], "replicas": [[c] for c in cores[:n]]}
+        for layout, core_sets in layouts.items():
+            if layout == "replicas" and n == 1:
+                continue  # same as threads
+            docs_per_sec = measure(texts, core_sets, batch_size, repeat, **kwargs)
+            rows.append({"cores": n, "layout": layout, "docs_per_sec": round(docs_per_sec, 2)})
+    # rows start with the threads layout of the smallest core count run
+    base = rows[0]["docs_per_sec"] if rows else None
+    for r in rows:
+        r["speedup"] = round(r["docs_per_sec"] / base, 2) if base else None
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Transformer docs/sec against CPU core count.")
+    parser.add_argument("-d", "--data-dir", type=Path, default=None, help="Dataset directory")
+    parser.add_argument("-s", "--split", default="validation", help="Dataset split (default: validation)")
+    parser.add_argument("-l", "--limit", type=int, default=100, help="Documents to time (default: 100)")
+    parser.add_argument("--cores", default=None, help="Comma-separated core counts (default: 1,2,4,… up to all)")
+    parser.add_argument("--batch-size", type=int, default=8, help="Documents per queued chunk (default: 8)")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Timed passes per layout (default: 3)")
+    parser.add_argument("--model", default=None, help="Model name or path (default: REFEX_TRANSFORMER_MODEL)")
+    parser.add_argument("--backend", choices=["torch", "onnx"], default=None, help="Inference backend")
+    parser.add_argument("--json", action="store_true", help="Output rows as JSON")
+    args = parser.parse_args()
+
+    dataset = load_dataset(args.data_dir, split=args.split)
+    texts = [doc.text for doc in dataset.documents[: args.limit]]
+
+    if args.cores:
+        core_counts = sorted({int(c) for c in args.cores.split(",")})
+    else:
+        total = len(available_cores())
+        core_counts = [n for n in (1, 2, 4, 8, 16, 32, 64) if n < total] + [total]
+
+    kwargs = _transformer_kwargs_from_env()
+    if args.model:
+        kwargs["model"] = args.model
+    if args.backend:
+        kwargs["backend"] = args.backend
+
+    rows = run_scaling(texts, core_counts, batch_size=args.batch_size, repeat=args.repeat, **kwargs)
+
+    if args.json:
+        sys.stdout.write(json.dumps(rows, indent=2) + "\n")
+        return
+    print(f"{len(texts)} documents, {len(available_cores())} cores available")
+    if rows:
+        print(f"speedup relative to {rows[0]['cores']} core(s), threads layout")
+    print(f"  {'cores':>5s}  {'layout':8s}  {'docs/s':>8s}  {'speedup':>7s}")
+    for r in rows:
+        speedup = f"{r['speedup']:6.2f}x" if r["speedup"] is not None else f"{'–':>7s}"
+        print(f"  {r['cores']:5d}  {r['layout']:8s}  {r['docs_per_sec']:8.2f}  {speedup}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,9 +11,14 @@ Span offsets are always into the plain-text ``Document.text`` field.
 from __future__ import annotations
 
 import hashlib
+import os
+from array import array
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass, field
 from typing import Literal
 
+from refex.vocab import Vocabulary, get_book_vocabulary, get_court_vocabulary
+
 
 @dataclass(frozen=True, slots=True)
 class Span:
@@ -86,6 +91,136 @@ class CitationRelation:
     span: Span | None = None
 
 
+# Row type codes used by ``CitationTable.type_code``.
+TYPE_LAW = 0
+TYPE_CASE = 1
+
+
+@dataclass(slots=True)
+class CitationTable:
+    """Columnar view of a citation list (parallel arrays).
+
+    Row ``i`` of every column describes the same citation.  Numeric
+    columns are ``array.array`` instances, so they expose the buffer
+    protocol and can be wrapped without copying, e.g.
+    ``numpy.frombuffer(table.start, dtype=numpy.int64)``.
+
+    ``book`` and ``court`` are dictionary-encoded: ``book_id`` /
+    ``court_id`` index into ``books`` / ``courts``, ``-1`` means missing.
+    Citation objects are not copied into the table; ``row()`` and
+    ``to_citations()`` hand back the originals when the table was built
+    from a citation list, and rebuild minimal objects otherwise.
+    """
+
+    start: array = field(default_factory=lambda: array("q"))
+    end: array = field(default_factory=lambda: array("q"))
+    type_code: array = field(default_factory=lambda: array("b"))
+    book_id: array = field(default_factory=lambda: array("q"))
+    number: list[str | None] = field(default_factory=list)
+    court_id: array = field(default_factory=lambda: array("q"))
+    confidence: array = field(default_factory=lambda: array("d"))
+    books: list[str] = field(default_factory=list)
+    courts: list[str] = field(default_factory=list)
+    _rows: list[Citation] | None = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_citations(cls, citations: Iterable[Citation], shared_vocab: bool = False) -> CitationTable:
+        """Build the columns from a list of typed citations.
+
+        With ``shared_vocab=True`` book and court ids come from the
+        process-wide vocabularies in ``refex.vocab`` instead of a
+        per-table one, so ids are comparable across tables (e.g. when
+        aggregating a corpus run).  If a shared vocabulary is full and a
+        value has no id there, the table falls back to per-table ids.
+        """
+        rows = list(citations)
+        if shared_vocab:
+            table = cls._encode(rows, get_book_vocabulary(), get_court_vocabulary())
+            if table is not None:
+                return table
+        return cls._encode(rows, Vocabulary(), Vocabulary())
+
+    @classmethod
+    def _encode(cls, rows: list[Citation], book_vocab: Vocabulary, court_vocab: Vocabulary) -> CitationTable | None:
+        """Columns of ``rows`` with ids from the given vocabularies; None if a value does not fit."""
+        table = cls(books=book_vocab.values, courts=court_vocab.values, _rows=rows)
+
+        for cit in rows:
+            table.start.append(cit.span.start)
+            table.end.append(cit.span.end)
+            table.confidence.append(cit.confidence)
+            if isinstance(cit, LawCitation):
+                book_id = book_vocab.id_of(cit.book)
+                if book_id < 0 and cit.book:
+                    return None
+                table.type_code.append(TYPE_LAW)
+                table.book_id.append(book_id)
+                table.number.append(cit.number)
+                table.court_id.append(-1)
+            else:
+                court_id = court_vocab.id_of(cit.court)
+                if court_id < 0 and cit.court:
+                    return None
+                table.type_code.append(TYPE_CASE)
+                table.book_id.append(-1)
+                table.number.append(None)
+                table.court_id.append(court_id)
+
+        return table
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def book(self, i: int) -> str | None:
+        """Decoded ``book`` value of row ``i``."""
+        bid = self.book_id[i]
+        return self.books[bid] if bid >= 0 else None
+
+    def court(self, i: int) -> str | None:
+        """Decoded ``court`` value of row ``i``."""
+        cid = self.court_id[i]
+        return self.courts[cid] if cid >= 0 else None
+
+    def row(self, i: int) -> Citation:
+        """Materialise row ``i`` as a typed citation."""
+        if self._rows is not None:
+            return self._rows[i]
+        span = Span(start=self.start[i], end=self.end[i], text="")
+        if self.type_code[i] == TYPE_LAW:
+            return LawCitation(span=span, confidence=self.confidence[i], book=self.book(i), number=self.number[i])
+        return CaseCitation(span=span, confidence=self.confidence[i], court=self.court(i))
+
+    def to_citations(self) -> list[Citation]:
+        """Materialise all rows as typed citations."""
+        if self._rows is not None:
+            return list(self._rows)
+        return [self.row(i) for i in range(len(self))]
+
+    def take(self, indices: Iterable[int]) -> CitationTable:
+        """Return a new table with the given rows, in the given order.
+
+        The ``books`` / ``courts`` vocabularies are shared with ``self``,
+        so ids stay comparable between the two tables.
+        """
+        idx = list(indices)
+        return CitationTable(
+            start=array("q", [self.start[i] for i in idx]),
+            end=array("q", [self.end[i] for i in idx]),
+            type_code=array("b", [self.type_code[i] for i in idx]),
+            book_id=array("q", [self.book_id[i] for i in idx]),
+            number=[self.number[i] for i in idx],
+            court_id=array("q", [self.court_id[i] for i in idx]),
+            confidence=array("d", [self.confidence[i] for i in idx]),
+            books=self.books,
+            courts=self.courts,
+            _rows=[self._rows[i] for i in idx] if self._rows is not None else None,
+        )
+
+    def where(self, mask: Iterable[bool]) -> CitationTable:
+        """Return the rows for which ``mask`` is truthy."""
+        return self.take(i for i, keep in enumerate(mask) if keep)
+
+
 @dataclass(slots=True)
 class ExtractionResult:
     """Result of running one or more extractors on a document."""
@@ -93,6 +228,10 @@ class ExtractionResult:
     citations: list[Citation] = field(default_factory=list)
     relations: list[CitationRelation] = field(default_factory=list)
 
+    def to_columns(self, shared_vocab: bool = False) -> CitationTable:
+        """Return a columnar ``CitationTable`` view of ``citations``."""
+        return CitationTable.from_citations(self.citations, shared_vocab=shared_vocab)
+
 
 # D8: Valid keys for the ``structure`` dict on ``LawCitation``.
 # These correspond to the hierarchical sub-units of a German law section.
@@ -124,10 +263,58 @@ STRUCTURE_KEYS: frozenset[str] = frozenset(
 )
 
 
-def make_citation_id(span: Span, source: str, doc_id: str = "") -> str:
+# Citation ID schemes accepted by ``make_citation_ids``.  All schemes emit
+# 12 hex chars (48 bits) so IDs stay drop-in compatible in size.
+#
+# - ``blake2b`` (default): BLAKE2b with a 6-byte digest.
+# - ``sha256``: first 12 hex chars of SHA-256 — the pre-0.6 scheme, byte for
+#   byte.  Select it via ``scheme="sha256"`` or ``REFEX_CITATION_ID_SCHEME``
+#   when IDs must match ones persisted by older releases.
+CITATION_ID_SCHEMES: tuple[str, ...] = ("blake2b", "sha256")
+DEFAULT_CITATION_ID_SCHEME = "blake2b"
+
+
+def make_citation_id(span: Span, source: str, doc_id: str = "", scheme: str | None = None) -> str:
     """Generate a stable content-hash citation ID (C1f).
 
-    Deterministic: same input always produces the same ID.
+    Deterministic: same input always produces the same ID, across runs
+    and processes.  Prefer ``make_citation_ids`` when hashing many spans
+    of one document.
+    """
+    return make_citation_ids((span,), source, doc_id, scheme)[0]
+
+
+def make_citation_ids(
+    spans: Sequence[Span],
+    source: str,
+    doc_id: str = "",
+    scheme: str | None = None,
+) -> list[str]:
+    """Generate citation IDs for all ``spans`` of one document in batch.
+
+    The hashed input is ``"{doc_id}|{start}|{end}|{text}|{source}"`` for
+    every scheme.  The ``doc_id`` prefix is hashed once and the hasher
+    state copied per span, so the per-citation cost is one ``copy()`` +
+    ``update()`` instead of a full hasher construction.
+
+    ``scheme`` defaults to the ``REFEX_CITATION_ID_SCHEME`` env var, then
+    ``DEFAULT_CITATION_ID_SCHEME``.
     """
-    raw = f"{doc_id}|{span.start}|{span.end}|{span.text}|{source}"
-    return hashlib.sha256(raw.encode()).hexdigest()[:12]
+    scheme = scheme or os.environ.get("REFEX_CITATION_ID_SCHEME") or DEFAULT_CITATION_ID_SCHEME
+    prefix = f"{doc_id}|".encode()
+    if scheme == "blake2b":
+        base = hashlib.blake2b(prefix, digest_size=6)
+    elif scheme == "sha256":
+        base = hashlib.sha256(prefix)
+    else:
+        msg = f"Unknown citation ID scheme: {scheme!r}. Expected one of: {', '.join(CITATION_ID_SCHEMES)}"
+        raise ValueError(msg)
+
+    suffix = f"|{source}".encode()
+    ids: list[str] = []
+    for span in spans:
+        h = base.copy()
+        h.update(f"{span.start}|{span.end}|{span.text}".encode())
+        h.update(suffix)
+        ids.append(h.hexdigest()[:12])
+    return ids
@@ -1 +1,130 @@
-"""Extraction engines — implementations of the Extractor protocol."""
+"""Extraction engines — implementations of the Extractor protocol.
+
+Engines are registered by name and imported only when first built, so
+``import refex.orchestrator`` does not pay for the regex grammars, the
+CRF or transformer modules, or their data files::
+
+    from refex.engines import create_engine
+
+    engine = create_engine("regex-law")
+    citations, relations = engine.extract(text)
+
+Built-in names: ``regex-law``, ``regex-case``, ``crf``, ``transformer``.
+Third-party packages can add engines with ``register_engine()`` or via a
+``refex.engines`` entry point (``name = "package.module:Factory"``);
+entry points are only scanned when a name is not registered.
+"""
+
+from __future__ import annotations
+
+import importlib
+from collections.abc import Callable
+from typing import Any
+
+ENTRY_POINT_GROUP = "refex.engines"
+
+# name → "module:attribute" (imported on first use) or a factory callable
+_REGISTRY: dict[str, str | Callable[..., Any]] = {
+    "regex-law": "refex.engines.regex:RegexLawExtractor",
+    "regex-case": "refex.engines.regex:RegexCaseExtractor",
+    "crf": "refex.engines.crf:CRFExtractor",
+    "transformer": "refex.engines.transformer:TransformerExtractor",
+}
+
+
+def register_engine(name: str, factory: str | Callable[..., Any]) -> None:
+    """Register an engine factory under ``name``.
+
+    ``factory`` is either a callable returning an ``Extractor`` or a
+    ``"module:attribute"`` string that is imported on first use.
+    """
+    _REGISTRY[name] = factory
+
+
+def available_engines() -> list[str]:
+    """Names of all registered engines (built-in and entry points)."""
+    _load_entry_points()
+    return sorted(_REGISTRY)
+
+
+def get_engine_factory(name: str) -> Callable[..., Any]:
+    """Resolve ``name`` to its factory, importing the module if needed."""
+    factory = _REGISTRY.get(name)
+    if factory is None:
+        _load_entry_points()
+        factory = _REGISTRY.get(name)
+    if factory is None:
+        msg = f"Unknown engine: {name!r}. Available: {', '.join(available_engines())}"
+        raise ValueError(msg)
+    if isinstance(factory, str):
+        module_name, _, attr = factory.partition(":")
+        factory = getattr(importlib.import_module(module_name), attr)
+        _REGISTRY[name] = factory
+    return factory
+
+
+def create_engine(name: str, **kwargs: Any) -> Any:
+    """Build the engine registered as ``name`` with ``kwargs``."""
+    return get_engine_factory(name)(**kwargs)
+
+
+def _load_entry_points() -> None:
+    from importlib.metadata import entry_points
+
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        _REGISTRY.setdefault(ep.name, ep.value)
+
+
+class LazyEngine:
+    """Engine proxy that imports and builds the named engine on first use.
+
+    Attribute reads and writes are forwarded to the built engine, so
+    ``orchestrator.engines[0].law_book_context = "bgb"`` works as with
+    a concrete engine.  Pickling and copying keep the proxy lazy unless
+    the engine was already built, in which case the engine comes along.
+    """
+
+    __slots__ = ("name", "kwargs", "_engine")
+
+    def __init__(self, name: str, **kwargs: Any):
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "kwargs", kwargs)
+        object.__setattr__(self, "_engine", None)
+
+    @property
+    def engine(self) -> Any:
+        """The built engine (constructed on first access)."""
+        if self._engine is None:
+            object.__setattr__(self, "_engine", create_engine(self.name, **self.kwargs))
+        return self._engine
+
+    @property
+    def is_built(self) -> bool:
+        return self._engine is not None
+
+    def extract(self, text: str):
+        return self.engine.extract(text)
+
+    def __getattr__(self, attr: str) -> Any:
+        # Only reached for missing attributes.  An unset slot (e.g. while
+        # unpickling) must not recurse through ``self.engine``, and protocol
+        # lookups such as ``__deepcopy__`` must not build the engine
+        if attr in LazyEngine.__slots__ or (attr.startswith("__") and attr.endswith("__")):
+            raise AttributeError(attr)
+        return getattr(self.engine, attr)
+
+    def __reduce__(self):
+        return _restore_lazy_engine, (self.name, self.kwargs, self._engine)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self.engine, attr, value)
+
+    def __repr__(self) -> str:
+        state = "built" if self.is_built else "lazy"
+        return f"<LazyEngine({self.name!r}, {state})>"
+
+
+def _restore_lazy_engine(name: str, kwargs: dict[str, Any], engine: Any) -> LazyEngine:
+    proxy = LazyEngine(name, **kwargs)
+    object.__setattr__(proxy, "_engine", engine)
+    return proxy
@@ -13,20 +13,21 @@ Requires the ``[crf]`` extra: ``pip install legal-reference-extraction[crf]``
 
 from __future__ import annotations
 
+import bisect
+import hashlib
 import importlib.resources
 import logging
+import os
 import pickle
 import re
+import threading
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 
-from refex.citations import (
-    CaseCitation,
-    Citation,
-    CitationRelation,
-    LawCitation,
-    Span,
-    make_citation_id,
-)
+from refex.citations import Citation, CitationRelation
 
 logger = logging.getLogger(__name__)
 
@@ -94,8 +95,8 @@ def extract_features(tokens: list[str], i: int) -> dict[str, str | bool]:
         "word.is_satz": word.lower() in ("satz", "s."),
         "word.is_ivm": word.lower() in ("i.v.m.", "ivm"),
         "word.is_register": word in _get_register_codes(),
-        "word.looks_like_year": bool(re.match(r"^\d{2,4}$", word)),
-        "word.looks_like_fn": bool(re.match(r"^\d+/\d{2}$", word)),
+        "word.looks_like_year": bool(_YEAR_RE.match(word)),
+        "word.looks_like_fn": bool(_FILE_NUMBER_RE.match(word)),
     }
 
     # Context: previous token
@@ -129,6 +130,111 @@ def extract_features(tokens: list[str], i: int) -> dict[str, str | bool]:
     return features
 
 
+# Bump when the feature set changes: on-disk feature caches and trained
+# models are only valid for the version they were built with.
+FEATURE_VERSION = 1
+
+# Distinct tokens memoised by ``_token_features``.  Legal text has a heavy
+# head (§, Abs., BGB, digits) so a few 10k entries cover most tokens.
+TOKEN_FEATURE_CACHE_SIZE = 65536
+
+_YEAR_RE = re.compile(r"^\d{2,4}$")
+_FILE_NUMBER_RE = re.compile(r"^\d+/\d{2}$")
+
+
+@lru_cache(maxsize=TOKEN_FEATURE_CACHE_SIZE)
+def _token_features(word: str) -> tuple[tuple[str, ...], tuple[str, ...], tuple[str, ...], str, str]:
+    """Per-token crfsuite feature strings, computed once per distinct token.
+
+    Returns ``(own, as_prev, as_next, as_prev2, as_next2)``: the token's
+    own ``word.*`` features and the context features it contributes to
+    its neighbours.  Mirrors ``extract_features`` +
+    ``_dict_to_crfsuite_features`` exactly, including feature order.
+    """
+    lower = word.lower()
+    shape = _word_shape(word)
+    isdigit = word.isdigit()
+    isupper = word.isupper()
+    is_section = word in ("§", "§§")
+
+    own = ["bias", f"word.lower={lower}", f"word.shape={shape}", f"word.len={min(len(word), 10)}"]
+    if isdigit:
+        own.append("word.isdigit")
+    if isupper:
+        own.append("word.isupper")
+    if word.istitle():
+        own.append("word.istitle")
+    if "/" in word:
+        own.append("word.has_slash")
+    if "." in word:
+        own.append("word.has_dot")
+    if "-" in word:
+        own.append("word.has_hyphen")
+    own.append(f"word.prefix2={word[:2].lower()}")
+    own.append(f"word.suffix2={word[-2:].lower() if len(word) >= 2 else lower}")
+    own.append(f"word.suffix3={word[-3:].lower() if len(word) >= 3 else lower}")
+    if is_section:
+        own.append("word.is_section")
+    if lower.startswith("art"):
+        own.append("word.is_art")
+    if lower in ("abs.", "abs"):
+        own.append("word.is_abs")
+    if lower in ("nr.", "nr"):
+        own.append("word.is_nr")
+    if lower in ("satz", "s."):
+        own.append("word.is_satz")
+    if lower in ("i.v.m.", "ivm"):
+        own.append("word.is_ivm")
+    if word in _get_register_codes():
+        own.append("word.is_register")
+    if _YEAR_RE.match(word):
+        own.append("word.looks_like_year")
+    if _FILE_NUMBER_RE.match(word):
+        own.append("word.looks_like_fn")
+
+    def context(prefix: str) -> tuple[str, ...]:
+        feats = [f"{prefix}.lower={lower}"]
+        if is_section:
+            feats.append(f"{prefix}.is_section")
+        if isdigit:
+            feats.append(f"{prefix}.isdigit")
+        if isupper:
+            feats.append(f"{prefix}.isupper")
+        feats.append(f"{prefix}.shape={shape}")
+        return tuple(feats)
+
+    return tuple(own), context("prev"), context("next"), f"prev2.lower={lower}", f"next2.lower={lower}"
+
+
+def sequence_to_crfsuite_features(tokens: list[str]) -> list[list[str]]:
+    """Build pycrfsuite features for a whole token sequence.
+
+    Equivalent to ``[_dict_to_crfsuite_features(extract_features(tokens, i))
+    for i in range(len(tokens))]`` but computes per-token features once per
+    distinct token (memoised across calls) and assembles the context
+    features by index, without intermediate dicts.
+    """
+    n = len(tokens)
+    info = [_token_features(t) for t in tokens]
+    out: list[list[str]] = []
+    for i in range(n):
+        feats = list(info[i][0])
+        if i > 0:
+            feats.extend(info[i - 1][1])
+        else:
+            feats.append("BOS")
+        if i < n - 1:
+            feats.extend(info[i + 1][2])
+        else:
+            feats.append("EOS")
+        if i > 1:
+            feats.append(info[i - 2][3])
+        if i < n - 2:
+            feats.append(info[i + 2][4])
+        out.append(feats)
+    return out
+
+
 def tokenize(text: str) -> list[tuple[int, int, str]]:
     """Whitespace-tokenize text, returning (start, end, token) triples."""
     return [(m.start(), m.end(), m.group()) for m in re.finditer(r"\S+", text)]
@@ -175,77 +281,242 @@ def bio_to_spans(
     return spans
 
 
+# Cheap signals that a citation is nearby: section/article signs, file
+# numbers, court abbreviations and decision keywords.  Tagging only the
+# token windows around these keeps the CRF cost proportional to
+# citation density rather than document length.
+_ANCHOR_RE = re.compile(
+    r"§|\bArt(?:\.|ikel)\s*\d"
+    r"|\d/\d{2,4}\b"
+    r"|\b(?:BGH|BVerfG|BVerwG|BFH|BAG|BSG|BPatG|EuGH|EGMR|OLG|OVG|VGH|LAG|LSG|LG|AG|VG|FG|SG|KG)\b"
+    r"|\b(?:Urteil|Beschluss|Urt\.|Beschl\.|Az\.)"
+)
+
+DEFAULT_WINDOW_RADIUS = 64
+
+
+def candidate_windows(
+    text: str,
+    token_spans: list[tuple[int, int, str]],
+    radius: int = DEFAULT_WINDOW_RADIUS,
+) -> list[tuple[int, int]]:
+    """Token windows ``[start, end)`` around citation anchors in ``text``.
+
+    Each anchor match opens a window of ``radius`` tokens on either side;
+    overlapping or adjacent windows are merged, so the result is sorted
+    and disjoint.
+    """
+    if not token_spans:
+        return []
+    ends = [te for _, te, _ in token_spans]
+    n = len(token_spans)
+    windows: list[tuple[int, int]] = []
+    for m in _ANCHOR_RE.finditer(text):
+        i = bisect.bisect_right(ends, m.start())
+        start, end = max(0, i - radius), min(n, i + radius + 1)
+        if windows and start <= windows[-1][1]:
+            windows[-1] = (windows[-1][0], max(windows[-1][1], end))
+        else:
+            windows.append((start, end))
+    return windows
+
+
+def stitch_window_labels(n_tokens: int, windows: list[tuple[int, int]], window_labels: list[list[str]]) -> list[str]:
+    """Merge per-window BIO labels into one document-level sequence.
+
+    Tokens outside every window are ``O``.  A window that opens inside a
+    span (``I-`` after an ``O`` token) is repaired to start with ``B-``.
+    """
+    labels = ["O"] * n_tokens
+    for (start, end), wl in zip(windows, window_labels, strict=True):
+        labels[start:end] = wl
+        if wl and wl[0].startswith("I-") and (start == 0 or labels[start - 1] == "O"):
+            labels[start] = "B-" + wl[0][2:]
+    return labels
+
+
 def spans_to_citations(
     spans: list[tuple[int, int, str, str]],
 ) -> list[Citation]:
     """Convert BIO-detected spans to typed Citation objects.
 
     The CRF only detects span boundaries — field parsing (book, number,
-    court, file_number) is done with simple heuristics here.
+    court, file_number) is shared with the transformer engine, see
+    ``refex.engines.fields``.
     """
-    citations: list[Citation] = []
-
-    for start, end, span_text, label_type in spans:
-        span = Span(start=start, end=end, text=span_text)
-        cid = make_citation_id(span, "crf")
-
-        if label_type == "LAW_REF":
-            book, number = _parse_law_fields(span_text)
-            citations.append(
-                LawCitation(
-                    span=span,
-                    id=cid,
-                    book=book,
-                    number=number,
-                    confidence=0.8,
-                )
-            )
-        elif label_type == "CASE_REF":
-            court, file_number = _parse_case_fields(span_text)
-            citations.append(
-                CaseCitation(
-                    span=span,
-                    id=cid,
-                    court=court,
-                    file_number=file_number,
-                    confidence=0.8,
-                )
-            )
+    from refex.engines.fields import spans_to_typed_citations
 
-    return citations
+    return spans_to_typed_citations(spans, "crf", confidence=0.8)
 
 
 def _parse_law_fields(text: str) -> tuple[str | None, str | None]:
     """Extract book and number from a law citation span."""
-    # Try: "§ 433 Abs. 1 BGB" → book=bgb, number=433
-    m = re.match(r"§§?\s*(\d+\s?[a-z]?)", text)
-    number = m.group(1).strip() if m else None
-
-    # Book is typically the last word if it looks like an abbreviation
-    words = text.split()
-    book = None
-    if words:
-        last = words[-1]
-        if re.match(r"^[A-ZÄÖÜ]", last) and not last.isdigit() and last not in ("§", "§§", "Abs.", "Nr.", "S."):
-            book = last.lower()
+    from refex.engines.fields import get_span_field_parser
 
-    return book, number
+    return get_span_field_parser().parse_law(text)
 
 
 def _parse_case_fields(text: str) -> tuple[str | None, str | None]:
     """Extract court and file_number from a case citation span."""
-    # File number pattern: "VIII ZR 295/01" or "10 C 23.12" — chamber is
-    # either Roman numerals (I-X) or digits, followed by code + number/year.
-    fn_match = re.search(r"(?:[IVX]+|\d+)\s+[A-Z][A-Za-z]{0,4}\s+\d+[/.]\d{2,4}", text)
-    file_number = fn_match.group(0) if fn_match else None
+    from refex.engines.fields import get_span_field_parser
 
-    # Court is usually at the beginning before "Urteil"/"Beschluss"/date
-    court = None
-    court_match = re.match(r"^([A-ZÄÖÜ][A-Za-zÄÖÜäöüß\s-]+?)(?:,|\s+(?:Urteil|Beschl|vom|\d))", text)
-    if court_match:
-        court = court_match.group(1).strip()
+    return get_span_field_parser().parse_case(text)
 
-    return court, file_number
+
+def label_tokens(
+    token_spans: list[tuple[int, int, str]],
+    citations: list[tuple[int, int, str]],
+) -> list[str]:
+    """Gold BIO labels for ``token_spans`` from ``(start, end, type)`` citations.
+
+    A token is inside a citation when it overlaps the citation's
+    character span.  Token boundaries are binary-searched, so labelling
+    costs O(citations × log tokens) plus the labelled tokens.  Later
+    citations overwrite earlier ones where they overlap.
+    """
+    labels = ["O"] * len(token_spans)
+    starts = [ts for ts, _, _ in token_spans]
+    ends = [te for _, te, _ in token_spans]
+    for start, end, ctype in citations:
+        first = bisect.bisect_right(ends, start)
+        last = bisect.bisect_left(starts, end)
+        if first >= last:
+            continue
+        label = ctype.upper() + "_REF"
+        labels[first] = f"B-{label}"
+        for i in range(first + 1, last):
+            labels[i] = f"I-{label}"
+    return labels
+
+
+class FeatureCache:
+    """On-disk cache of per-document crfsuite features.
+
+    Entries are keyed by the SHA-256 of the document text and
+    ``FEATURE_VERSION`` and sharded into 256 sub-directories by key
+    prefix.  Labels are not cached, so retraining after a gold-label fix
+    reuses every document's features.  Writes go through a temporary
+    file and ``os.replace`` so concurrent workers never see partial
+    entries.
+    """
+
+    def __init__(self, cache_dir: Path | str):
+        self.cache_dir = Path(cache_dir)
+
+    def key(self, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{digest}-v{FEATURE_VERSION}"
+
+    def path(self, text: str) -> Path:
+        key = self.key(text)
+        return self.cache_dir / key[:2] / f"{key}.pkl"
+
+    def get(self, text: str) -> list[list[str]] | None:
+        try:
+            with open(self.path(text), "rb") as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def put(self, text: str, features: list[list[str]]) -> None:
+        path = self.path(text)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(features, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+
+def document_sequence(
+    text: str,
+    citations: list[tuple[int, int, str]],
+    cache: FeatureCache | None = None,
+) -> tuple[list[list[str]], list[str]]:
+    """crfsuite features and gold BIO labels for one document."""
+    token_spans = tokenize(text)
+    features = cache.get(text) if cache is not None else None
+    if features is None or len(features) != len(token_spans):
+        features = sequence_to_crfsuite_features([t[2] for t in token_spans])
+        if cache is not None:
+            cache.put(text, features)
+    return features, label_tokens(token_spans, citations)
+
+
+def _document_sequence_job(
+    job: tuple[str, list[tuple[int, int, str]], str | None],
+) -> tuple[list[list[str]], list[str]]:
+    text, citations, cache_dir = job
+    cache = FeatureCache(cache_dir) if cache_dir else None
+    return document_sequence(text, citations, cache)
+
+
+def _iter_labelled_documents(
+    data_dir: Path | None,
+    split: str,
+    limit: int | None,
+    skip_empty: bool,
+) -> Iterator[tuple[int, int, str, list[tuple[int, int, str]]]]:
+    """Yield ``(doc_idx, total_docs, text, citations)`` for trainable documents."""
+    from benchmarks.datasets import load_dataset
+
+    ds = load_dataset(data_dir, split=split)
+    total_docs = len(ds.documents)
+    logger.info("Scanning %d documents (skip_empty=%s)", total_docs, skip_empty)
+
+    yielded = 0
+    for doc_idx, doc in enumerate(ds.documents):
+        if limit is not None and yielded >= limit:
+            break
+
+        ann = ds.annotations.get(doc.doc_id)
+        if not ann:
+            continue
+
+        citations = [(c.span.start, c.span.end, c.type) for c in ann.citations if c.type in ("law", "case")]
+        if skip_empty and not citations:
+            continue
+        if not doc.text.strip():
+            continue
+
+        yield doc_idx, total_docs, doc.text, citations
+        yielded += 1
+
+
+def iter_training_sequences(
+    data_dir: Path | None = None,
+    split: str = "train",
+    limit: int | None = None,
+    skip_empty: bool = True,
+    workers: int = 1,
+    cache_dir: Path | str | None = None,
+) -> Iterator[tuple[list[list[str]], list[str]]]:
+    """Stream ``(crfsuite_features, labels)`` per document in dataset order.
+
+    With ``workers > 1`` documents are featurised in a process pool.  At
+    most ``4 × workers`` documents are in flight, so peak memory is
+    bounded regardless of split size.  With ``cache_dir`` each
+    document's features are read from / written to a ``FeatureCache``.
+    """
+    cache_dir = str(cache_dir) if cache_dir else None
+    docs = _iter_labelled_documents(data_dir, split, limit, skip_empty)
+
+    if workers <= 1:
+        cache = FeatureCache(cache_dir) if cache_dir else None
+        for _, _, text, citations in docs:
+            yield document_sequence(text, citations, cache)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    max_in_flight = 4 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque = deque()
+        for _, _, text, citations in docs:
+            pending.append(pool.submit(_document_sequence_job, (text, citations, cache_dir)))
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
 
 
 def build_training_data(
@@ -256,6 +527,10 @@ def build_training_data(
 ) -> tuple[list[list[dict]], list[list[str]]]:
     """Build CRF training data from the benchmark dataset.
 
+    Materialises feature dicts for the whole split, as expected by the
+    ``sklearn-crfsuite`` API.  ``train_crf`` streams from
+    ``iter_training_sequences`` instead.
+
     Args:
         data_dir: Benchmark dataset directory.
         split: Which split to load.
@@ -265,51 +540,14 @@ def build_training_data(
     Returns (X, y) where X is a list of feature-dict sequences and
     y is a list of BIO label sequences.
     """
-    from benchmarks.datasets import load_dataset
-
-    ds = load_dataset(data_dir, split=split)
-
     X: list[list[dict]] = []
     y: list[list[str]] = []
 
-    total_docs = len(ds.documents)
-    logger.info("Scanning %d documents (skip_empty=%s)", total_docs, skip_empty)
-
-    for doc_idx, doc in enumerate(ds.documents):
-        if limit is not None and len(X) >= limit:
-            break
-
-        ann = ds.annotations.get(doc.doc_id)
-        if not ann:
-            continue
-
-        citations = [c for c in ann.citations if c.type in ("law", "case")]
-        if skip_empty and not citations:
-            continue
-
-        text = doc.text
+    for doc_idx, total_docs, text, citations in _iter_labelled_documents(data_dir, split, limit, skip_empty):
         token_spans = tokenize(text)
-        if not token_spans:
-            continue
-
         tokens = [t[2] for t in token_spans]
-        features = [extract_features(tokens, i) for i in range(len(tokens))]
-
-        # Build gold labels
-        labels = ["O"] * len(token_spans)
-        for cit in citations:
-            label = cit.type.upper() + "_REF"
-            first = True
-            for i, (ts, te, _) in enumerate(token_spans):
-                if te <= cit.span.start:
-                    continue
-                if ts >= cit.span.end:
-                    break
-                labels[i] = f"B-{label}" if first else f"I-{label}"
-                first = False
-
-        X.append(features)
-        y.append(labels)
+        X.append([extract_features(tokens, i) for i in range(len(tokens))])
+        y.append(label_tokens(token_spans, citations))
 
         if len(X) % 100 == 0:
             logger.info(
@@ -332,6 +570,8 @@ def train_crf(
     max_iterations: int = 50,
     limit: int | None = None,
     algorithm: str = "lbfgs",
+    workers: int = 1,
+    feature_cache: Path | str | None = None,
 ) -> Path:
     """Train a CRF model and save it to disk.
 
@@ -350,12 +590,15 @@ def train_crf(
         algorithm: Training algorithm: "lbfgs" (default, best F1 but
             memory-hungry) or "l2sgd" (stochastic gradient descent,
             much less memory, scales to larger datasets).
+        workers: Processes used to build features (1 = in-process).
+        feature_cache: Directory for the per-document feature cache;
+            reruns (e.g. after a label fix) skip feature extraction for
+            unchanged documents.
 
     Returns:
         Path to the saved model file.
     """
     import pycrfsuite
-    from benchmarks.datasets import load_dataset
 
     if output_path is None:
         output_path = Path(__file__).parent.parent / "data" / "crf_model.pkl"
@@ -376,62 +619,24 @@ def train_crf(
     logger.info("Streaming training data to CRFsuite (algorithm=%s, limit=%s)", algorithm, limit)
     trainer = pycrfsuite.Trainer(algorithm=algorithm, params=params, verbose=True)
 
-    ds = load_dataset(data_dir, split="train")
-    total_docs = len(ds.documents)
-    logger.info("Scanning %d documents (skip_empty=True)", total_docs)
-
     appended = 0
     total_tokens = 0
-    for doc_idx, doc in enumerate(ds.documents):
-        if limit is not None and appended >= limit:
-            break
-
-        ann = ds.annotations.get(doc.doc_id)
-        if not ann:
-            continue
-
-        citations = [c for c in ann.citations if c.type in ("law", "case")]
-        if not citations:
-            continue
-
-        text = doc.text
-        token_spans = tokenize(text)
-        if not token_spans:
-            continue
-
-        tokens = [t[2] for t in token_spans]
-        features = [extract_features(tokens, i) for i in range(len(tokens))]
-
-        labels = ["O"] * len(token_spans)
-        for cit in citations:
-            label = cit.type.upper() + "_REF"
-            first = True
-            for i, (ts, te, _) in enumerate(token_spans):
-                if te <= cit.span.start:
-                    continue
-                if ts >= cit.span.end:
-                    break
-                labels[i] = f"B-{label}" if first else f"I-{label}"
-                first = False
-
-        # Convert feature dicts to pycrfsuite's string format
-        # (each feature is either "key" for boolean or "key=value" for string)
-        crf_features = [_dict_to_crfsuite_features(f) for f in features]
+    sequences = iter_training_sequences(data_dir, split="train", limit=limit, workers=workers, cache_dir=feature_cache)
+    for crf_features, labels in sequences:
         trainer.append(crf_features, labels)
 
         # Free local refs immediately after append — the data is now
         # in the C-side buffer.
-        del features, crf_features, labels
+        n_tokens = len(labels)
+        del crf_features, labels
         appended += 1
-        total_tokens += len(token_spans)
+        total_tokens += n_tokens
 
         if appended % 200 == 0:
             logger.info(
-                "Streamed %d/%s docs (scanned %d/%d, %d tokens)",
+                "Streamed %d/%s docs (%d tokens)",
                 appended,
                 limit or "all",
-                doc_idx + 1,
-                total_docs,
                 total_tokens,
             )
 
@@ -461,6 +666,91 @@ def _dict_to_crfsuite_features(d: dict) -> list[str]:
     return out
 
 
+@lru_cache(maxsize=16)
+def _resolve_model(model_path: str, mtime_ns: int) -> tuple[str, object]:
+    """Read a model pickle once per process (re-read when the file changes).
+
+    ``mtime_ns`` is not read here; it is the file's modification time,
+    passed only so that it is part of the ``lru_cache`` key and a
+    rewritten model misses the cache.
+
+    Returns ``("crfsuite", crfsuite_path)`` for models written by
+    ``train_crf`` or ``("sklearn", crf)`` for legacy pickled
+    ``sklearn_crfsuite.CRF`` objects.
+    """
+    path = Path(model_path)
+    with open(path, "rb") as f:
+        obj = pickle.load(f)
+
+    # New format: dict with path to .crfsuite file (from pycrfsuite.Trainer)
+    if isinstance(obj, dict) and obj.get("format") == "crfsuite":
+        p = Path(obj["path"])
+        # If path is relative, resolve against the pickle's directory
+        if not p.is_absolute():
+            p = path.parent / p.name
+        if not p.exists():
+            # Try next to the pickle
+            p = path.with_suffix(".crfsuite")
+        return "crfsuite", str(p)
+    # Legacy: pickled sklearn_crfsuite.CRF
+    return "sklearn", obj
+
+
+class _TaggerPool:
+    """Process-wide pool of opened ``pycrfsuite.Tagger`` objects for one model.
+
+    A tagger holds per-sequence state and must not be shared between
+    threads; the pool hands each caller its own and keeps released
+    taggers open for reuse, so a model file is opened at most once per
+    concurrently tagging thread.
+    """
+
+    def __init__(self, crfsuite_path: str):
+        self.crfsuite_path = crfsuite_path
+        self._idle: list = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def tagger(self):
+        with self._lock:
+            tagger = self._idle.pop() if self._idle else None
+        if tagger is None:
+            import pycrfsuite
+
+            tagger = pycrfsuite.Tagger()
+            tagger.open(self.crfsuite_path)
+        try:
+            yield tagger
+        finally:
+            with self._lock:
+                self._idle.append(tagger)
+
+
+_TAGGER_POOLS: dict[tuple[str, int | None], _TaggerPool] = {}
+_TAGGER_POOLS_LOCK = threading.Lock()
+
+
+def _get_tagger_pool(crfsuite_path: str) -> _TaggerPool:
+    """Pool for the model file as it is now, keyed by path and mtime like ``_resolve_model``.
+
+    A retrained model written to the same path gets a new pool; the pool
+    of the previous file is dropped (extractors already holding it keep
+    tagging with the model they loaded).
+    """
+    try:
+        mtime_ns = os.stat(crfsuite_path).st_mtime_ns
+    except OSError:
+        mtime_ns = None  # tagger.open reports the missing file
+    key = (crfsuite_path, mtime_ns)
+    with _TAGGER_POOLS_LOCK:
+        pool = _TAGGER_POOLS.get(key)
+        if pool is None:
+            for stale in [k for k in _TAGGER_POOLS if k[0] == crfsuite_path]:
+                del _TAGGER_POOLS[stale]
+            pool = _TAGGER_POOLS[key] = _TaggerPool(crfsuite_path)
+        return pool
+
+
 class CRFExtractor:
     """CRF-based citation extractor implementing the ``Extractor`` protocol.
 
@@ -468,17 +758,37 @@ class CRFExtractor:
     tokens.  Detected spans are converted to ``LawCitation`` or
     ``CaseCitation`` objects.
 
+    Model metadata is resolved once per process and crfsuite taggers
+    come from a shared, thread-safe pool, so any number of extractors
+    (and threads) can use the same model file.
+
     Usage::
 
         extractor = CRFExtractor()  # loads default bundled model
         citations, relations = extractor.extract(text)
+        results = extractor.extract_batch(texts, workers=4)
+
+    With ``windowed=True`` only token windows of ``window_radius``
+    tokens around citation anchors (``§``, file numbers, court
+    abbreviations, …) are tagged; the rest of the document is labelled
+    ``O``.  Context features at window edges differ from whole-document
+    tagging, so results can differ slightly near window boundaries.
+    Windowed tagging needs the crfsuite backend; loading a legacy
+    sklearn model with ``windowed=True`` raises ``ValueError``.
     """
 
-    def __init__(self, model_path: Path | str | None = None):
+    def __init__(
+        self,
+        model_path: Path | str | None = None,
+        windowed: bool = False,
+        window_radius: int = DEFAULT_WINDOW_RADIUS,
+    ):
         if model_path is None:
             model_path = Path(__file__).parent.parent / "data" / "crf_model.pkl"
         self._model_path = Path(model_path)
-        self._tagger = None  # pycrfsuite.Tagger or sklearn_crfsuite.CRF
+        self.windowed = windowed
+        self.window_radius = window_radius
+        self._tagger = None  # _TaggerPool (crfsuite) or sklearn_crfsuite.CRF
         self._backend = None  # "crfsuite" or "sklearn"
 
     def _load_model(self):
@@ -488,42 +798,28 @@ class CRFExtractor:
             raise FileNotFoundError(
                 f"CRF model not found at {self._model_path}. Train it first: python -m refex.engines.crf --train"
             )
-        with open(self._model_path, "rb") as f:
-            obj = pickle.load(f)
-
-        # New format: dict with path to .crfsuite file (from pycrfsuite.Trainer)
-        if isinstance(obj, dict) and obj.get("format") == "crfsuite":
-            import pycrfsuite
-
-            crfsuite_path = obj["path"]
-            # If path is relative, resolve against the pickle's directory
-            p = Path(crfsuite_path)
-            if not p.is_absolute():
-                p = self._model_path.parent / p.name
-            if not p.exists():
-                # Try next to the pickle
-                p = self._model_path.with_suffix(".crfsuite")
-            self._tagger = pycrfsuite.Tagger()
-            self._tagger.open(str(p))
-            self._backend = "crfsuite"
-        else:
-            # Legacy: pickled sklearn_crfsuite.CRF
-            self._tagger = obj
-            self._backend = "sklearn"
+        path = self._model_path.resolve()
+        backend, payload = _resolve_model(str(path), path.stat().st_mtime_ns)
+        if self.windowed and backend != "crfsuite":
+            msg = f"windowed=True needs a crfsuite model; {self._model_path} is a legacy sklearn model"
+            raise ValueError(msg)
+        self._backend = backend
+        self._tagger = _get_tagger_pool(payload) if backend == "crfsuite" else payload
 
     def extract(self, text: str) -> tuple[list[Citation], list[CitationRelation]]:
         """Extract citations from plain text using CRF tagging."""
         self._load_model()
 
-        features, token_spans = text_to_features(text)
-        if not features:
-            return [], []
-
         if self._backend == "crfsuite":
-            # pycrfsuite expects list-of-strings features
-            crf_features = [_dict_to_crfsuite_features(f) for f in features]
-            labels = list(self._tagger.tag(crf_features))
+            token_spans = tokenize(text)
+            if not token_spans:
+                return [], []
+            with self._tagger.tagger() as tagger:
+                labels = self._tag_document(tagger, text, token_spans)
         else:
+            features, token_spans = text_to_features(text)
+            if not features:
+                return [], []
             labels = self._tagger.predict_single(features)
 
         spans = bio_to_spans(labels, token_spans, text)
@@ -531,6 +827,133 @@ class CRFExtractor:
 
         return citations, []
 
+    def extract_batch(
+        self,
+        texts: list[str],
+        workers: int | None = None,
+    ) -> list[tuple[list[Citation], list[CitationRelation]]]:
+        """Extract citations from many documents.
+
+        Features for the whole batch are built first (sharing the
+        per-token feature memo), then sequences are tagged on up to
+        ``workers`` threads, each with its own pooled tagger.  Defaults
+        to one thread per CPU.  The legacy sklearn backend tags serially.
+        Results are in input order.
+        """
+        self._load_model()
+        if self._backend != "crfsuite":
+            return [self.extract(text) for text in texts]
+
+        token_spans = [tokenize(text) for text in texts]
+        todo = [i for i, ts in enumerate(token_spans) if ts]
+        if self.windowed:
+            features = None
+        else:
+            features = [sequence_to_crfsuite_features([t[2] for t in ts]) for ts in token_spans]
+
+        labels: list[list[str]] = [[] for _ in texts]
+        pool = self._tagger
+
+        def tag_range(indices: list[int]) -> None:
+            with pool.tagger() as tagger:
+                for i in indices:
+                    if features is None:
+                        labels[i] = self._tag_document(tagger, texts[i], token_spans[i])
+                    else:
+                        labels[i] = list(tagger.tag(features[i]))
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = max(1, min(workers, len(todo)))
+        if workers == 1:
+            tag_range(todo)
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+
+            # Longest sequences first, dealt round-robin, to balance the threads.
+            todo.sort(key=lambda i: len(token_spans[i]), reverse=True)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(tag_range, [todo[k::workers] for k in range(workers)]))
+
+        results: list[tuple[list[Citation], list[CitationRelation]]] = []
+        for text, ts, lab in zip(texts, token_spans, labels, strict=True):
+            results.append((spans_to_citations(bio_to_spans(lab, ts, text)) if lab else [], []))
+        return results
+
+    def _tag_document(self, tagger, text: str, token_spans: list[tuple[int, int, str]]) -> list[str]:
+        """BIO labels for one tokenized document (whole or windowed)."""
+        tokens = [t[2] for t in token_spans]
+        if not self.windowed:
+            # pycrfsuite expects list-of-strings features
+            return list(tagger.tag(sequence_to_crfsuite_features(tokens)))
+        windows = candidate_windows(text, token_spans, self.window_radius)
+        window_labels = [list(tagger.tag(sequence_to_crfsuite_features(tokens[a:b]))) for a, b in windows]
+        return stitch_window_labels(len(tokens), windows, window_labels)
+
+
+def evaluate_crf(extractor: CRFExtractor, dataset) -> dict:
+    """Exact-span P/R/F1 and timing of ``extractor`` on a benchmark dataset.
+
+    ``tagged_fraction`` is the share of tokens the CRF actually tagged
+    (1.0 unless the extractor is windowed).  The model is loaded and the
+    per-token feature memo cleared before timing, so successive
+    evaluations (e.g. full, then windowed) start equally cold.
+    """
+    import time
+
+    total_pred = 0
+    total_gold = 0
+    total_tp = 0
+    total_tokens = 0
+    tagged_tokens = 0
+    extractor._load_model()
+    _token_features.cache_clear()
+    t0 = time.perf_counter()
+
+    for doc in dataset.documents:
+        ann = dataset.annotations.get(doc.doc_id)
+        if not ann:
+            continue
+
+        gold_cits = [c for c in ann.citations if c.type in ("law", "case")]
+        pred_cits, _ = extractor.extract(doc.text)
+
+        gold_spans = {(c.span.start, c.span.end) for c in gold_cits}
+        pred_spans = {(c.span.start, c.span.end) for c in pred_cits}
+
+        total_gold += len(gold_spans)
+        total_pred += len(pred_spans)
+        total_tp += len(gold_spans & pred_spans)
+
+    dt = time.perf_counter() - t0
+
+    for doc in dataset.documents:
+        token_spans = tokenize(doc.text)
+        total_tokens += len(token_spans)
+        if extractor.windowed:
+            windows = candidate_windows(doc.text, token_spans, extractor.window_radius)
+            tagged_tokens += sum(b - a for a, b in windows)
+        else:
+            tagged_tokens += len(token_spans)
+
+    p = total_tp / total_pred if total_pred else 0
+    r = total_tp / total_gold if total_gold else 0
+    f1 = 2 * p * r / (p + r) if (p + r) else 0
+    return {
+        "precision": p,
+        "recall": r,
+        "f1": f1,
+        "docs": len(dataset.documents),
+        "seconds": dt,
+        "tagged_fraction": tagged_tokens / total_tokens if total_tokens else 0.0,
+    }
+
+
+def _print_evaluation(name: str, m: dict) -> None:
+    print(
+        f"{name}: P={m['precision']:.3f} R={m['recall']:.3f} F1={m['f1']:.3f} ({m['docs']} docs, {m['seconds']:.1f}s)"
+    )
+
 
 def _setup_logging(log_file: Path | None = None) -> None:
     """Configure logging to both stderr and optionally a file.
@@ -578,6 +1001,24 @@ def main():
         default="lbfgs",
         help="Training algorithm: lbfgs (best F1, high memory) or l2sgd (lower memory, scales better)",
     )
+    parser.add_argument(
+        "--windowed",
+        action="store_true",
+        help="With --evaluate: also evaluate anchor-window tagging and report the recall/F1 change",
+    )
+    parser.add_argument(
+        "--window-radius",
+        type=int,
+        default=DEFAULT_WINDOW_RADIUS,
+        help=f"Tokens on each side of a citation anchor (default: {DEFAULT_WINDOW_RADIUS})",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Processes for feature extraction (default: 1)")
+    parser.add_argument(
+        "--feature-cache",
+        type=Path,
+        default=None,
+        help="Directory for cached per-document features (reused across training runs)",
+    )
     parser.add_argument(
         "--log-file",
         type=Path,
@@ -599,6 +1040,8 @@ def main():
             max_iterations=args.max_iter,
             limit=args.limit,
             algorithm=args.algorithm,
+            workers=args.workers,
+            feature_cache=args.feature_cache,
         )
         dt = time.perf_counter() - t0
         print(f"Training completed in {dt:.1f}s. Model: {model_path}")
@@ -606,34 +1049,20 @@ def main():
     if args.evaluate:
         from benchmarks.datasets import load_dataset
 
-        ext = CRFExtractor(model_path=args.output)
         ds = load_dataset(args.data_dir, split="validation")
-
-        total_pred = 0
-        total_gold = 0
-        total_tp = 0
-        t0 = time.perf_counter()
-
-        for doc in ds.documents:
-            ann = ds.annotations.get(doc.doc_id)
-            if not ann:
-                continue
-
-            gold_cits = [c for c in ann.citations if c.type in ("law", "case")]
-            pred_cits, _ = ext.extract(doc.text)
-
-            gold_spans = {(c.span.start, c.span.end) for c in gold_cits}
-            pred_spans = {(c.span.start, c.span.end) for c in pred_cits}
-
-            total_gold += len(gold_spans)
-            total_pred += len(pred_spans)
-            total_tp += len(gold_spans & pred_spans)
-
-        dt = time.perf_counter() - t0
-        p = total_tp / total_pred if total_pred else 0
-        r = total_tp / total_gold if total_gold else 0
-        f1 = 2 * p * r / (p + r) if (p + r) else 0
-        print(f"Validation: P={p:.3f} R={r:.3f} F1={f1:.3f} ({len(ds.documents)} docs, {dt:.1f}s)")
+        full = evaluate_crf(CRFExtractor(model_path=args.output), ds)
+        _print_evaluation("Validation", full)
+
+        if args.windowed:
+            ext = CRFExtractor(model_path=args.output, windowed=True, window_radius=args.window_radius)
+            win = evaluate_crf(ext, ds)
+            _print_evaluation(f"Windowed (radius={args.window_radius})", win)
+            speedup = full["seconds"] / win["seconds"] if win["seconds"] else 0
+            print(
+                f"Windowed vs full: recall {win['recall'] - full['recall']:+.3f}, "
+                f"F1 {win['f1'] - full['f1']:+.3f}, "
+                f"{win['tagged_fraction']:.1%} of tokens tagged, {speedup:.1f}x faster"
+            )
 
     if not args.train and not args.evaluate:
         parser.print_help()
@@ -0,0 +1,196 @@
+"""Field parsing for citation spans detected by the ML engines.
+
+The CRF and transformer engines only find span boundaries; the book,
+section number, court and file number are parsed from the span text
+here.  Book codes and court names are recognised from the same data
+the regex engine uses (the precise book-code list of
+``DivideAndConquerLawRefExtractorMixin`` plus its generic book pattern,
+and the court gazetteer of ``CaseRefExtractorMixin``), so a span yields
+the same normalised ``book`` / ``court`` whichever engine found it.
+When neither recogniser matches, a word-shape heuristic is used as
+before.
+
+Spans are short, so instead of running the regex engine's
+multi-thousand-way alternations over them, the parser looks up the
+span's word n-grams in hash sets of the codes and court names.
+
+The recognisers are built once per process on first use
+(``get_span_field_parser()``); batches of spans are parsed with
+per-batch memoisation of repeated span texts::
+
+    parser = get_span_field_parser()
+    parser.parse_law("§ 433 Abs. 1 BGB")   # ("bgb", "433")
+    citations = spans_to_typed_citations(spans, source="crf", confidence=0.8)
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from functools import lru_cache
+
+from refex.citations import CaseCitation, Citation, LawCitation, Span, make_citation_ids
+from refex.vocab import get_book_vocabulary, get_court_vocabulary
+
+# Delimiters stripped from words before lookup (cf. ``_default_word_delimiter``)
+_STRIP = ".,;:!?()[]\"'<>&"
+
+# "§ 433", "§§ 708", "Art. 12", "Artikel 3a" at the start of a span
+_SECTION_NUMBER_RE = re.compile(r"(?:§§?|Art(?:ikel|\.)?)\s*(\d+\s?[a-z]?)")
+
+# Heuristic book: last word of the span if it starts upper-case
+_BOOK_SHAPE_RE = re.compile(r"[A-ZÄÖÜ]")
+_NOT_A_BOOK = frozenset({"§", "§§", "Abs.", "Nr.", "S."})
+
+# File number: "VIII ZR 295/01" or "10 C 23.12" — chamber is either Roman
+# numerals (I-X) or digits, followed by code + number/year.
+_FILE_NUMBER_RE = re.compile(r"(?:[IVX]+|\d+)\s+[A-Z][A-Za-z]{0,4}\s+\d+[/.]\d{2,4}")
+
+# Heuristic court: leading words before "Urteil"/"Beschluss"/date
+_COURT_PREFIX_RE = re.compile(r"^([A-ZÄÖÜ][A-Za-zÄÖÜäöüß\s-]+?)(?:,|\s+(?:Urteil|Beschl|vom|\d))")
+
+
+class SpanFieldParser:
+    """Parse law and case fields from citation span texts.
+
+    ``book_codes`` / ``court_names`` are looked up against word n-grams
+    of the span (up to the longest entry's word count).  The book is
+    the last match in the span, as the code follows the section list;
+    the court is the first match.  ``generic_book_re`` recognises book
+    abbreviations missing from the code list (``...G``, ``...O``, …).
+    """
+
+    __slots__ = ("book_codes", "book_max_words", "court_names", "court_max_words", "generic_book_re")
+
+    def __init__(self, book_codes: Iterable[str], court_names: Iterable[str], generic_book_re: re.Pattern):
+        self.book_codes = frozenset(book_codes)
+        self.court_names = frozenset(court_names)
+        self.book_max_words = max((len(c.split()) for c in self.book_codes), default=1)
+        self.court_max_words = max((len(c.split()) for c in self.court_names), default=1)
+        self.generic_book_re = generic_book_re
+
+    @classmethod
+    def from_extractors(cls) -> SpanFieldParser:
+        """Build the recognisers from the regex engine's book codes and court gazetteer."""
+        from refex.extractors.case import CaseRefExtractorMixin
+        from refex.extractors.law import DivideAndConquerLawRefExtractorMixin
+
+        law = DivideAndConquerLawRefExtractorMixin()
+        return cls(
+            law.law_book_codes,
+            CaseRefExtractorMixin().get_court_names(),
+            re.compile(law._GENERIC_BOOK_PATTERN),
+        )
+
+    def find_book(self, words: list[str]) -> str | None:
+        """Last book code (or generic book abbreviation) in ``words``."""
+        codes, generic = self.book_codes, self.generic_book_re
+        for end in range(len(words), 0, -1):
+            for n in range(min(self.book_max_words, end), 0, -1):
+                candidate = " ".join(words[end - n : end])
+                if candidate in codes:
+                    return candidate
+                stripped = candidate.strip(_STRIP)
+                if stripped in codes or (n <= 2 and generic.fullmatch(stripped)):
+                    return stripped
+        return None
+
+    def find_court(self, words: list[str]) -> str | None:
+        """First gazetteer court name in ``words``."""
+        names = self.court_names
+        for start in range(len(words)):
+            for n in range(min(self.court_max_words, len(words) - start), 0, -1):
+                candidate = " ".join(words[start : start + n]).lstrip("(")
+                if candidate in names:
+                    return candidate
+                stripped = candidate.rstrip(".;,:)")
+                if stripped in names:
+                    return stripped
+        return None
+
+    def parse_law(self, text: str) -> tuple[str | None, str | None]:
+        """``(book, number)`` of a law citation span; ``book`` is lower-cased."""
+        m = _SECTION_NUMBER_RE.match(text)
+        number = m.group(1).strip() if m else None
+
+        words = text.split()
+        book = self.find_book(words)
+        if book is None and words:
+            last = words[-1]
+            if _BOOK_SHAPE_RE.match(last) and not last.isdigit() and last not in _NOT_A_BOOK:
+                book = last
+        return (book.strip().lower() if book else None), number
+
+    def parse_case(self, text: str) -> tuple[str | None, str | None]:
+        """``(court, file_number)`` of a case citation span."""
+        fn_match = _FILE_NUMBER_RE.search(text)
+        file_number = fn_match.group(0) if fn_match else None
+
+        court = self.find_court(text.split())
+        if court is None:
+            prefix = _COURT_PREFIX_RE.match(text)
+            court = prefix.group(1).strip() if prefix else None
+            # "VIII ZR 295/01": the chamber and register are not a court
+            if court and file_number and file_number.startswith(court):
+                court = None
+        return court, file_number
+
+    def parse_batch(self, spans: Iterable[tuple[str, str]]) -> list[tuple[str | None, str | None]]:
+        """Parse ``(span_text, label_type)`` pairs.
+
+        ``label_type`` is ``"LAW_REF"`` or ``"CASE_REF"``; other labels
+        yield ``(None, None)``.  Repeated span texts are parsed once.
+        """
+        seen: dict[tuple[str, str], tuple[str | None, str | None]] = {}
+        out = []
+        for key in spans:
+            fields = seen.get(key)
+            if fields is None:
+                text, label_type = key
+                if label_type == "LAW_REF":
+                    fields = self.parse_law(text)
+                elif label_type == "CASE_REF":
+                    fields = self.parse_case(text)
+                else:
+                    fields = (None, None)
+                seen[key] = fields
+            out.append(fields)
+        return out
+
+
+@lru_cache(maxsize=1)
+def get_span_field_parser() -> SpanFieldParser:
+    """Process-wide ``SpanFieldParser`` (built on first use)."""
+    return SpanFieldParser.from_extractors()
+
+
+def spans_to_typed_citations(
+    spans: list[tuple[int, int, str, str]],
+    source: str,
+    confidence: float,
+) -> list[Citation]:
+    """Convert ``(start, end, text, label_type)`` spans to typed citations.
+
+    ``LAW_REF`` spans become ``LawCitation`` and ``CASE_REF`` spans
+    ``CaseCitation``; book and court values already in the shared
+    vocabularies share their canonical string (guessed values are not
+    added, see ``refex.vocab``).
+    """
+    citations: list[Citation] = []
+    if not spans:
+        return citations
+
+    books, courts = get_book_vocabulary(), get_court_vocabulary()
+    typed_spans = [Span(start=start, end=end, text=span_text) for start, end, span_text, _ in spans]
+    ids = make_citation_ids(typed_spans, source)
+    fields = get_span_field_parser().parse_batch((span_text, label_type) for _, _, span_text, label_type in spans)
+
+    for (_, _, _, label_type), span, cid, (a, b) in zip(spans, typed_spans, ids, fields):
+        if label_type == "LAW_REF":
+            citations.append(LawCitation(span=span, id=cid, book=books.canonical(a), number=b, confidence=confidence))
+        elif label_type == "CASE_REF":
+            citations.append(
+                CaseCitation(span=span, id=cid, court=courts.canonical(a), file_number=b, confidence=confidence)
+            )
+
+    return citations
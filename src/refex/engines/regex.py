@@ -12,16 +12,20 @@ from refex.citations import (
     CitationRelation,
     LawCitation,
     Span,
-    make_citation_id,
+    make_citation_ids,
 )
 from refex.extractors.case import CaseRefExtractorMixin
 from refex.extractors.law import DivideAndConquerLawRefExtractorMixin
 from refex.models import RefMarker, RefType
+from refex.vocab import get_book_vocabulary, get_court_vocabulary
 
 
 class RegexLawExtractor(DivideAndConquerLawRefExtractorMixin):
     """Law citation extractor emitting typed ``LawCitation`` objects."""
 
+    # Typed citations carry content-hash ids; marker uuids would be discarded.
+    marker_uuids = False
+
     def extract(self, text: str) -> tuple[list[Citation], list[CitationRelation]]:
         markers = self.extract_law_ref_markers(text, is_html=False)
         citations = _law_markers_to_citations(markers, unit_hint=self.get_unit_hint)
@@ -31,6 +35,8 @@ class RegexLawExtractor(DivideAndConquerLawRefExtractorMixin):
 class RegexCaseExtractor(CaseRefExtractorMixin):
     """Case citation extractor emitting typed ``CaseCitation`` objects."""
 
+    marker_uuids = False
+
     def extract(self, text: str) -> tuple[list[Citation], list[CitationRelation]]:
         markers = self.extract_case_ref_markers(text)
         citations = _case_markers_to_citations(markers)
@@ -49,12 +55,13 @@ def _law_markers_to_citations(
     heuristic (``Art.*`` → article, else paragraph).
     """
     citations: list[Citation] = []
-    for marker in markers:
-        span = Span(start=marker.start, end=marker.end, text=marker.text)
+    books = get_book_vocabulary()
+    spans = [Span(start=m.start, end=m.end, text=m.text) for m in markers]
+    ids = make_citation_ids(spans, "regex")
+    for marker, span, cid in zip(markers, spans, ids):
         for ref in marker.get_references():
             if ref.ref_type != RefType.LAW:
                 continue
-            cid = make_citation_id(span, "regex")
             # Detect Art./Artikel by marker text (fallback heuristic)
             is_article = marker.text.lstrip().startswith(("Art", "art"))
 
@@ -69,7 +76,7 @@ def _law_markers_to_citations(
                 LawCitation(
                     span=span,
                     id=cid,
-                    book=ref.book if ref.book else None,
+                    book=books.intern(ref.book) if ref.book else None,
                     number=ref.section if ref.section else None,
                     unit="article" if is_article else "paragraph",
                     delimiter="Art." if is_article else "§",
@@ -81,17 +88,18 @@ def _law_markers_to_citations(
 def _case_markers_to_citations(markers: list[RefMarker]) -> list[Citation]:
     """Convert case RefMarkers to typed CaseCitation objects."""
     citations: list[Citation] = []
-    for marker in markers:
-        span = Span(start=marker.start, end=marker.end, text=marker.text)
+    courts = get_court_vocabulary()
+    spans = [Span(start=m.start, end=m.end, text=m.text) for m in markers]
+    ids = make_citation_ids(spans, "regex")
+    for marker, span, cid in zip(markers, spans, ids):
         for ref in marker.get_references():
             if ref.ref_type != RefType.CASE:
                 continue
-            cid = make_citation_id(span, "regex")
             citations.append(
                 CaseCitation(
                     span=span,
                     id=cid,
-                    court=ref.court if ref.court else None,
+                    court=courts.intern(ref.court) if ref.court else None,
                     file_number=ref.file_number if ref.file_number else None,
                     date=ref.date if ref.date else None,
                 )
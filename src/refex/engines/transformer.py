@@ -15,6 +15,18 @@ Inference runs on CPU by default; pass ``device="cuda"``, ``"mps"``, or
 a torch device object to use GPU/MPS.  Batch inference (``extract_batch``)
 improves throughput substantially on accelerators.
 
+For CPU-only serving, ``export_onnx()`` converts a model to ONNX
+(optionally with dynamic int8 quantization) and
+``TransformerExtractor(path, backend="onnx")`` runs it with
+onnxruntime and the ``tokenizers`` library — torch and transformers are
+not imported at inference time (``[onnx]`` extra).
+
+On multi-core CPU machines, ``intra_op_threads`` / ``inter_op_threads``
+bound the threads of one extractor, and ``TransformerReplicaPool`` runs
+several replicas in worker processes pinned to disjoint core sets, fed
+from a shared queue (``python -m benchmarks.transformer_scaling``
+measures docs/sec against core count).
+
 Training is separate: use the ``to_hf_bio`` serializer to export training
 data and fine-tune a model with the HuggingFace Trainer API or any
 framework that accepts BIO labels.  See ``docs/train-transformer.md``.
@@ -25,19 +37,17 @@ Requires the ``[transformers]`` extra:
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
+import os
+import pickle
+import queue
+import re
 from pathlib import Path
 from typing import Any
 
-from refex.citations import (
-    CaseCitation,
-    Citation,
-    CitationRelation,
-    LawCitation,
-    Span,
-    make_citation_id,
-)
-from refex.engines.crf import _parse_case_fields, _parse_law_fields
+from refex.citations import Citation, CitationRelation
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +79,25 @@ DEFAULT_LABEL_MAP: dict[str, str] = {
     "O": "O",
 }
 
+BACKENDS = ("torch", "onnx")
+
+# How long inputs are split into model windows (see ``schedule_windows``)
+WINDOW_STRATEGIES = ("overflow", "adaptive")
+# How a word covered by several windows gets its label
+OVERLAP_MERGES = ("first", "center", "max_logit")
+
+# Bump when the cached encoding layout changes
+ENCODING_CACHE_VERSION = 2
+
+_WORD_RE = re.compile(r"\S+")
+
+# File names written by ``export_onnx`` into the model directory
+# Seconds a ``TransformerReplicaPool`` waits for a result before checking its replicas are alive
+REPLICA_POLL_SECONDS = 1.0
+
+ONNX_FILE = "model.onnx"
+ONNX_INT8_FILE = "model.int8.onnx"
+
 
 class TransformerExtractor:
     """Transformer-based citation extractor implementing the ``Extractor`` protocol.
@@ -92,6 +121,9 @@ class TransformerExtractor:
 
         # Custom model
         extractor = TransformerExtractor(model="./my-finetuned-model")
+
+        # ONNX Runtime on CPU (after ``export_onnx(model, "./onnx-model", quantize=True)``)
+        extractor = TransformerExtractor("./onnx-model", backend="onnx", quantized=True)
     """
 
     def __init__(
@@ -103,6 +135,13 @@ class TransformerExtractor:
         max_length: int = 512,
         stride: int = 128,
         trust_remote_code: bool = True,
+        backend: str = "torch",
+        quantized: bool = False,
+        encoding_cache: str | Path | None = None,
+        window_strategy: str = "overflow",
+        overlap_merge: str = "first",
+        intra_op_threads: int | None = None,
+        inter_op_threads: int | None = None,
     ):
         """
         Args:
@@ -119,7 +158,46 @@ class TransformerExtractor:
             stride: Overlap between windows when input exceeds ``max_length``.
             trust_remote_code: Allow models shipping custom code (needed for
                 EuroBERT, ModernGBERT).  Default ``True``.
+            backend: ``"torch"`` (default) or ``"onnx"``.  The ONNX backend
+                expects ``model`` to be a directory written by
+                ``export_onnx`` and ignores ``device``.
+            quantized: ONNX backend only — load the int8 model
+                (``model.int8.onnx``) instead of ``model.onnx``.
+            encoding_cache: Directory for cached document encodings
+                (word offsets and token windows), keyed by text hash and
+                tokenizer fingerprint.  Re-running a new checkpoint or
+                label map with the same tokenizer skips tokenization.
+            window_strategy: ``"overflow"`` (default) uses the tokenizer's
+                fixed ``max_length``/``stride`` overflow windows.
+                ``"adaptive"`` fills each window up to ``max_length`` and
+                ends it at a paragraph or sentence break where possible,
+                with a small overlap (at most ``stride // 4`` tokens,
+                snapped to a break) — fewer forward passes on long
+                documents.
+            overlap_merge: Label source for words in several windows:
+                ``"first"`` (default, earlier window wins), ``"center"``
+                (window where the word is farthest from an edge) or
+                ``"max_logit"`` (most confident window).
+            intra_op_threads: Threads used inside one operator (matrix
+                multiplications).  ``None`` keeps the library default
+                (one per core); use ``1`` in each worker of a process
+                pool to avoid oversubscribing the cores.  With the torch
+                backend this sets ``torch.set_num_threads`` for the
+                whole process.
+            inter_op_threads: Threads running independent operators in
+                parallel.  The torch setting is process-wide and can
+                only be changed before torch runs its first parallel
+                work; later changes are ignored with a warning.
         """
+        if backend not in BACKENDS:
+            msg = f"Unknown backend: {backend!r}. Expected one of: {', '.join(BACKENDS)}"
+            raise ValueError(msg)
+        if window_strategy not in WINDOW_STRATEGIES:
+            msg = f"Unknown window_strategy: {window_strategy!r}. Expected one of: {', '.join(WINDOW_STRATEGIES)}"
+            raise ValueError(msg)
+        if overlap_merge not in OVERLAP_MERGES:
+            msg = f"Unknown overlap_merge: {overlap_merge!r}. Expected one of: {', '.join(OVERLAP_MERGES)}"
+            raise ValueError(msg)
         self._model_ref = str(model)
         self._device_spec = device
         self._aggregation = aggregation
@@ -127,18 +205,39 @@ class TransformerExtractor:
         self._max_length = max_length
         self._stride = stride
         self._trust_remote_code = trust_remote_code
+        self._backend = backend
+        self._quantized = quantized
+        self._encoding_cache_dir = encoding_cache
+        self._encoding_cache: EncodingCache | None = None
+        self._window_strategy = window_strategy
+        self._overlap_merge = overlap_merge
+        self._intra_op_threads = intra_op_threads
+        self._inter_op_threads = inter_op_threads
 
         # Lazy-loaded to keep import cost low
         self._tokenizer = None
+        self._full_tokenizer = None  # ONNX backend: untruncated copy of the tokenizer
         self._model = None
         self._device = None
         self._id2label: dict[int, str] = {}
+        self._pad_id = 0
+        self._special_tokens: tuple[list[int], list[int]] | None = None
 
     def _load(self) -> None:
         """Lazy-load tokenizer and model on first use."""
         if self._model is not None:
             return
+        if self._backend == "onnx":
+            self._load_onnx()
+        else:
+            self._load_torch()
+        logger.info(
+            "Model loaded on %s with labels: %s",
+            self._device,
+            sorted(set(self._id2label.values())),
+        )
 
+    def _load_torch(self) -> None:
         try:
             import torch
             from transformers import AutoModelForTokenClassification, AutoTokenizer
@@ -149,6 +248,7 @@ class TransformerExtractor:
             )
             raise ImportError(msg) from exc
 
+        self._configure_torch_threads(torch)
         logger.info("Loading transformer model: %s", self._model_ref)
         self._tokenizer = AutoTokenizer.from_pretrained(
             self._model_ref, use_fast=True, trust_remote_code=self._trust_remote_code
@@ -167,11 +267,78 @@ class TransformerExtractor:
 
         # Cache id → label mapping from model config
         self._id2label = dict(self._model.config.id2label)
-        logger.info(
-            "Model loaded on %s with labels: %s",
-            self._device,
-            sorted(set(self._id2label.values())),
+        self._pad_id = self._tokenizer.pad_token_id or 0
+        backend_tokenizer = getattr(self._tokenizer, "backend_tokenizer", None)
+        self._init_encoding_cache(backend_tokenizer.to_str() if backend_tokenizer else repr(self._tokenizer))
+
+    def _load_onnx(self) -> None:
+        try:
+            import onnxruntime
+            from tokenizers import Tokenizer
+        except ImportError as exc:
+            msg = (
+                "The ONNX backend requires the '[onnx]' extra. "
+                "Install with: pip install legal-reference-extraction[onnx]"
+            )
+            raise ImportError(msg) from exc
+
+        model_dir = Path(self._model_ref)
+        onnx_path = model_dir / (ONNX_INT8_FILE if self._quantized else ONNX_FILE)
+        if not onnx_path.exists():
+            msg = f"ONNX model not found at {onnx_path}. Create it with refex.engines.transformer.export_onnx()"
+            raise FileNotFoundError(msg)
+
+        logger.info("Loading ONNX model: %s", onnx_path)
+        tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self._init_encoding_cache(tokenizer.to_str())
+        tokenizer.no_padding()
+        self._full_tokenizer = Tokenizer.from_str(tokenizer.to_str())
+        self._full_tokenizer.no_truncation()
+        tokenizer.enable_truncation(self._max_length, stride=self._stride)
+        self._tokenizer = tokenizer
+        options = onnxruntime.SessionOptions()
+        if self._intra_op_threads:
+            options.intra_op_num_threads = self._intra_op_threads
+        if self._inter_op_threads:
+            options.inter_op_num_threads = self._inter_op_threads
+            if self._inter_op_threads > 1:
+                options.execution_mode = onnxruntime.ExecutionMode.ORT_PARALLEL
+        self._model = onnxruntime.InferenceSession(
+            str(onnx_path), sess_options=options, providers=["CPUExecutionProvider"]
         )
+        self._device = "cpu (onnxruntime)"
+
+        config = json.loads((model_dir / "config.json").read_text(encoding="utf-8"))
+        self._id2label = {int(k): v for k, v in config["id2label"].items()}
+        pad = None
+        for name in ("special_tokens_map.json", "tokenizer_config.json"):
+            if not pad and (model_dir / name).exists():
+                pad = json.loads((model_dir / name).read_text(encoding="utf-8")).get("pad_token")
+        pad = pad.get("content") if isinstance(pad, dict) else pad
+        self._pad_id = (tokenizer.token_to_id(pad) if pad else None) or 0
+
+    def _configure_torch_threads(self, torch: Any) -> None:
+        if self._intra_op_threads:
+            torch.set_num_threads(self._intra_op_threads)
+        inter = self._inter_op_threads
+        if inter and torch.get_num_interop_threads() != inter:
+            try:
+                torch.set_num_interop_threads(inter)
+            except RuntimeError:
+                logger.warning(
+                    "torch inter-op threads are already fixed at %d in this process; ignoring inter_op_threads=%d",
+                    torch.get_num_interop_threads(),
+                    inter,
+                )
+
+    def _init_encoding_cache(self, tokenizer_state: str) -> None:
+        if self._encoding_cache_dir is None:
+            return
+        fingerprint = hashlib.sha256(
+            f"{tokenizer_state}|{self._max_length}|{self._stride}|{self._window_strategy}"
+            f"|v{ENCODING_CACHE_VERSION}".encode()
+        ).hexdigest()[:16]
+        self._encoding_cache = EncodingCache(self._encoding_cache_dir, fingerprint)
 
     def extract(self, text: str) -> tuple[list[Citation], list[CitationRelation]]:
         """Extract citations from a single document."""
@@ -182,106 +349,574 @@ class TransformerExtractor:
         self,
         texts: list[str],
         batch_size: int = 8,
+        word_offsets: list[list[tuple[int, int, str]]] | None = None,
     ) -> list[tuple[list[Citation], list[CitationRelation]]]:
         """Extract citations from a batch of documents.
 
-        More efficient than calling ``extract`` in a loop, especially on
-        GPU/MPS.  Each document is still tokenized/windowed independently
-        to handle long texts.
+        The overflow windows of all documents are pooled, sorted by
+        length and run through the model ``batch_size`` windows at a
+        time, each batch padded only to its longest window.  Predictions
+        are scattered back to per-document word labels, so results are
+        the same as calling ``extract`` per document.
+
+        ``word_offsets`` optionally supplies pre-tokenized documents as
+        ``(start, end, word)`` triples per text (the format of
+        ``_whitespace_tokenize`` and ``refex.engines.crf.tokenize``).
         """
         self._load()
-        results: list[tuple[list[Citation], list[CitationRelation]]] = []
-
-        for start in range(0, len(texts), batch_size):
-            batch = texts[start : start + batch_size]
-            batch_results = [(self._extract_single(t), []) for t in batch]
-            results.extend(batch_results)
 
-        return results
+        if word_offsets is None:
+            word_offsets = [None] * len(texts)
+        elif len(word_offsets) != len(texts):
+            msg = f"word_offsets has {len(word_offsets)} entries for {len(texts)} texts"
+            raise ValueError(msg)
 
-    def _extract_single(self, text: str) -> list[Citation]:
-        """Run inference on one document and return citations."""
-        self._load()
+        encoded = [self._encode_document(t, o) for t, o in zip(texts, word_offsets, strict=True)]
+        word_offsets = [offsets for offsets, _ in encoded]
+        windows: list[tuple[list[int], list[int | None]]] = []
+        owners: list[int] = []
+        for doc_idx, (_, doc_windows) in enumerate(encoded):
+            windows.extend(doc_windows)
+            owners.extend([doc_idx] * len(doc_windows))
 
-        if not text.strip():
-            return []
+        logits = self._forward_windows([ids for ids, _ in windows], batch_size)
 
-        # Whitespace-tokenize to get character offsets
-        word_offsets = _whitespace_tokenize(text)
-        if not word_offsets:
-            return []
-        words = [w[2] for w in word_offsets]
+        per_doc: list[list[tuple[list[int | None], Any]]] = [[] for _ in texts]
+        for (_, word_ids), doc_logits, doc_idx in zip(windows, logits, owners, strict=True):
+            per_doc[doc_idx].append((word_ids, doc_logits))
 
-        # Predict BIO labels per word (handling long inputs via windowing)
-        word_labels = self._predict_word_labels(words, text, word_offsets)
+        results: list[tuple[list[Citation], list[CitationRelation]]] = []
+        for text, offsets, doc_windows in zip(texts, word_offsets, per_doc, strict=True):
+            if not offsets:
+                results.append(([], []))
+                continue
+            word_labels = self._windows_to_word_labels(len(offsets), doc_windows)
+            spans = _word_labels_to_spans(word_labels, offsets, text, self._label_mapping)
+            results.append((_spans_to_citations(spans), []))
+        return results
 
-        # Convert to spans → citations
-        spans = _word_labels_to_spans(word_labels, word_offsets, text, self._label_mapping)
-        return _spans_to_citations(spans)
+    def _extract_single(self, text: str) -> list[Citation]:
+        """Run inference on one document and return citations."""
+        return self.extract_batch([text], batch_size=1)[0][0]
 
     def _predict_word_labels(
         self,
         words: list[str],
-        text: str,  # noqa: ARG002
-        word_offsets: list[tuple[int, int, str]],  # noqa: ARG002
+        text: str,
+        word_offsets: list[tuple[int, int, str]],
     ) -> list[str]:
-        """Predict a BIO label per whitespace-word.
+        """Predict a BIO label per whitespace-word of one document."""
+        self._load()
+        windows = self._encode_windows(words, text, word_offsets)
+        logits = self._forward_windows([ids for ids, _ in windows], batch_size=len(windows))
+        return self._windows_to_word_labels(len(words), [(w, lg) for (_, w), lg in zip(windows, logits)])
 
-        Uses the tokenizer's fast-tokenizer word-ids feature to align
-        sub-word predictions back to whitespace words.  For inputs longer
-        than ``max_length``, processes in overlapping windows and
-        resolves overlaps by keeping the earlier window's predictions for
-        tokens in the overlap region (simple strategy; can be refined).
+    def _encode_document(
+        self,
+        text: str,
+        word_offsets: list[tuple[int, int, str]] | None = None,
+    ) -> tuple[list[tuple[int, int, str]], list[tuple[list[int], list[int | None]]]]:
+        """Word offsets and token windows of one document (cached when enabled)."""
+        if word_offsets is None:
+            word_offsets = _whitespace_tokenize(text) if text.strip() else []
+        cache = self._encoding_cache
+        if cache is not None:
+            hit = cache.get(text, word_offsets)
+            if hit is not None:
+                return hit
+
+        windows = self._encode_windows([w[2] for w in word_offsets], text, word_offsets) if word_offsets else []
+        if cache is not None:
+            cache.put(text, word_offsets, (word_offsets, windows))
+        return word_offsets, windows
+
+    def _encode_windows(
+        self,
+        words: list[str],
+        text: str,
+        word_offsets: list[tuple[int, int, str]],
+    ) -> list[tuple[list[int], list[int | None]]]:
+        if self._window_strategy == "adaptive":
+            return self._encode_adaptive(words, text, word_offsets)
+        return self._encode_words(words)
+
+    def _encode_adaptive(
+        self,
+        words: list[str],
+        text: str,
+        word_offsets: list[tuple[int, int, str]],
+    ) -> list[tuple[list[int], list[int | None]]]:
+        """Encode the whole document once and cut it with ``schedule_windows``."""
+        if self._backend == "onnx":
+            enc = self._full_tokenizer.encode(words, is_pretokenized=True, add_special_tokens=False)
+            ids, word_ids = enc.ids, enc.word_ids
+        else:
+            enc = self._tokenizer(words, is_split_into_words=True, add_special_tokens=False)
+            ids, word_ids = enc["input_ids"], enc.word_ids()
+
+        prefix, suffix = self._special_token_template()
+        budget = max(1, self._max_length - len(prefix) - len(suffix))
+        word_starts = []
+        previous = None
+        for tok_idx, word_id in enumerate(word_ids):
+            if word_id is not None and word_id != previous:
+                word_starts.append(tok_idx)
+            previous = word_id
+        breaks = _break_ranks(text, word_offsets) if len(word_offsets) == len(word_starts) else None
+
+        padding = [None] * len(prefix), [None] * len(suffix)
+        return [
+            (prefix + ids[a:b] + suffix, padding[0] + word_ids[a:b] + padding[1])
+            for a, b in schedule_windows(len(ids), word_starts, breaks, budget, overlap=max(0, self._stride // 4))
+        ]
+
+    def _special_token_template(self) -> tuple[list[int], list[int]]:
+        """Special token ids the tokenizer adds before and after a sequence."""
+        if self._special_tokens is None:
+            if self._backend == "onnx":
+                enc = self._full_tokenizer.encode(["x"], is_pretokenized=True)
+                ids, word_ids = enc.ids, enc.word_ids
+            else:
+                enc = self._tokenizer(["x"], is_split_into_words=True)
+                ids, word_ids = enc["input_ids"], enc.word_ids()
+            first = word_ids.index(0)
+            last = len(word_ids) - 1 - word_ids[::-1].index(0)
+            self._special_tokens = (list(ids[:first]), list(ids[last + 1 :]))
+        return self._special_tokens
+
+    def _encode_words(self, words: list[str]) -> list[tuple[list[int], list[int | None]]]:
+        """Tokenize a word list into overlapping windows.
+
+        Returns ``(input_ids, word_ids)`` per window, unpadded.  Inputs
+        longer than ``max_length`` overflow into windows overlapping by
+        ``stride`` tokens.
         """
-        import torch
-
-        tokenizer = self._tokenizer
+        if self._backend == "onnx":
+            # ``tokenizers`` produces the same overflow windows as the
+            # transformers fast tokenizer, without importing torch.
+            enc = self._tokenizer.encode(words, is_pretokenized=True)
+            return [(e.ids, e.word_ids) for e in (enc, *enc.overflowing)]
 
-        enc = tokenizer(
+        enc = self._tokenizer(
             words,
             is_split_into_words=True,
-            return_tensors="pt",
             truncation=True,
             max_length=self._max_length,
             stride=self._stride,
             return_overflowing_tokens=True,
-            padding="longest",
         )
+        return [(ids, enc.word_ids(batch_index=w)) for w, ids in enumerate(enc["input_ids"])]
 
-        num_windows = enc["input_ids"].shape[0]
-        word_labels: list[str | None] = [None] * len(words)
+    def _forward_windows(self, windows: list[list[int]], batch_size: int) -> list[Any]:
+        """Token logits for each window, in input order.
 
-        with torch.no_grad():
-            for w in range(num_windows):
-                input_ids = enc["input_ids"][w : w + 1].to(self._device)
-                attention_mask = enc["attention_mask"][w : w + 1].to(self._device)
-                logits = self._model(input_ids=input_ids, attention_mask=attention_mask).logits
-                pred_ids = logits.argmax(dim=-1)[0].cpu().tolist()
+        Windows are bucketed by length (sorted, then chunked) and each
+        chunk is padded to its own longest window, so short windows do
+        not pay for long ones.  Returns one ``(len(window), num_labels)``
+        numpy array per window.
+        """
+        import numpy as np
+
+        pad_id = self._pad_id
+        order = sorted(range(len(windows)), key=lambda i: len(windows[i]))
+        out: list[Any] = [None] * len(windows)
+        step = max(1, batch_size)
+
+        for start in range(0, len(order), step):
+            chunk = order[start : start + step]
+            width = len(windows[chunk[-1]])
+            input_ids = np.full((len(chunk), width), pad_id, dtype=np.int64)
+            attention_mask = np.zeros((len(chunk), width), dtype=np.int64)
+            for row, i in enumerate(chunk):
+                n = len(windows[i])
+                input_ids[row, :n] = windows[i]
+                attention_mask[row, :n] = 1
+            logits = self._run_model(input_ids, attention_mask)
+            for row, i in enumerate(chunk):
+                out[i] = logits[row, : len(windows[i])]
+        return out
+
+    def _run_model(self, input_ids: Any, attention_mask: Any) -> Any:
+        """Run one padded batch (int64 numpy arrays); returns float32 numpy logits."""
+        if self._backend == "onnx":
+            return self._model.run(["logits"], {"input_ids": input_ids, "attention_mask": attention_mask})[0]
 
-                word_ids = enc.word_ids(batch_index=w)
+        import torch
+
+        with torch.inference_mode():
+            logits = self._model(
+                input_ids=torch.from_numpy(input_ids).to(self._device),
+                attention_mask=torch.from_numpy(attention_mask).to(self._device),
+            ).logits
+        return logits.float().cpu().numpy()
+
+    def _windows_to_word_labels(self, n_words: int, windows: list[tuple[list[int | None], Any]]) -> list[str]:
+        """Aggregate sub-word logits of a document's windows to word labels.
 
-                # Aggregate sub-word predictions to word labels
-                # Strategy "first": use the first sub-word's label for each word
-                seen_words: set[int] = set()
-                for tok_idx, word_id in enumerate(word_ids):
-                    if word_id is None:
+        Uses the first sub-word of each word.  Where windows overlap, the
+        label comes from the window chosen by ``overlap_merge``.
+        """
+        word_labels: list[str | None] = [None] * n_words
+        id2label = self._id2label
+        merge = self._overlap_merge
+        best = [float("-inf")] * n_words
+
+        for word_ids, logits in windows:
+            pred_ids = logits.argmax(axis=-1).tolist()
+            if merge == "max_logit":
+                import numpy as np
+
+                # softmax probability of the predicted label
+                probs = 1.0 / np.exp(logits - logits.max(axis=-1, keepdims=True)).sum(axis=-1)
+            width = len(word_ids)
+            previous = None
+            for tok_idx, word_id in enumerate(word_ids):
+                if word_id is None or word_id == previous:
+                    continue
+                previous = word_id
+                if merge == "first":
+                    if word_labels[word_id] is not None:  # don't overwrite earlier window
                         continue
-                    if word_id in seen_words:
+                else:
+                    score = min(tok_idx, width - 1 - tok_idx) if merge == "center" else float(probs[tok_idx])
+                    if score <= best[word_id]:
                         continue
-                    seen_words.add(word_id)
-                    if word_labels[word_id] is None:  # don't overwrite earlier window
-                        label = self._id2label.get(pred_ids[tok_idx], "O")
-                        word_labels[word_id] = label
+                    best[word_id] = score
+                word_labels[word_id] = id2label.get(pred_ids[tok_idx], "O")
 
         # Fill any gaps (shouldn't happen with correct windowing)
         return [lbl if lbl is not None else "O" for lbl in word_labels]
 
 
+# Abbreviations that end in a dot but do not end a sentence
+_ABBREVIATION_RE = re.compile(r"^(?:\w{1,4}\.|(?:\w{1,3}\.){2,})$")
+
+
+def _break_ranks(text: str, word_offsets: list[tuple[int, int, str]]) -> list[int]:
+    """Break strength before each word: 2 paragraph, 1 sentence, 0 none.
+
+    A paragraph break is a blank line between two words; a sentence
+    break follows a word ending in ``.``, ``!`` or ``?`` that is not a
+    short abbreviation (``Abs.``, ``vgl.``, ``i.V.m.``).
+    """
+    ranks = [0] * len(word_offsets)
+    for i in range(1, len(word_offsets)):
+        prev_end, (start, _, _) = word_offsets[i - 1][1], word_offsets[i]
+        prev_word = word_offsets[i - 1][2]
+        if text.count("\n", prev_end, start) >= 2:
+            ranks[i] = 2
+        elif prev_word[-1] in ".!?" and not _ABBREVIATION_RE.match(prev_word):
+            ranks[i] = 1
+    return ranks
+
+
+def schedule_windows(
+    n_tokens: int,
+    word_starts: list[int],
+    break_ranks: list[int] | None,
+    budget: int,
+    overlap: int = 32,
+) -> list[tuple[int, int]]:
+    """Cut ``n_tokens`` into ``[start, end)`` token windows of at most ``budget``.
+
+    Windows start and end on word boundaries (``word_starts``).  Each
+    window is filled to at least three quarters of the budget and ends
+    at the strongest break (``break_ranks``, per word; paragraph >
+    sentence > word) in its last quarter, preferring the latest.  The next window
+    starts up to ``overlap`` tokens earlier, at the strongest break in
+    that range, so words at a cut get left context.
+    """
+    import bisect
+
+    if n_tokens <= budget:
+        return [(0, n_tokens)] if n_tokens else []
+
+    ranks = break_ranks or [0] * len(word_starts)
+    windows: list[tuple[int, int]] = []
+    start = 0
+    while True:
+        limit = start + budget
+        if limit >= n_tokens:
+            windows.append((start, n_tokens))
+            return windows
+
+        lo = bisect.bisect_right(word_starts, limit - budget // 4)
+        hi = bisect.bisect_right(word_starts, limit)
+        if lo < hi:
+            end_word = max(range(lo, hi), key=lambda w: (ranks[w], w))
+            end = word_starts[end_word]
+        else:  # a single word longer than a quarter of the budget
+            end = limit
+        windows.append((start, end))
+
+        lo = bisect.bisect_left(word_starts, end - overlap)
+        hi = bisect.bisect_left(word_starts, end)
+        if overlap > 0 and lo < hi:
+            next_word = max(range(lo, hi), key=lambda w: (ranks[w], -w))
+            next_start = word_starts[next_word]
+        else:
+            next_start = end
+        start = next_start if next_start > start else end
+
+
+def export_onnx(
+    model: str | Path,
+    output_dir: str | Path,
+    quantize: bool = False,
+    opset: int = 17,
+    trust_remote_code: bool = True,
+) -> Path:
+    """Export a token-classification model to ONNX for the ``onnx`` backend.
+
+    Writes ``model.onnx`` (and ``model.int8.onnx`` with ``quantize=True``,
+    dynamic int8 weight quantization) plus the tokenizer and config into
+    ``output_dir``.  Requires torch, transformers, onnx and onnxruntime.
+
+    Returns the path of the exported (quantized, if requested) model.
+    """
+    import torch
+    from transformers import AutoModelForTokenClassification, AutoTokenizer
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(str(model), use_fast=True, trust_remote_code=trust_remote_code)
+    hf_model = AutoModelForTokenClassification.from_pretrained(str(model), trust_remote_code=trust_remote_code)
+    hf_model.eval()
+    tokenizer.save_pretrained(output_dir)
+    hf_model.config.save_pretrained(output_dir)
+
+    dummy = tokenizer(["§ 433 BGB", "BGH VIII ZR 295/01"], padding=True, return_tensors="pt")
+    onnx_path = output_dir / ONNX_FILE
+    axes = {0: "batch", 1: "sequence"}
+    torch.onnx.export(
+        hf_model,
+        (dummy["input_ids"], dummy["attention_mask"]),
+        str(onnx_path),
+        input_names=["input_ids", "attention_mask"],
+        output_names=["logits"],
+        dynamic_axes={"input_ids": axes, "attention_mask": axes, "logits": axes},
+        opset_version=opset,
+        dynamo=False,
+    )
+    logger.info("Exported ONNX model to %s", onnx_path)
+
+    if not quantize:
+        return onnx_path
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    int8_path = output_dir / ONNX_INT8_FILE
+    quantize_dynamic(str(onnx_path), str(int8_path), weight_type=QuantType.QInt8)
+    logger.info("Quantized ONNX model written to %s", int8_path)
+    return int8_path
+
+
+class EncodingCache:
+    """On-disk cache of document encodings for one tokenizer configuration.
+
+    Entries hold ``(word_offsets, windows)`` and are keyed by the SHA-256
+    of the document text and its word offsets (caller-supplied or from
+    ``_whitespace_tokenize``) under a ``fingerprint`` directory derived from
+    the tokenizer state, ``max_length`` and ``stride`` — a different
+    tokenizer never sees another's entries, while new checkpoints or
+    label maps sharing a tokenizer reuse them.
+    """
+
+    def __init__(self, cache_dir: str | Path, fingerprint: str):
+        self.cache_dir = Path(cache_dir) / fingerprint
+        self.fingerprint = fingerprint
+
+    def path(self, text: str, word_offsets: list[tuple[int, int, str]]) -> Path:
+        h = hashlib.sha256(text.encode("utf-8"))
+        h.update(b"\0")
+        h.update(repr(word_offsets).encode("utf-8"))
+        digest = h.hexdigest()
+        return self.cache_dir / digest[:2] / f"{digest}.pkl"
+
+    def get(self, text: str, word_offsets: list[tuple[int, int, str]]) -> Any:
+        try:
+            with open(self.path(text, word_offsets), "rb") as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def put(self, text: str, word_offsets: list[tuple[int, int, str]], value: Any) -> None:
+        path = self.path(text, word_offsets)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+
+def partition_cores(replicas: int, cores: list[int] | None = None) -> list[list[int]]:
+    """Split ``cores`` into ``replicas`` contiguous, disjoint core sets.
+
+    ``cores`` defaults to the CPUs this process may run on.  With more
+    replicas than cores, replicas share single cores round-robin.
+    """
+    if replicas < 1:
+        msg = f"replicas must be >= 1, got {replicas}"
+        raise ValueError(msg)
+    if cores is None:
+        if hasattr(os, "sched_getaffinity"):
+            cores = sorted(os.sched_getaffinity(0))
+        else:
+            cores = list(range(os.cpu_count() or 1))
+    if replicas >= len(cores):
+        return [[cores[r % len(cores)]] for r in range(replicas)]
+    size, extra = divmod(len(cores), replicas)
+    core_sets, start = [], 0
+    for r in range(replicas):
+        end = start + size + (r < extra)
+        core_sets.append(list(cores[start:end]))
+        start = end
+    return core_sets
+
+
+class TransformerReplicaPool:
+    """Several ``TransformerExtractor`` replicas in pinned worker processes.
+
+    Each replica runs in its own process, restricted to one core set
+    (``os.sched_setaffinity`` where available) with
+    ``intra_op_threads`` equal to the set size and one inter-op thread,
+    so replicas neither compete for cores nor oversubscribe them.
+    Documents are grouped into chunks of ``batch_size`` (longest first)
+    and fed through a shared queue; idle replicas take the next chunk::
+
+        with TransformerReplicaPool(replicas=4, model="./onnx-model", backend="onnx") as pool:
+            results = pool.extract_batch(texts)
+
+    ``cores`` gives the core sets explicitly, e.g. to leave cores free
+    for regex workers on the same machine; by default the available
+    CPUs are split evenly (``partition_cores``).  Remaining keyword
+    arguments are passed to each ``TransformerExtractor``.
+    """
+
+    def __init__(
+        self,
+        replicas: int = 2,
+        cores: list[list[int]] | None = None,
+        batch_size: int = 8,
+        **extractor_kwargs: Any,
+    ):
+        self.core_sets = cores if cores is not None else partition_cores(replicas)
+        self.batch_size = batch_size
+        self.extractor_kwargs = extractor_kwargs
+        self._processes: list[Any] = []
+        self._tasks: Any = None
+        self._results: Any = None
+
+    def __enter__(self) -> TransformerReplicaPool:
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """Start the replicas and wait until every model is loaded."""
+        if self._processes:
+            return
+        import multiprocessing
+
+        # torch and onnxruntime are not fork-safe once initialised
+        ctx = multiprocessing.get_context("spawn")
+        self._tasks, self._results = ctx.Queue(), ctx.Queue()
+        for cores in self.core_sets:
+            process = ctx.Process(
+                target=_replica_main,
+                args=(cores, self.extractor_kwargs, self.batch_size, self._tasks, self._results),
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+        for _ in self._processes:
+            _, _, error = self._next_result()
+            if error:
+                self.close()
+                msg = f"Transformer replica failed to start:\n{error}"
+                raise RuntimeError(msg)
+
+    def close(self) -> None:
+        """Stop the replicas."""
+        for _ in self._processes:
+            self._tasks.put(None)
+        for process in self._processes:
+            process.join(timeout=30)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+
+    def _next_result(self) -> tuple:
+        """Next ``(indices, results, error)`` from the replicas.
+
+        Raises ``RuntimeError`` (after closing the pool) when nothing
+        arrives because a replica has died, e.g. killed for running out
+        of memory, instead of waiting forever for its chunk.
+        """
+        while True:
+            # Checked before waiting: anything a dead replica sent is already queued
+            dead = [(i, p) for i, p in enumerate(self._processes) if not p.is_alive()]
+            try:
+                return self._results.get(timeout=REPLICA_POLL_SECONDS)
+            except queue.Empty:
+                if dead:
+                    i, process = dead[0]
+                    self.close()
+                    msg = f"Transformer replica {i} (pid {process.pid}) died with exit code {process.exitcode}"
+                    raise RuntimeError(msg) from None
+
+    def extract_batch(self, texts: list[str]) -> list[tuple[list[Citation], list[CitationRelation]]]:
+        """Extract citations from ``texts`` on all replicas; results are in input order."""
+        self.start()
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+        chunks = [order[k : k + self.batch_size] for k in range(0, len(order), self.batch_size)]
+        for indices in chunks:
+            self._tasks.put((indices, [texts[i] for i in indices]))
+
+        results: list[Any] = [None] * len(texts)
+        errors = []
+        for _ in chunks:
+            indices, chunk_results, error = self._next_result()
+            if error:
+                errors.append(error)
+                continue
+            for i, result in zip(indices, chunk_results, strict=True):
+                results[i] = result
+        if errors:
+            msg = f"Transformer replica failed:\n{errors[0]}"
+            raise RuntimeError(msg)
+        return results
+
+
+def _replica_main(cores: list[int], extractor_kwargs: dict, batch_size: int, tasks: Any, results: Any) -> None:
+    """Worker loop of a ``TransformerReplicaPool`` replica."""
+    import traceback
+
+    try:
+        if cores and hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, cores)
+        kwargs = {"intra_op_threads": max(1, len(cores)), "inter_op_threads": 1, **extractor_kwargs}
+        extractor = TransformerExtractor(**kwargs)
+        extractor._load()
+    except Exception:
+        results.put((None, None, traceback.format_exc()))
+        return
+    results.put((None, None, None))
+
+    while (task := tasks.get()) is not None:
+        indices, texts = task
+        try:
+            results.put((indices, extractor.extract_batch(texts, batch_size=batch_size), None))
+        except Exception:
+            results.put((indices, None, traceback.format_exc()))
+
+
 def _whitespace_tokenize(text: str) -> list[tuple[int, int, str]]:
     """Whitespace-tokenize returning (start, end, word) triples."""
-    import re
-
-    return [(m.start(), m.end(), m.group()) for m in re.finditer(r"\S+", text)]
+    return [(m.start(), m.end(), m.group()) for m in _WORD_RE.finditer(text)]
 
 
 def _word_labels_to_spans(
@@ -330,36 +965,9 @@ def _spans_to_citations(
 ) -> list[Citation]:
     """Convert label-tagged spans to typed Citation objects.
 
-    Field parsing (book, number, court, file_number) reuses the CRF
-    parser for consistency.
+    Field parsing (book, number, court, file_number) is shared with the
+    CRF engine for consistency, see ``refex.engines.fields``.
     """
-    citations: list[Citation] = []
-
-    for start, end, span_text, label_type in spans:
-        span = Span(start=start, end=end, text=span_text)
-        cid = make_citation_id(span, "transformer")
-
-        if label_type == "LAW_REF":
-            book, number = _parse_law_fields(span_text)
-            citations.append(
-                LawCitation(
-                    span=span,
-                    id=cid,
-                    book=book,
-                    number=number,
-                    confidence=0.85,
-                )
-            )
-        elif label_type == "CASE_REF":
-            court, file_number = _parse_case_fields(span_text)
-            citations.append(
-                CaseCitation(
-                    span=span,
-                    id=cid,
-                    court=court,
-                    file_number=file_number,
-                    confidence=0.85,
-                )
-            )
+    from refex.engines.fields import spans_to_typed_citations
 
-    return citations
+    return spans_to_typed_citations(spans, "transformer", confidence=0.85)
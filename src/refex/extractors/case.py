@@ -1,7 +1,9 @@
 import importlib.resources
 import logging
 import re
+from time import perf_counter
 
+from refex.extractors.stats import PhaseStats
 from refex.models import Ref, RefMarker, RefType
 
 logger = logging.getLogger(__name__)
@@ -9,10 +11,14 @@ logger = logging.getLogger(__name__)
 
 class CaseRefExtractorMixin:
     court_context = None
+    # See ``DivideAndConquerLawRefExtractorMixin.marker_uuids``.
+    marker_uuids: bool = True
     _compiled_court_re: re.Pattern | None = None
     _compiled_file_number_re: re.Pattern | None = None
     _compiled_sg_re: re.Pattern | None = None
     _compiled_reporter_re: re.Pattern | None = None
+    # See ``DivideAndConquerLawRefExtractorMixin.phase_stats``.
+    phase_stats: PhaseStats | None = None
 
     # E7 — class-level frozenset of codes that the file-number regex
     # catches but which are never actual case references (currencies,
@@ -55,11 +61,11 @@ class CaseRefExtractorMixin:
 
         return text
 
-    def get_court_name_regex(self):
+    def get_court_names(self) -> list[str]:
         """
-        Regular expression for finding court names
+        Court name gazetteer: federal courts plus all court/state and court/city combinations
 
-        :return: regex
+        :return: list of court names
         """
         # NOTE: court lists derived from benchmark TRAIN split only.
         # Do NOT add entries based on test split analysis.
@@ -216,6 +222,16 @@ class CaseRefExtractorMixin:
             for s in cities:
                 options.append(c + " " + s)
                 options.append(s + " " + c)
+
+        return options
+
+    def get_court_name_regex(self):
+        """
+        Regular expression for finding court names
+
+        :return: regex
+        """
+        options = self.get_court_names()
         # logger.debug('Court regex: %s' % pattern)
 
         # E11: char-class `[\s.;,:)]` is equivalent to but cheaper than the
@@ -446,6 +462,12 @@ class CaseRefExtractorMixin:
         :return:
         """
 
+        stats = self.phase_stats
+        if stats is not None:
+            t_call = perf_counter()
+            court_seconds = 0.0
+            courts_found = 0
+
         refs = []
 
         for match in self._get_compiled_reporter_re().finditer(content):
@@ -456,7 +478,8 @@ class CaseRefExtractorMixin:
 
             ref_ids = [Ref(ref_type=RefType.CASE, court="", file_number=f"{reporter} {volume}, {page}")]
             marker = RefMarker(text=marker_text, start=match.start(0), end=match.end(0))
-            marker.set_uuid()
+            if self.marker_uuids:
+                marker.set_uuid()
             marker.set_references(ref_ids)
             refs.append(marker)
 
@@ -466,6 +489,9 @@ class CaseRefExtractorMixin:
         # attribute lookups.  Reporter markers are added in text order so
         # the list is naturally sorted on (start, end).
         reporter_spans = [(r.start, r.end) for r in refs]
+        if stats is not None:
+            t0 = perf_counter()
+            stats.record("case.reporter", t0 - t_call, matches=len(refs))
         for match in self._get_compiled_file_number_re().finditer(content):
             file_number = match.group(0)
             code = match.group("code")
@@ -479,15 +505,29 @@ class CaseRefExtractorMixin:
             if any(rs <= ms < re_ for rs, re_ in reporter_spans):
                 continue
 
-            court = self.infer_court(file_number, match, content) or self.search_court(match, content) or ""
+            if stats is None:
+                court = self.infer_court(file_number, match, content) or self.search_court(match, content) or ""
+            else:
+                t_court = perf_counter()
+                court = self.infer_court(file_number, match, content) or self.search_court(match, content) or ""
+                court_seconds += perf_counter() - t_court
+                courts_found += bool(court)
 
             ref_ids = [Ref(ref_type=RefType.CASE, court=court, file_number=file_number)]
             marker = RefMarker(text=file_number, start=match.start(0), end=match.end(0))
-            marker.set_uuid()
+            if self.marker_uuids:
+                marker.set_uuid()
             marker.set_references(ref_ids)
 
             refs.append(marker)
 
+        if stats is not None:
+            t1 = perf_counter()
+            n_file_numbers = len(refs) - len(reporter_spans)
+            stats.record("case.file_number", t1 - t0 - court_seconds, matches=n_file_numbers)
+            stats.record("case.court_search", court_seconds, matches=courts_found)
+            stats.record_call("case", t1 - t_call, len(content), matches=len(refs))
+
         return refs
 
     def get_codes(self) -> set[str]:
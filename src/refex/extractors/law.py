@@ -2,8 +2,11 @@ import importlib.resources
 import logging
 import os
 import re
+from functools import lru_cache
+from time import perf_counter
 
 from refex.errors import RefExError
+from refex.extractors.stats import PhaseStats
 from refex.models import Ref, RefMarker, RefType
 
 logger = logging.getLogger(__name__)
@@ -48,6 +51,43 @@ def _apply_mask_intervals(content: str, intervals: list[tuple[int, int]]) -> str
     return "".join(out)
 
 
+def _end_phase(stats: PhaseStats, phase: str, t0: float, content: str, intervals: list[tuple[int, int]]) -> str:
+    """Record ``phase`` (started at ``t0``) in ``stats`` and apply its masks, timed as ``law.mask``."""
+    t1 = perf_counter()
+    stats.record(phase, t1 - t0, matches=len(intervals))
+    content = _apply_mask_intervals(content, intervals)
+    stats.record("law.mask", perf_counter() - t1, masked_chars=sum(e - s for s, e in intervals))
+    return content
+
+
+@lru_cache(maxsize=1)
+def _read_book_codes_file() -> tuple[tuple[str, ...], dict[str, str]]:
+    """Parse ``law_book_codes.txt`` (cached: every extractor instance needs it)."""
+    data_files = importlib.resources.files("refex") / "data"
+    code_path = data_files / "law_book_codes.txt"
+    codes: list[str] = []
+    hints: dict[str, str] = {}
+    try:
+        with importlib.resources.as_file(code_path) as path:
+            with open(path) as f:
+                for raw in f:
+                    line = raw.rstrip("\n")
+                    if not line.strip():
+                        continue
+                    parts = line.split("\t", 1)
+                    code = parts[0].strip()
+                    if not code:
+                        continue
+                    codes.append(code)
+                    if len(parts) == 2:
+                        unit = parts[1].strip().lower()
+                        if unit in ("article", "paragraph"):
+                            hints[code.lower()] = unit
+    except FileNotFoundError:
+        logger.warning("law_book_codes.txt not found, using defaults only")
+    return tuple(codes), hints
+
+
 class DivideAndConquerLawRefExtractorMixin:
     """
     Extractor for law references (citations of legislation). Each law is identified by a section (§, consisting of
@@ -70,6 +110,10 @@ class DivideAndConquerLawRefExtractorMixin:
     law_book_context = None
     _compiled_patterns: dict | None = None
 
+    # Assign a random uuid to every RefMarker.  Only the legacy ``RefExtractor`` API exposes marker uuids; the typed
+    # engines turn this off to save one ``uuid.uuid4()`` per marker.
+    marker_uuids: bool = True
+
     # B6: default_law_book_codes as class constant (immutable reference list)
     default_law_book_codes = [
         "AsylG",
@@ -104,6 +148,9 @@ class DivideAndConquerLawRefExtractorMixin:
     # A/B measurement against the generic pattern.
     use_precise_book_regex: bool = True
 
+    # Per-phase timings, match counts and mask sizes (see ``refex.extractors.stats``); off when None.
+    phase_stats: PhaseStats | None = None
+
     def __init__(self):
         env_flag = os.environ.get("REFEX_PRECISE_BOOK_REGEX")
         if env_flag is not None:
@@ -141,30 +188,11 @@ class DivideAndConquerLawRefExtractorMixin:
         Returns ``(codes, unit_hints)``.  Each line is ``<code>`` or
         ``<code>\\t<unit>`` where ``<unit>`` is ``article`` or ``paragraph``.
         Lines without a tab are treated as unit-less (hint omitted).
+
+        The file is read once per process; callers get fresh copies.
         """
-        data_files = importlib.resources.files("refex") / "data"
-        code_path = data_files / "law_book_codes.txt"
-        codes: list[str] = []
-        hints: dict[str, str] = {}
-        try:
-            with importlib.resources.as_file(code_path) as path:
-                with open(path) as f:
-                    for raw in f:
-                        line = raw.rstrip("\n")
-                        if not line.strip():
-                            continue
-                        parts = line.split("\t", 1)
-                        code = parts[0].strip()
-                        if not code:
-                            continue
-                        codes.append(code)
-                        if len(parts) == 2:
-                            unit = parts[1].strip().lower()
-                            if unit in ("article", "paragraph"):
-                                hints[code.lower()] = unit
-        except FileNotFoundError:
-            logger.warning("law_book_codes.txt not found, using defaults only")
-        return codes, hints
+        codes, hints = _read_book_codes_file()
+        return list(codes), dict(hints)
 
     def get_unit_hint(self, book_code: str | None) -> str | None:
         """Return the authoritative default unit for ``book_code`` (E2).
@@ -203,7 +231,10 @@ class DivideAndConquerLawRefExtractorMixin:
         bp = self._book_ref_regex
         wd = self._default_word_delimiter
         bla = "(?=" + wd + ")"
-        ac = r"([0-9]{1,5}|\.|[a-z]|[IXV]{1,3}|Abs\.|Abs|Satz|Halbsatz|S\.|Nr|Nr\.|Alt|Alt\.|und|bis|,|;|\s)*"
+        # Atomic items: "12345" or "und" can otherwise be split many ways
+        # ("1" "2345", "u" "n" "d", …), which backtracks exponentially on a
+        # long run of qualifiers that is not followed by a book.
+        ac = r"(?>[0-9]{1,5}|\.|[a-z]|[IXV]{1,3}|Abs\.|Abs|Satz|Halbsatz|S\.|Nr|Nr\.|Alt|Alt\.|und|bis|,|;|\s)*"
         sp = r"(?P<sect>([0-9]+)(\s?[a-z]?))"
         art_sign = r"Art(?:ikel|\.?)"
         art_sect_space = r"\s"
@@ -283,8 +314,18 @@ class DivideAndConquerLawRefExtractorMixin:
         :return: List of reference markers
         """
 
+        stats = self.phase_stats
+        if stats is not None:
+            t_call = perf_counter()
+            n_chars = len(content)
+
         if self.law_book_context is not None:
-            return self.extract_law_ref_markers_with_context(content)
+            markers = self.extract_law_ref_markers_with_context(content)
+            if stats is not None:
+                seconds = perf_counter() - t_call
+                stats.record("law.context", seconds, matches=len(markers))
+                stats.record_call("law", seconds, n_chars, matches=len(markers))
+            return markers
 
         markers = []
 
@@ -306,7 +347,9 @@ class DivideAndConquerLawRefExtractorMixin:
         book_look_ahead = "(?=" + word_delimiter + ")"
         book_pattern = self._book_ref_regex
 
-        any_content = r"([0-9]{1,5}|\.|[a-z]|[IXV]{1,3}|Abs\.|Abs|Satz|Halbsatz|S\.|Nr|Nr\.|Alt|Alt\.|und|bis|,|;|\s)*"  # noqa: E501
+        any_content = (
+            r"(?>[0-9]{1,5}|\.|[a-z]|[IXV]{1,3}|Abs\.|Abs|Satz|Halbsatz|S\.|Nr|Nr\.|Alt|Alt\.|und|bis|,|;|\s)*"  # noqa: E501
+        )
 
         # Lazy-init pre-compiled patterns on first use
         if self._compiled_patterns is None:
@@ -342,6 +385,9 @@ class DivideAndConquerLawRefExtractorMixin:
                 + r"\s?(?P<sect>(([0-9]+)\s(?=bis|und)|([0-9]+)\s?[a-z]|([0-9]+)))"
             )
 
+        # Timed from here, so the lazy pattern compilation above only counts towards the whole call
+        if stats is not None:
+            t0 = perf_counter()
         multi_mask_iv: list[tuple[int, int]] = []
         for marker_match in multi_pattern.finditer(content):
             marker_text = marker_match.group(0)
@@ -387,7 +433,8 @@ class DivideAndConquerLawRefExtractorMixin:
                 refs.append(Ref.init_law(book=book, section=sect))
 
             marker = RefMarker(text=marker_text, start=marker_match.start(), end=marker_match.end())
-            marker.set_uuid()
+            if self.marker_uuids:
+                marker.set_uuid()
             marker.set_references(refs)
 
             if len(refs) > 0:
@@ -395,9 +442,13 @@ class DivideAndConquerLawRefExtractorMixin:
                 multi_mask_iv.append((marker.start, marker.end))
             else:
                 logger.warning("No references found in marker: %s ", marker_text)
-        content = _apply_mask_intervals(content, multi_mask_iv)
+        if stats is None:
+            content = _apply_mask_intervals(content, multi_mask_iv)
+        else:
+            content = _end_phase(stats, "law.multi", t0, content, multi_mask_iv)
 
         # Single refs — use pre-compiled patterns for plain text
+        single_phases = ("law.single_book", "law.single_abs_alt", "law.single_any_book", "law.single_ivm")
         if not is_html:
             single_patterns = [
                 self._compiled_patterns["single_book"],
@@ -442,7 +493,9 @@ class DivideAndConquerLawRefExtractorMixin:
 
         markers_waiting_for_book: list[RefMarker] = []
 
-        for pattern in single_patterns:
+        for phase, pattern in zip(single_phases, single_patterns):
+            if stats is not None:
+                t0 = perf_counter()
             single_mask_iv: list[tuple[int, int]] = []
             for marker_match in pattern.finditer(content):
                 marker_text = marker_match.group(0)
@@ -454,7 +507,8 @@ class DivideAndConquerLawRefExtractorMixin:
                 ref = Ref.init_law(section=marker_match.group("sect"), book=None)
 
                 marker = RefMarker(text=marker_text, start=marker_match.start(), end=marker_match.end())
-                marker.set_uuid()
+                if self.marker_uuids:
+                    marker.set_uuid()
 
                 if book is not None:
                     ref.book = book
@@ -475,12 +529,17 @@ class DivideAndConquerLawRefExtractorMixin:
                         markers_waiting_for_book.append(marker)
                     else:
                         raise RefExError("next_book and book are None")
-            content = _apply_mask_intervals(content, single_mask_iv)
+            if stats is None:
+                content = _apply_mask_intervals(content, single_mask_iv)
+            else:
+                content = _end_phase(stats, phase, t0, content, single_mask_iv)
 
         if len(markers_waiting_for_book) > 0:
             logger.warning("Marker could not be assign to book: %s", markers_waiting_for_book)
 
         # Full law name references: § 40 des Verwaltungsverfahrensgesetzes
+        if stats is not None:
+            t0 = perf_counter()
         if not is_html:
             full_name_pattern = self._compiled_patterns["full_name"]
         else:
@@ -508,15 +567,21 @@ class DivideAndConquerLawRefExtractorMixin:
             ref = Ref(ref_type=RefType.LAW, book=book, section=Ref.clean_section(sect))
 
             marker = RefMarker(text=marker_text, start=marker_match.start(), end=marker_match.end())
-            marker.set_uuid()
+            if self.marker_uuids:
+                marker.set_uuid()
             marker.set_references([ref])
 
             markers.append(marker)
             full_name_mask_iv.append((marker.start, marker.end))
-        content = _apply_mask_intervals(content, full_name_mask_iv)
+        if stats is None:
+            content = _apply_mask_intervals(content, full_name_mask_iv)
+        else:
+            content = _end_phase(stats, "law.full_name", t0, content, full_name_mask_iv)
 
         # Multi Art refs: "Art. 1, 2, 3 GG" — list of bare numbers separated by , ; und bis
         # Must contain at least one comma/und/bis separator to qualify as multi
+        if stats is not None:
+            t0 = perf_counter()
         if not is_html:
             art_multi_pattern = self._compiled_patterns["art_multi"]
         else:
@@ -547,13 +612,19 @@ class DivideAndConquerLawRefExtractorMixin:
 
             if refs:
                 marker = RefMarker(text=marker_text, start=marker_match.start(), end=marker_match.end())
-                marker.set_uuid()
+                if self.marker_uuids:
+                    marker.set_uuid()
                 marker.set_references(refs)
                 markers.append(marker)
                 art_multi_mask_iv.append((marker.start, marker.end))
-        content = _apply_mask_intervals(content, art_multi_mask_iv)
+        if stats is None:
+            content = _apply_mask_intervals(content, art_multi_mask_iv)
+        else:
+            content = _end_phase(stats, "law.art_multi", t0, content, art_multi_mask_iv)
 
         # Single Art ref: "Art. 12 Abs. 1 GG" or "Art 12 GG"
+        if stats is not None:
+            t0 = perf_counter()
         if not is_html:
             art_single_pattern = self._compiled_patterns["art_single"]
         else:
@@ -576,14 +647,19 @@ class DivideAndConquerLawRefExtractorMixin:
 
             ref = Ref.init_law(book=book, section=sect)
             marker = RefMarker(text=marker_text, start=marker_match.start(), end=marker_match.end())
-            marker.set_uuid()
+            if self.marker_uuids:
+                marker.set_uuid()
             marker.set_references([ref])
             markers.append(marker)
             art_single_mask_iv.append((marker.start, marker.end))
         # The art_single_mask_iv isn't consumed further in this method, but the
         # batched apply is kept for consistency with the earlier phases — and
         # cheap when no masks were queued.
-        content = _apply_mask_intervals(content, art_single_mask_iv)
+        if stats is None:
+            content = _apply_mask_intervals(content, art_single_mask_iv)
+        else:
+            content = _end_phase(stats, "law.art_single", t0, content, art_single_mask_iv)
+            stats.record_call("law", perf_counter() - t_call, n_chars, matches=len(markers))
 
         return markers
 
@@ -698,7 +774,8 @@ class DivideAndConquerLawRefExtractorMixin:
                     ref_ids.append(Ref(ref_type=RefType.LAW, book=books, section=sects))
 
                 ref = RefMarker(text=ref_text, start=ref_m.start(), end=ref_m.end())
-                ref.set_uuid()
+                if self.marker_uuids:
+                    ref.set_uuid()
                 ref.set_references(ref_ids)
                 markers.append(ref)
 
@@ -0,0 +1,131 @@
+"""Per-phase statistics for the regex extractors.
+
+``extract_law_ref_markers`` and ``extract_case_ref_markers`` run a fixed
+sequence of grammar phases (multi refs, single refs per pattern, full
+names, ``Art.`` refs, masking; reporters, file numbers, court search).
+When an extractor's ``phase_stats`` is set, each call adds the wall time,
+match count and masked characters of every phase to it, aggregated
+across documents.  It is ``None`` by default, and then the extractors
+only pay one ``is None`` check per phase::
+
+    extractor = RefExtractor()
+    stats = extractor.phase_stats = PhaseStats()
+    for text in texts:
+        extractor.extract(text)
+    print(stats.format())
+
+Phase names are ``"law"`` / ``"case"`` for a whole call and
+``"law.<phase>"`` / ``"case.<phase>"`` for its parts.  With a
+``law_book_context`` the law extractor runs the context patterns only,
+recorded as the single phase ``"law.context"``.
+"""
+
+from __future__ import annotations
+
+
+class PhaseCounter:
+    """Totals of one phase: calls, seconds, matches and masked characters."""
+
+    __slots__ = ("calls", "masked_chars", "matches", "seconds")
+
+    def __init__(self, calls: int = 0, seconds: float = 0.0, matches: int = 0, masked_chars: int = 0):
+        self.calls = calls
+        self.seconds = seconds
+        self.matches = matches
+        self.masked_chars = masked_chars
+
+    def __repr__(self) -> str:
+        return (
+            f"PhaseCounter(calls={self.calls}, seconds={self.seconds:.6f}, "
+            f"matches={self.matches}, masked_chars={self.masked_chars})"
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "seconds": self.seconds,
+            "matches": self.matches,
+            "masked_chars": self.masked_chars,
+        }
+
+
+class PhaseStats:
+    """Phase counters of one or more extractors, keyed by phase name.
+
+    Phases keep their first-recorded order, which is the order they run
+    in.  ``chars`` counts the input characters of the whole-call phases
+    (``"law"``, ``"case"``).
+    """
+
+    __slots__ = ("chars", "phases")
+
+    def __init__(self):
+        self.phases: dict[str, PhaseCounter] = {}
+        self.chars: dict[str, int] = {}
+
+    def record(self, phase: str, seconds: float, matches: int = 0, masked_chars: int = 0) -> None:
+        counter = self.phases.get(phase)
+        if counter is None:
+            counter = self.phases[phase] = PhaseCounter()
+        counter.calls += 1
+        counter.seconds += seconds
+        counter.matches += matches
+        counter.masked_chars += masked_chars
+
+    def record_call(self, phase: str, seconds: float, chars: int, matches: int = 0) -> None:
+        """Record a whole ``extract_*_ref_markers`` call over ``chars`` characters."""
+        self.record(phase, seconds, matches)
+        self.chars[phase] = self.chars.get(phase, 0) + chars
+
+    def merge(self, other: PhaseStats) -> None:
+        """Add ``other``'s counters (e.g. from another worker) to this one."""
+        for phase, c in other.phases.items():
+            counter = self.phases.get(phase)
+            if counter is None:
+                counter = self.phases[phase] = PhaseCounter()
+            counter.calls += c.calls
+            counter.seconds += c.seconds
+            counter.matches += c.matches
+            counter.masked_chars += c.masked_chars
+        for phase, n in other.chars.items():
+            self.chars[phase] = self.chars.get(phase, 0) + n
+
+    def reset(self) -> None:
+        self.phases.clear()
+        self.chars.clear()
+
+    def to_dict(self) -> dict:
+        return {
+            "phases": {phase: c.to_dict() for phase, c in self.phases.items()},
+            "chars": dict(self.chars),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> PhaseStats:
+        stats = cls()
+        for phase, c in data.get("phases", {}).items():
+            stats.phases[phase] = PhaseCounter(**c)
+        stats.chars.update(data.get("chars", {}))
+        return stats
+
+    def format(self) -> str:
+        """Table of phases, each part with its share of the enclosing call's time."""
+        lines = [
+            f"  {'phase':24s} {'calls':>8s} {'seconds':>10s} {'share':>7s} {'matches':>8s} {'masked':>10s}",
+        ]
+        for top in dict.fromkeys(phase.split(".", 1)[0] for phase in self.phases):
+            parent = self.phases.get(top)
+            if parent is not None:
+                line = self._format_row(top, parent, "")
+                if top in self.chars and parent.seconds > 0:
+                    line += f"  ({self.chars[top] / parent.seconds:,.0f} chars/s)"
+                lines.append(line)
+            for phase, c in self.phases.items():
+                if phase.startswith(top + "."):
+                    share = f"{100 * c.seconds / parent.seconds:6.1f}%" if parent and parent.seconds > 0 else ""
+                    lines.append(self._format_row("  " + phase[len(top) + 1 :], c, share))
+        return "\n".join(lines)
+
+    @staticmethod
+    def _format_row(name: str, c: PhaseCounter, share: str) -> str:
+        return f"  {name:24s} {c.calls:8d} {c.seconds:10.4f} {share:>7s} {c.matches:8d} {c.masked_chars:10d}"
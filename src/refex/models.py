@@ -15,7 +15,11 @@ class RefType(Enum):
 
 
 class BaseRef:
-    ref_type: RefType | None = None
+    # Slotted: the regex engines allocate one Ref per extracted citation, so
+    # dropping the per-instance ``__dict__`` matters on citation-dense text.
+    __slots__ = ("ref_type", "book", "section", "file_number", "ecli", "court", "date")
+
+    ref_type: RefType | None
 
     def __init__(
         self,
@@ -52,15 +56,19 @@ class BaseRef:
 
 
 class CaseRefMixin(BaseRef):
-    file_number: str = ""
-    ecli: str = ""
-    court: str = ""
-    date: str = ""
+    __slots__ = ()
+
+    file_number: str
+    ecli: str
+    court: str
+    date: str
 
 
 class LawRefMixin(BaseRef):
-    book: str = ""
-    section: str = ""
+    __slots__ = ()
+
+    book: str
+    section: str
 
     @staticmethod
     def init_law(book, section):
@@ -87,6 +95,8 @@ class Ref(LawRefMixin, CaseRefMixin, BaseRef):
 
     """
 
+    __slots__ = ()
+
     def __lt__(self, other):
         # Used by tests/conftest.py::assert_refs to sort ref lists before
         # comparison.  Only ``<`` is actually exercised.
@@ -139,25 +149,24 @@ class RefMarker:
     the text, list of references (can be law, case, ...). Implementations of abstract class (LawReferenceMarker, ...)
     have the corresponding source object (LawReferenceMarker: referenced_by = a law object).
 
-    """
+    The uuid is only generated on ``set_uuid()``; the typed engines skip it (see ``marker_uuids`` on the
+    extractor mixins).
 
-    text: str = ""  # Text of marker
-    uuid: str = ""
-    start: int = 0
-    end: int = 0
-    line: str = ""  # Line cannot be used with HTML content
+    """
 
-    # Set by django
-    referenced_by = None
-    referenced_by_type = None
+    __slots__ = ("text", "uuid", "start", "end", "line", "references", "referenced_by", "referenced_by_type")
 
     def __init__(self, text: str, start: int, end: int, line=""):
-        self.text = text
+        self.text = text  # Text of marker
         self.start = start
         self.end = end
-        self.line = line
+        self.line = line  # Line cannot be used with HTML content
+        self.uuid = ""
         # B1: instance-level list instead of mutable class default
         self.references: list[Ref] = []
+        # Set by django
+        self.referenced_by = None
+        self.referenced_by_type = None
 
     def replace_content_with_mask(self, content):
         mask = "_" * (self.end - self.start)
@@ -173,4 +182,5 @@ class RefMarker:
         return self.references
 
     def __repr__(self):
-        return f"<RefMarker({self.__dict__})>"
+        fields = {k: getattr(self, k) for k in ("text", "start", "end", "line", "references", "uuid")}
+        return f"<RefMarker({fields})>"
@@ -17,7 +17,7 @@ from refex.citations import (
     ExtractionResult,
 )
 from refex.document import Document, make_document
-from refex.engines.regex import RegexCaseExtractor, RegexLawExtractor
+from refex.engines import LazyEngine
 from refex.protocols import Extractor
 from refex.resolver import resolve_short_forms
 
@@ -34,15 +34,23 @@ class CitationExtractor:
         result = extractor.extract("Gemäß § 433 BGB ...")
         for cit in result.citations:
             print(cit.type, cit.span.text)
+
+    Engines may also be given by registry name (see ``refex.engines``);
+    named engines are imported and built on first use::
+
+        extractor = CitationExtractor(engines=["regex-law", "regex-case", "crf"])
     """
 
-    engines: list[Extractor] = field(
+    engines: list[Extractor | str] = field(
         default_factory=lambda: [
-            RegexLawExtractor(),
-            RegexCaseExtractor(),
+            LazyEngine("regex-law"),
+            LazyEngine("regex-case"),
         ]
     )
 
+    def __post_init__(self):
+        self.engines = [LazyEngine(e) if isinstance(e, str) else e for e in self.engines]
+
     def extract(self, content: str | Document, **kwargs) -> ExtractionResult:
         """Extract citations from text or a Document.
 
@@ -0,0 +1,111 @@
+"""Interned string vocabularies for law books and courts.
+
+A corpus run produces millions of citations whose ``book`` / ``court``
+values come from a few thousand distinct strings (``"bgb"``,
+``"BVerwG"``, …).  Without interning, every citation holds its own copy
+sliced out of the document text.  The engines route these values
+through a process-wide ``Vocabulary`` so equal values share one string
+object and have a stable integer id for compact storage and grouping
+(see ``CitationTable.from_citations(..., shared_vocab=True)``).
+
+The shared vocabularies are seeded from the bundled data —
+``law_book_codes.txt`` (lower-cased, as ``Ref.clean_book`` does) and the
+court gazetteer of ``CaseRefExtractorMixin`` — so ids of known values
+are the same in every process.  Values not in the seed are appended on
+first sight up to ``max_size``; beyond that they pass through uninterned.
+Their ids depend on the order values are first seen, so only the seeded
+ids are stable across processes.  Insertion is guarded by a lock, so
+threads sharing a vocabulary never get the same id for two values.
+
+The CRF and transformer engines guess book and court strings from
+predicted spans, so they only look values up (``canonical``): a garbled
+span must not take a permanent slot in a long-running process.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable
+from functools import lru_cache
+
+# Upper bound for the shared vocabularies.  The regex engines can still
+# emit unseen books (generic book pattern) and courts; the cap keeps a
+# long-running process from growing the vocabulary without bound.
+DEFAULT_MAX_SIZE = 100_000
+
+
+class Vocabulary:
+    """Append-only string ↔ id mapping.
+
+    ``intern(value)`` returns the canonical string object for ``value``
+    (``canonical(value)`` the same without adding it),
+    ``id_of(value)`` its integer id (``-1`` for empty or, once the
+    vocabulary is full, unseen values).  Ids are assigned in insertion
+    order and never change.
+    """
+
+    __slots__ = ("_index", "_lock", "values", "max_size")
+
+    def __init__(self, values: Iterable[str] = (), max_size: int | None = None):
+        self._index: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.values: list[str] = []
+        self.max_size = max_size
+        for value in values:
+            self.id_of(value)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __contains__(self, value: object) -> bool:
+        return value in self._index
+
+    def id_of(self, value: str | None) -> int:
+        """Return the id of ``value``, adding it when not yet present."""
+        if not value:
+            return -1
+        vid = self._index.get(value)
+        if vid is None:
+            with self._lock:
+                # Another thread may have added it since the unlocked lookup
+                vid = self._index.get(value)
+                if vid is None:
+                    if self.max_size is not None and len(self.values) >= self.max_size:
+                        return -1
+                    # Append before publishing the id, so ``values[vid]`` always exists
+                    self.values.append(value)
+                    vid = self._index[value] = len(self.values) - 1
+        return vid
+
+    def intern(self, value: str | None) -> str | None:
+        """Return the canonical instance of ``value`` (``value`` itself if new and full)."""
+        vid = self.id_of(value)
+        return self.values[vid] if vid >= 0 else value
+
+    def canonical(self, value: str | None) -> str | None:
+        """Return the canonical instance of ``value`` if present, else ``value``; never adds it."""
+        vid = self._index.get(value) if value else None
+        return self.values[vid] if vid is not None else value
+
+    def value(self, vid: int) -> str | None:
+        """Inverse of ``id_of`` (``None`` for ``-1``)."""
+        return self.values[vid] if vid >= 0 else None
+
+
+@lru_cache(maxsize=1)
+def get_book_vocabulary() -> Vocabulary:
+    """Process-wide book vocabulary seeded from ``law_book_codes.txt``."""
+    from refex.extractors.law import DivideAndConquerLawRefExtractorMixin
+
+    mixin = DivideAndConquerLawRefExtractorMixin
+    codes, _ = mixin._load_book_codes_from_file()
+    seed = [c.strip().lower() for c in (*mixin.default_law_book_codes, *codes)]
+    return Vocabulary(seed, max_size=DEFAULT_MAX_SIZE)
+
+
+@lru_cache(maxsize=1)
+def get_court_vocabulary() -> Vocabulary:
+    """Process-wide court vocabulary seeded from the court gazetteer."""
+    from refex.extractors.case import CaseRefExtractorMixin
+
+    return Vocabulary(CaseRefExtractorMixin().get_court_names(), max_size=DEFAULT_MAX_SIZE)
@@ -14,6 +14,18 @@ logging.basicConfig(level=logging.DEBUG, format="%(asctime)s - %(name)s - %(leve
 RESOURCE_DIR = Path(__file__).parent / "resources"
 
 
+@pytest.fixture(autouse=True, scope="session")
+def _bench_cache_dir(tmp_path_factory):
+    """Keep the benchmark gold cache out of the user's cache directory."""
+    previous = os.environ.get("BENCH_CACHE_DIR")
+    os.environ["BENCH_CACHE_DIR"] = str(tmp_path_factory.mktemp("bench-cache"))
+    yield
+    if previous is None:
+        del os.environ["BENCH_CACHE_DIR"]
+    else:
+        os.environ["BENCH_CACHE_DIR"] = previous
+
+
 @pytest.fixture()
 def extractor():
     e = RefExtractor()
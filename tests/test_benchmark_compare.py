@@ -0,0 +1,108 @@
+"""Tests for the baseline store and regression check (benchmarks.compare)."""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+
+import pytest
+from benchmarks.compare import (
+    compare_report,
+    format_comparison,
+    load_baseline,
+    machine_fingerprint,
+    mann_whitney_greater,
+    report_kind,
+    save_baseline,
+)
+
+
+def _perf_report(scale: float = 1.0, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    base = [0.2, 1.0, 5.0, 20.0]  # ms per document, very different lengths
+    passes = [[ms * scale * rng.uniform(0.95, 1.05) for ms in base] for _ in range(5)]
+    medians = [sorted(p[i] for p in passes)[2] for i in range(len(base))]
+    return {
+        "docs": len(base),
+        "doc_ids": [f"d{i}" for i in range(len(base))],
+        "engines": {
+            "regex-law": {
+                "warm": {
+                    "docs_per_second": 1000 * len(base) / sum(medians),
+                    "doc_latency_ms": medians,
+                    "pass_latency_ms": passes,
+                }
+            },
+            "crf": {"skipped": "FileNotFoundError: no model"},
+        },
+    }
+
+
+def _accuracy_report(f1: float) -> dict:
+    return {"engine": "regex", "span_exact": {"f1": f1}, "span_overlap": {"f1": f1 + 0.1}}
+
+
+def test_mann_whitney():
+    assert mann_whitney_greater([5, 6, 7, 8], [1, 2, 3, 4])[1] < 0.05
+    assert mann_whitney_greater([1, 2, 3, 4], [5, 6, 7, 8])[1] > 0.95
+    u, p = mann_whitney_greater([1, 1, 1], [1, 1, 1])
+    assert u == 4.5
+    assert p == 1.0
+
+
+def test_report_kind():
+    assert report_kind(_perf_report()) == "perf"
+    assert report_kind(_accuracy_report(0.8)) == "accuracy"
+    with pytest.raises(ValueError, match="Unrecognised"):
+        report_kind({})
+
+
+def test_save_and_load(tmp_path):
+    paths = save_baseline(_perf_report(), store=tmp_path, commit="abc123")
+    assert [p.name for p in paths] == ["abc123.json"]  # skipped engine not stored
+    record = load_baseline("regex-law", "perf", store=tmp_path)
+    assert record["commit"] == "abc123"
+    assert record["machine"] == machine_fingerprint()
+    assert load_baseline("regex-law", "perf", store=tmp_path, commit="abc") is not None
+    assert load_baseline("crf", "perf", store=tmp_path) is None
+
+
+def test_perf_regression_detected(tmp_path):
+    save_baseline(_perf_report(), store=tmp_path, commit="base")
+    same = compare_report(_perf_report(seed=1), store=tmp_path)
+    assert not same["regression"]
+    halved = compare_report(_perf_report(scale=2.0, seed=1), store=tmp_path)
+    assert halved["regression"]
+    assert halved["engines"]["regex-law"]["p_slower"] < 0.01
+
+
+def test_small_slowdown_below_threshold(tmp_path):
+    save_baseline(_perf_report(), store=tmp_path, commit="base")
+    result = compare_report(_perf_report(scale=1.05, seed=1), store=tmp_path, threshold=0.10)
+    assert not result["regression"]
+
+
+def test_accuracy_regression(tmp_path):
+    save_baseline(_accuracy_report(0.80), store=tmp_path, commit="base")
+    assert not compare_report(_accuracy_report(0.798), store=tmp_path)["regression"]
+    assert compare_report(_accuracy_report(0.78), store=tmp_path)["regression"]
+
+
+def test_missing_baseline(tmp_path):
+    result = compare_report(_perf_report(), store=tmp_path)
+    assert result["engines"]["regex-law"]["baseline"] is None
+    assert result["missing_baseline"] == ["regex-law"]
+    assert not result["regression"]
+    assert f"No baseline for regex-law in {tmp_path}" in format_comparison(result)
+
+
+def test_latest_baseline_by_created_time_not_mtime(tmp_path):
+    (newer,) = save_baseline(_accuracy_report(0.80), store=tmp_path, commit="newer")
+    (older,) = save_baseline(_accuracy_report(0.70), store=tmp_path, commit="older")
+    record = json.loads(older.read_text(encoding="utf-8"))
+    record["created"] = "2020-01-01T00:00:00+0100"  # format of older records
+    older.write_text(json.dumps(record), encoding="utf-8")
+    # A checkout or cache restore makes the older record look newest on disk
+    os.utime(newer, (1, 1))
+    assert load_baseline("regex", "accuracy", store=tmp_path)["commit"] == "newer"
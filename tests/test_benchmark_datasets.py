@@ -0,0 +1,200 @@
+"""Tests for lazy benchmark dataset loading and the gold cache (benchmarks.datasets)."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+from benchmarks.datasets import (
+    AnnotationSet,
+    CachedAnnotations,
+    Document,
+    LazyAnnotations,
+    LazyDocuments,
+    load_dataset,
+)
+
+FIXTURES = Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures"
+
+
+def _read_jsonl(path: Path) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _write_split(tmp_path: Path, n: int) -> Path:
+    docs = [{"doc_id": f"d{i}", "text": f"Text {i} nach § {i} BGB."} for i in range(n)]
+    anns = [
+        {
+            "doc_id": f"d{i}",
+            "citations": [{"id": "c1", "type": "law", "kind": "full", "span": {"start": 12, "end": 20, "text": "x"}}],
+        }
+        for i in range(n)
+    ]
+    for name, rows in (("documents.jsonl", docs), ("annotations.jsonl", anns)):
+        (tmp_path / name).write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+    return tmp_path
+
+
+def test_fixtures_match_jsonl():
+    dataset = load_dataset(FIXTURES, cache=False)
+    assert isinstance(dataset.documents, LazyDocuments)
+    assert isinstance(dataset.annotations, LazyAnnotations)
+
+    docs = _read_jsonl(FIXTURES / "documents.jsonl")
+    anns = _read_jsonl(FIXTURES / "annotations.jsonl")
+    assert len(dataset) == len(docs)
+    assert dataset.doc_ids == [d["doc_id"] for d in docs]
+    assert [d.text for d in dataset.documents] == [d["text"] for d in docs]
+
+    first = dataset.annotations[anns[0]["doc_id"]]
+    assert isinstance(first, AnnotationSet)
+    assert [c.id for c in first.citations] == [c["id"] for c in anns[0]["citations"]]
+    assert len(dataset.annotations) == len({a["doc_id"] for a in anns})
+    assert [k for k, _ in dataset.annotations.items()] == list(dataset.annotations)
+
+
+def test_indexing_and_slices(tmp_path):
+    documents = load_dataset(_write_split(tmp_path, 10)).documents
+    assert isinstance(documents[3], Document)
+    assert documents[3].doc_id == "d3"
+    assert documents[-1].doc_id == "d9"
+    assert [d.doc_id for d in documents[2:4]] == ["d2", "d3"]
+    assert [d.doc_id for d in documents[::4]] == ["d0", "d4", "d8"]
+    assert len(documents[:None]) == 10
+    assert documents[5:2] == []
+    assert [d.doc_id for d in documents[8:]] == ["d8", "d9"]
+    with pytest.raises(IndexError):
+        documents[10]
+
+
+def test_limit_reads_only_a_prefix(tmp_path):
+    dataset = load_dataset(_write_split(tmp_path, 1000), cache=False)
+    first = dataset.documents[:5]
+    assert [d.doc_id for d in first] == [f"d{i}" for i in range(5)]
+    assert dataset.annotations.get("d4").doc_id == "d4"
+    # Only the lines up to the requested rows were indexed (an annotation
+    # lookup indexes its whole file, see test_duplicate_doc_id_last_row_wins)
+    assert len(dataset.documents._rows._offsets) == 5
+
+
+def test_annotation_lookups(tmp_path):
+    annotations = load_dataset(_write_split(tmp_path, 3)).annotations
+    assert "d2" in annotations
+    assert "missing" not in annotations
+    assert annotations.get("missing") is None
+    with pytest.raises(KeyError):
+        annotations["missing"]
+    assert annotations["d1"].citations[0].span.start == 12
+
+
+@pytest.mark.parametrize("cache", [False, True])
+def test_duplicate_doc_id_last_row_wins(tmp_path, cache):
+    split = _write_split(tmp_path, 3)
+    anns = _read_jsonl(split / "annotations.jsonl")
+    anns.append({**anns[1], "citations": []})
+    (split / "annotations.jsonl").write_text("".join(json.dumps(a) + "\n" for a in anns), encoding="utf-8")
+
+    annotations = load_dataset(split, cache=cache).annotations
+    assert annotations["d1"].citations == []
+    assert list(annotations) == ["d0", "d1", "d2"]
+    assert dict(annotations.items())["d1"].citations == []
+
+
+def test_annotation_items_view(tmp_path):
+    annotations = load_dataset(_write_split(tmp_path, 3), cache=False).annotations
+    items = annotations.items()
+    assert len(items) == 3
+    assert ("d1", annotations["d1"]) in items
+    assert list(items) == list(items)
+    assert [k for k, _ in items] == ["d0", "d1", "d2"]
+
+
+def test_doc_id_not_first_and_blank_lines(tmp_path):
+    lines = ['{"text": "a", "doc_id": "x"}', "", '{"doc_id": "y\\u00e9", "text": "b"}', ""]
+    (tmp_path / "documents.jsonl").write_text("\n".join(lines), encoding="utf-8")
+    dataset = load_dataset(tmp_path)
+    assert dataset.doc_ids == ["x", "yé"]
+    assert [d.text for d in dataset.documents] == ["a", "b"]
+    assert len(dataset.annotations) == 0
+    assert dataset.annotations.get("x") is None
+
+
+def test_hf_dataset(tmp_path):
+    datasets = pytest.importorskip("datasets")
+    rows = {
+        "doc_id": ["a", "b"],
+        "text": ["§ 1 BGB", "§ 2 ZPO"],
+        "citations": [
+            json.dumps(
+                [{"id": "c1", "type": "law", "kind": "full", "span": {"start": 0, "end": 7, "text": "§ 1 BGB"}}]
+            ),
+            "[]",
+        ],
+        "relations": ["[]", "[]"],
+    }
+    datasets.DatasetDict({"test": datasets.Dataset.from_dict(rows)}).save_to_disk(str(tmp_path))
+
+    dataset = load_dataset(tmp_path, split="test")
+    assert dataset.doc_ids == ["a", "b"]
+    assert [d.text for d in dataset.documents] == rows["text"]
+    assert dataset.annotations["a"].citations[0].span.text == "§ 1 BGB"
+    assert dataset.annotations["b"].citations == []
+
+
+def test_gold_cache_matches_source(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("BENCH_CACHE_DIR", str(cache_dir))
+    anns = _read_jsonl(FIXTURES / "annotations.jsonl")
+    anns[0]["relations"] = [
+        {"source_id": "a", "target_id": "b", "relation": "ivm", "span": {"start": 1, "end": 3, "text": "iVm"}},
+        {"source_id": "b", "target_id": "c", "relation": "ivm"},
+    ]
+    (tmp_path / "annotations.jsonl").write_text("".join(json.dumps(a) + "\n" for a in anns), encoding="utf-8")
+    (tmp_path / "documents.jsonl").write_bytes((FIXTURES / "documents.jsonl").read_bytes())
+
+    built = load_dataset(tmp_path).annotations
+    assert isinstance(built, CachedAnnotations)
+    assert len(list(cache_dir.iterdir())) == 1
+    cached = load_dataset(tmp_path).annotations
+    assert cached.fingerprint == built.fingerprint
+
+    source = load_dataset(tmp_path, cache=False).annotations
+    assert list(cached) == list(source)
+    assert dict(cached.items()) == dict(source.items())
+    assert any(c.structure for ann in cached.values() for c in ann.citations)
+    assert "missing" not in cached
+    assert cached.get("missing") is None
+
+
+def test_gold_cache_follows_source_changes(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("BENCH_CACHE_DIR", str(cache_dir))
+    split = _write_split(tmp_path, 3)
+    first = load_dataset(split).annotations
+    assert first["d1"].citations[0].span.start == 12
+
+    anns_file = split / "annotations.jsonl"
+    anns_file.write_text(anns_file.read_text(encoding="utf-8").replace('"start": 12', '"start": 13'), encoding="utf-8")
+    stat = anns_file.stat()
+    os.utime(anns_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    changed = load_dataset(split).annotations
+    assert changed.fingerprint != first.fingerprint
+    assert changed["d1"].citations[0].span.start == 13
+
+
+def test_gold_cache_rebuilds_unreadable_file(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("BENCH_CACHE_DIR", str(cache_dir))
+    split = _write_split(tmp_path, 3)
+    load_dataset(split)
+    (path,) = cache_dir.iterdir()
+    path.write_bytes(b"not a pickle")
+    assert load_dataset(split).annotations["d2"].doc_id == "d2"
+
+
+def test_gold_cache_off(tmp_path, monkeypatch):
+    monkeypatch.setenv("BENCH_CACHE_DIR", "off")
+    assert isinstance(load_dataset(_write_split(tmp_path, 3)).annotations, LazyAnnotations)
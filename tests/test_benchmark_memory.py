@@ -0,0 +1,98 @@
+"""Tests for the memory profile of the benchmarks (benchmarks.memory)."""
+
+from __future__ import annotations
+
+import tracemalloc
+from pathlib import Path
+
+import pytest
+from benchmarks.datasets import load_dataset
+from benchmarks.memory import MemoryProfile, format_memory, rss_high_water_mb
+from benchmarks.perf import run_perf
+from benchmarks.run import format_summary, run_benchmark
+
+FIXTURES = Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures"
+
+
+def _allocate(text: str) -> list:
+    chars = [(c, i) for i, c in enumerate(text)]
+    return chars[:1]
+
+
+def test_profile_buckets_peaks_by_length():
+    profile = MemoryProfile(_allocate)
+    try:
+        assert profile("abc") == [("a", 0)]
+        profile("x" * 3_000)
+        profile("y" * 9_000)
+        report = profile.report()
+    finally:
+        profile.stop()
+    assert not tracemalloc.is_tracing()
+
+    assert report["docs"] == 3
+    assert list(report["buckets"]) == ["<2k", "2k-10k"]
+    big = report["buckets"]["2k-10k"]
+    assert big["docs"] == 2
+    assert big["largest_peak_chars"] == 9_000
+    # One tuple per character is tens of bytes per character
+    assert big["bytes_per_char"] > 20
+    assert big["peak_kib_max"] >= big["peak_kib_mean"] > report["buckets"]["<2k"]["peak_kib_max"]
+    assert report["peak_kib_max"] == big["peak_kib_max"]
+
+
+def test_peak_sites_point_at_allocating_line():
+    profile = MemoryProfile(_allocate, top=3)
+    try:
+        profile("z" * 20_000)
+        sites = profile.report()["buckets"]["10k-25k"]["sites"]
+    finally:
+        profile.stop()
+    assert 0 < len(sites) <= 3
+    assert sites[0]["site"].endswith(f"test_benchmark_memory.py:{_allocate.__code__.co_firstlineno + 1}")
+    assert sites[0]["blocks"] >= 20_000
+
+
+def test_profile_keeps_running_tracemalloc():
+    tracemalloc.start()
+    try:
+        profile = MemoryProfile(_allocate)
+        profile("abc")
+        profile.stop()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_rss_high_water_and_format():
+    rss = rss_high_water_mb()
+    assert rss is None or rss > 0
+    profile = MemoryProfile(_allocate)
+    try:
+        profile("x" * 3_000)
+        lines = format_memory(profile.report())
+    finally:
+        profile.stop()
+    assert lines[0].startswith("  peak ")
+    assert "2k-10k" in lines[1]
+    assert "test_benchmark_memory.py:" in lines[2]
+
+
+def test_run_benchmark_memory():
+    result, timing = run_benchmark(FIXTURES, split="validation", limit=3, memory=True)
+    assert not tracemalloc.is_tracing()
+    assert timing["memory"]["docs"] == 3
+    assert "--- Memory (tracemalloc) ---" in format_summary(result, timing, "validation", FIXTURES)
+    with pytest.raises(ValueError, match="memory"):
+        run_benchmark(FIXTURES, split="validation", memory=True, workers=2)
+
+
+def test_perf_memory_on_documents_file():
+    path = FIXTURES / "html_documents.jsonl"
+    dataset = load_dataset(path)
+    assert len(dataset.documents) > 0
+    assert len(dataset.annotations) == 0
+
+    report = run_perf(["regex-law"], data_dir=path, limit=2, warmup=0, repeat=1, cold_runs=0, memory=True)
+    memory = report["engines"]["regex-law"]["memory"]
+    assert memory["docs"] == 2
@@ -1,9 +1,11 @@
-"""Tests for benchmark metrics — A2c (structure) and A2d (relation F1)."""
+"""Tests for benchmark metrics — A2c (structure), A2d (relation F1) and overlap matching."""
 
 from __future__ import annotations
 
+import random
+
 from benchmarks.datasets import Citation, Relation, Span
-from benchmarks.metrics import BenchmarkResult, score_document, score_relations
+from benchmarks.metrics import BenchmarkResult, greedy_overlap_pairs, score_document, score_relations
 
 
 def _cit(
@@ -152,3 +154,66 @@ def test_benchmarkresult_to_dict_includes_relations():
     assert d["relation_exact"]["tp"] == 5
     assert d["relation_exact"]["fn"] == 2
     assert d["relation_exact"]["gold"] == 7
+
+
+def _naive_overlap_pairs(pred, gold):
+    matched: set[int] = set()
+    pairs = []
+    for pi, (ps, pe) in enumerate(pred):
+        for gi, (gs, ge) in enumerate(gold):
+            if gi not in matched and ps < ge and gs < pe:
+                matched.add(gi)
+                pairs.append((pi, gi))
+                break
+    return pairs
+
+
+def test_overlap_pairs_take_first_unmatched_gold():
+    gold = [(0, 100), (10, 20), (30, 40)]
+    # The long gold span is taken first, the nested ones by later predictions
+    assert greedy_overlap_pairs([(12, 15), (12, 15), (35, 36)], gold) == [(0, 0), (1, 1), (2, 2)]
+    assert greedy_overlap_pairs([(100, 110)], gold) == []
+    assert greedy_overlap_pairs([(5, 5)], [(0, 10)]) == [(0, 0)]  # empty span inside
+    assert greedy_overlap_pairs([], gold) == []
+    assert greedy_overlap_pairs([(0, 1)], []) == []
+
+
+def test_overlap_pairs_match_naive_greedy():
+    rnd = random.Random(0)
+    for _ in range(500):
+        length = rnd.choice([50, 500])
+        spans = [
+            [(s, s + rnd.randrange(40)) for s in (rnd.randrange(length) for _ in range(rnd.randrange(25)))]
+            for _ in range(2)
+        ]
+        pred, gold = sorted(spans[0]), sorted(spans[1], key=lambda sp: sp[0])
+        assert greedy_overlap_pairs(pred, gold) == _naive_overlap_pairs(pred, gold)
+
+
+def test_overlap_field_scoring_respects_type():
+    gold = [_cit("g1", "case", 0, 20, court="BGH"), _cit("g2", "law", 5, 15, book="bgb")]
+    pred = [_cit("p1", "law", 0, 10, book="bgb")]
+    r = BenchmarkResult()
+    score_document(gold, pred, r)
+    # Span overlap ignores the type, the field pairs do not
+    assert r.span_overlap.tp == 1
+    assert r.span_by_type["law_overlap"].tp == 1
+    assert r.field_accuracy["book_overlap"].correct == 1
+    assert "court_overlap" not in r.field_accuracy
+
+
+def test_merge_per_document_results_equals_serial():
+    docs = [
+        ([_cit("g1", "law", 0, 10, book="bgb")], [_cit("p1", "law", 0, 10, book="zpo")]),
+        ([_cit("g2", "case", 5, 20, court="BGH")], [_cit("p2", "case", 8, 20, court="BGH")]),
+        ([], [_cit("p3", "law", 0, 4, structure={"absatz": "1"})]),
+    ]
+    serial = BenchmarkResult()
+    merged = BenchmarkResult()
+    for gold, pred in docs:
+        score_document(gold, pred, serial)
+        doc_result = BenchmarkResult()
+        score_document(gold, pred, doc_result)
+        merged.merge(doc_result)
+    assert merged.to_dict() == serial.to_dict()
+    assert list(merged.field_accuracy) == list(serial.field_accuracy)
@@ -0,0 +1,62 @@
+"""Tests for the throughput / latency benchmark (benchmarks.perf)."""
+
+from __future__ import annotations
+
+import math
+
+from benchmarks.perf import (
+    FIXTURES_DIR,
+    format_report,
+    length_bucket,
+    mean_ci,
+    measure_warm,
+    percentile,
+    run_perf,
+)
+
+
+def test_percentile_interpolates():
+    values = [1.0, 2.0, 3.0, 4.0]
+    assert percentile(values, 0) == 1.0
+    assert percentile(values, 50) == 2.5
+    assert percentile(values, 100) == 4.0
+    assert math.isnan(percentile([], 50))
+
+
+def test_mean_ci():
+    mean, half = mean_ci([10.0, 12.0, 14.0])
+    assert mean == 12.0
+    assert math.isclose(half, 4.303 * 2.0 / math.sqrt(3))
+    assert math.isnan(mean_ci([5.0])[1])
+
+
+def test_length_bucket():
+    assert length_bucket(0) == "<2k"
+    assert length_bucket(2_000) == "2k-10k"
+    assert length_bucket(24_999) == "10k-25k"
+    assert length_bucket(1_000_000) == ">=25k"
+
+
+def test_measure_warm_counts_passes():
+    calls = []
+    texts = ["a" * 10, "b" * 5_000]
+    warm = measure_warm(calls.append, texts, warmup=2, repeat=3)
+    assert len(calls) == 5 * len(texts)
+    assert warm["passes"] == 3
+    assert set(warm["buckets"]) == {"<2k", "2k-10k"}
+    assert len(warm["doc_latency_ms"]) == len(texts)
+
+
+def test_run_perf_on_fixtures():
+    report = run_perf(["regex-law"], data_dir=FIXTURES_DIR, limit=3, warmup=0, repeat=2, cold_runs=0)
+    entry = report["engines"]["regex-law"]
+    assert report["docs"] == 3
+    assert entry["warm"]["docs_per_second"] > 0
+    assert "cold" not in entry
+    assert "regex-law" in format_report(report)
+
+
+def test_unavailable_engine_is_skipped(tmp_path):
+    report = run_perf(["crf"], limit=1, repeat=1, cold_runs=0, crf_model=tmp_path / "missing.pkl")
+    assert "skipped" in report["engines"]["crf"]
+    assert "skipped" in format_report(report)
@@ -0,0 +1,59 @@
+"""Tests for the benchmark runner (benchmarks.run)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from benchmarks.run import _transformer_kwargs_from_env, run_benchmark
+
+FIXTURES = Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures"
+
+
+def test_workers_match_serial_run():
+    serial, serial_timing = run_benchmark(FIXTURES, split="validation")
+    parallel, timing = run_benchmark(FIXTURES, split="validation", workers=2, chunk_size=3)
+
+    assert parallel.to_dict() == serial.to_dict()
+    assert timing["docs_processed"] == serial_timing["docs_processed"]
+    rows = timing["workers"]
+    assert [row["worker"] for row in rows] == list(range(len(rows)))
+    assert sum(row["docs"] for row in rows) == timing["docs_processed"]
+    if serial_timing["rss_high_water_mb"] is not None:
+        # The workers' peaks count towards the run's memory
+        assert all(row["rss_high_water_mb"] > 0 for row in rows)
+        assert timing["rss_high_water_mb"] >= sum(row["rss_high_water_mb"] for row in rows)
+
+
+def test_workers_respect_limit():
+    serial, _ = run_benchmark(FIXTURES, split="validation", limit=4)
+    parallel, timing = run_benchmark(FIXTURES, split="validation", limit=4, workers=2, chunk_size=3)
+    assert parallel.total_docs == timing["docs_processed"] == 4
+    assert parallel.to_dict() == serial.to_dict()
+
+
+def test_workers_with_limit_read_only_leading_documents(monkeypatch):
+    import benchmarks.run as run_module
+
+    load_dataset = run_module.load_dataset
+    loaded = []
+    monkeypatch.setattr(
+        run_module, "load_dataset", lambda *a, **kw: loaded.append(load_dataset(*a, **kw)) or loaded[-1]
+    )
+    _, timing = run_benchmark(FIXTURES, split="validation", limit=4, workers=2, chunk_size=3)
+
+    # Only the chunks covering the first 4 documents were handed out ...
+    assert sum(row["docs"] + row["errors"] for row in timing["workers"]) == 4
+    # ... and the parent did not index the rest of the split
+    n_lines = sum(1 for line in (FIXTURES / "documents.jsonl").open() if line.strip())
+    assert len(loaded[0].documents._rows._offsets) < n_lines
+
+
+def test_workers_reject_profile():
+    with pytest.raises(ValueError, match="profile"):
+        run_benchmark(FIXTURES, split="validation", workers=2, profile=True)
+
+
+def test_transformer_threads_from_env(monkeypatch):
+    monkeypatch.setenv("REFEX_TRANSFORMER_THREADS", "4")
+    assert _transformer_kwargs_from_env()["intra_op_threads"] == 4
@@ -0,0 +1,86 @@
+"""Tests for the engine sweep and its Pareto frontier (benchmarks.sweep)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from benchmarks.sweep import cheapest_meeting, format_markdown, pareto_frontier, run_config, run_sweep
+
+FIXTURES = Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures"
+
+
+def _row(engine: str, f1: float, r: float, dps: float, rss: float | None) -> dict:
+    m = {"p": f1, "r": r, "f1": f1}
+    return {
+        "engine": engine,
+        "docs": 10,
+        "errors": 0,
+        "docs_per_second": dps,
+        "init_seconds": 0.1,
+        "rss_mb": rss,
+        "span_exact": m,
+        "span_overlap": m,
+    }
+
+
+ROWS = [
+    _row("regex", 0.70, 0.65, 100.0, 30.0),
+    _row("crf", 0.60, 0.60, 20.0, 40.0),  # dominated by regex
+    _row("regex+crf", 0.80, 0.85, 15.0, 45.0),
+    _row("transformer", 0.78, 0.90, 2.0, 900.0),  # dominated by regex+crf on F1, speed and RSS
+    _row("regex+transformer", 0.90, 0.95, 1.5, 950.0),
+]
+
+
+def test_pareto_frontier():
+    assert pareto_frontier(ROWS) == ["regex+transformer", "regex+crf", "regex"]
+    assert pareto_frontier([]) == []
+    # Equal on everything: neither dominates
+    assert pareto_frontier([_row("a", 0.5, 0.5, 1.0, 1.0), _row("b", 0.5, 0.5, 1.0, 1.0)]) == ["a", "b"]
+    # Unknown RSS counts as worst
+    assert pareto_frontier([_row("a", 0.5, 0.5, 1.0, None), _row("b", 0.5, 0.5, 1.0, 9.0)]) == ["b"]
+
+
+def test_cheapest_meeting_recall():
+    assert cheapest_meeting(ROWS, 0.6) == "regex"
+    assert cheapest_meeting(ROWS, 0.8) == "regex+crf"
+    assert cheapest_meeting(ROWS, 0.92) == "regex+transformer"
+    assert cheapest_meeting(ROWS, 0.99) is None
+
+
+def test_format_markdown():
+    rows = [dict(r, pareto=r["engine"] in pareto_frontier(ROWS)) for r in ROWS]
+    report = {
+        "split": "test",
+        "metric": "span_exact",
+        "configs": rows,
+        "skipped": {"x": "ImportError: no"},
+        "frontier": pareto_frontier(ROWS),
+        "min_recall": 0.8,
+        "recommended": "regex+crf",
+    }
+    lines = format_markdown(report).splitlines()
+    assert lines[2].startswith("| Engine | Pareto | F1 |")
+    assert lines[4].startswith("| `regex+transformer` | ✓ | 0.9000 |")
+    # Off the frontier, by F1
+    assert lines[7].startswith("| `transformer` |  | 0.7800 |")
+    assert lines[8].startswith("| `crf` |  | 0.6000 |")
+    assert "Skipped `x`: ImportError: no" in lines
+    assert lines[-1] == "Cheapest configuration with recall ≥ 0.8: `regex+crf`."
+
+
+def test_run_config_regex_on_fixtures():
+    row = run_config("regex", FIXTURES, split="validation", limit=2)
+    assert row["engine"] == "regex"
+    assert row["docs"] == 2
+    assert 0 < row["span_exact"]["f1"] <= row["span_overlap"]["f1"] <= 1
+    assert row["docs_per_second"] > 0
+    assert row["rss_mb"] is None or row["rss_mb"] > 0
+
+
+def test_run_sweep_reports_failures_as_skipped(tmp_path):
+    report = run_sweep(["regex"], data_dir=tmp_path, split="validation", min_recall=0.5)
+    assert report["configs"] == []
+    assert "regex" in report["skipped"]
+    assert report["frontier"] == []
+    assert report["recommended"] is None
@@ -0,0 +1,76 @@
+"""Tests for the synthetic scaling corpus (benchmarks.synthetic)."""
+
+from __future__ import annotations
+
+import math
+
+import pytest
+from benchmarks.synthetic import (
+    KINDS,
+    format_report,
+    generate_document,
+    loglog_slope,
+    run_scaling,
+    scaling_sizes,
+)
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def test_generate_document_is_deterministic(kind):
+    doc = generate_document(5_000, kind=kind)
+    assert len(doc) == 5_000
+    assert doc == generate_document(5_000, kind=kind)
+    assert doc != generate_document(5_000, kind=kind, seed=1)
+
+
+def test_structures():
+    assert "§§ " in generate_document(5_000, "section_lists")
+    assert "&#167;" in generate_document(5_000, "html")
+    assert generate_document(5_000, "html").startswith("<html>")
+    assert "Abs." in generate_document(5_000, "qualifier_runs")
+
+
+def test_density_controls_citations():
+    sparse = generate_document(50_000, density=0.5).count("§")
+    dense = generate_document(50_000, density=5.0).count("§")
+    assert dense > 3 * sparse
+
+
+def test_unknown_kind():
+    with pytest.raises(ValueError, match="Unknown kind"):
+        generate_document(100, kind="pdf")
+
+
+def test_scaling_sizes():
+    assert scaling_sizes(1_000, 64_000) == [1_000, 4_000, 16_000, 64_000]
+
+
+def test_loglog_slope():
+    sizes = [1_000, 4_000, 16_000]
+    assert math.isclose(loglog_slope(sizes, [n * 1e-6 for n in sizes]), 1.0)
+    assert math.isclose(loglog_slope(sizes, [(n * 1e-4) ** 2 for n in sizes]), 2.0)
+    assert math.isnan(loglog_slope([1_000], [0.1]))
+
+
+def test_run_scaling_regex_law():
+    report = run_scaling(["regex-law"], ["qualifier_runs"], [1_000, 4_000], repeat=1, max_slope=5.0)
+    (row,) = report["results"]
+    assert row["sizes"] == [1_000, 4_000]
+    assert not report["flagged"]
+    assert "qualifier_runs" in format_report(report)
+
+
+@pytest.mark.parametrize("engine", ["regex-law", "full"])
+def test_run_scaling_html_is_normalised(engine, monkeypatch):
+    import refex.document
+
+    sizes = []
+    original = refex.document._normalize_html_with_offsets
+
+    def spy(raw, profile=None):
+        sizes.append(len(raw))
+        return original(raw, profile)
+
+    monkeypatch.setattr(refex.document, "_normalize_html_with_offsets", spy)
+    run_scaling([engine], ["html"], [1_000, 4_000], repeat=1, max_slope=5.0)
+    assert sizes == [1_000, 4_000]
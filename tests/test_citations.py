@@ -1,12 +1,20 @@
 """Tests for the new typed citation models (Stream C)."""
 
+import hashlib
+
+import pytest
+
 from refex.citations import (
+    TYPE_CASE,
+    TYPE_LAW,
     CaseCitation,
     CitationRelation,
+    CitationTable,
     ExtractionResult,
     LawCitation,
     Span,
     make_citation_id,
+    make_citation_ids,
 )
 
 
@@ -131,3 +139,109 @@ def test_citation_id_is_12_hex_chars():
     cid = make_citation_id(s, "regex")
     assert len(cid) == 12
     assert all(c in "0123456789abcdef" for c in cid)
+
+
+@pytest.mark.parametrize("scheme", ["blake2b", "sha256"])
+def test_citation_ids_batch_matches_single(scheme):
+    spans = [Span(0, 9, "§ 433 BGB"), Span(20, 34, "VIII ZR 295/01")]
+    batch = make_citation_ids(spans, "regex", "doc1", scheme=scheme)
+    assert batch == [make_citation_id(s, "regex", "doc1", scheme=scheme) for s in spans]
+    assert all(len(cid) == 12 for cid in batch)
+
+
+def test_citation_id_sha256_scheme_matches_legacy_ids():
+    s = Span(3, 12, "§ 433 BGB")
+    legacy = hashlib.sha256("doc1|3|12|§ 433 BGB|regex".encode()).hexdigest()[:12]
+    assert make_citation_id(s, "regex", "doc1", scheme="sha256") == legacy
+
+
+def test_citation_id_default_scheme_is_blake2b(monkeypatch):
+    monkeypatch.delenv("REFEX_CITATION_ID_SCHEME", raising=False)
+    s = Span(3, 12, "§ 433 BGB")
+    expected = hashlib.blake2b("doc1|3|12|§ 433 BGB|regex".encode(), digest_size=6).hexdigest()
+    assert make_citation_id(s, "regex", "doc1") == expected
+
+
+def test_citation_id_scheme_from_env(monkeypatch):
+    s = Span(0, 9, "§ 433 BGB")
+    monkeypatch.setenv("REFEX_CITATION_ID_SCHEME", "sha256")
+    assert make_citation_id(s, "regex") == make_citation_id(s, "regex", scheme="sha256")
+
+
+def test_citation_id_unknown_scheme():
+    with pytest.raises(ValueError, match="Unknown citation ID scheme"):
+        make_citation_id(Span(0, 1, "x"), "regex", scheme="md5")
+
+
+def _sample_result() -> ExtractionResult:
+    return ExtractionResult(
+        citations=[
+            LawCitation(span=Span(0, 9, "§ 433 BGB"), book="bgb", number="433"),
+            CaseCitation(span=Span(15, 29, "VIII ZR 295/01"), court="BGH", confidence=0.8),
+            LawCitation(span=Span(40, 49, "§ 434 BGB"), book="bgb", number="434"),
+            LawCitation(span=Span(60, 63, "§ 5"), kind="short"),
+        ]
+    )
+
+
+def test_to_columns_parallel_arrays():
+    table = _sample_result().to_columns()
+    assert len(table) == 4
+    assert list(table.start) == [0, 15, 40, 60]
+    assert list(table.end) == [9, 29, 49, 63]
+    assert list(table.type_code) == [TYPE_LAW, TYPE_CASE, TYPE_LAW, TYPE_LAW]
+    assert list(table.confidence) == [1.0, 0.8, 1.0, 1.0]
+    assert table.number == ["433", None, "434", None]
+
+
+def test_to_columns_dictionary_encodes_book_and_court():
+    table = _sample_result().to_columns()
+    assert table.books == ["bgb"]
+    assert list(table.book_id) == [0, -1, 0, -1]
+    assert table.courts == ["BGH"]
+    assert list(table.court_id) == [-1, 0, -1, -1]
+    assert table.book(0) == "bgb"
+    assert table.book(3) is None
+    assert table.court(1) == "BGH"
+
+
+def test_columns_round_trip_returns_original_objects():
+    result = _sample_result()
+    table = result.to_columns()
+    assert table.to_citations() == result.citations
+    assert table.row(1) is result.citations[1]
+
+
+def test_columns_where_filters_rows():
+    table = _sample_result().to_columns()
+    laws = table.where(code == TYPE_LAW for code in table.type_code)
+    assert len(laws) == 3
+    assert laws.books is table.books
+    assert [c.number for c in laws.to_citations()] == ["433", "434", None]
+
+
+def test_columns_without_backing_rows_rebuild_citations():
+    table = _sample_result().to_columns()
+    bare = CitationTable(
+        start=table.start,
+        end=table.end,
+        type_code=table.type_code,
+        book_id=table.book_id,
+        number=table.number,
+        court_id=table.court_id,
+        confidence=table.confidence,
+        books=table.books,
+        courts=table.courts,
+    )
+    cits = bare.to_citations()
+    assert isinstance(cits[0], LawCitation)
+    assert cits[0].book == "bgb"
+    assert cits[0].span.start == 0
+    assert isinstance(cits[1], CaseCitation)
+    assert cits[1].court == "BGH"
+
+
+def test_columns_empty_result():
+    table = ExtractionResult().to_columns()
+    assert len(table) == 0
+    assert table.to_citations() == []
@@ -1,8 +1,9 @@
 """Tests for the CRF citation extraction engine (Stream F).
 
 These tests verify the feature extractor, BIO → span conversion, and
-basic sanity of the trained model (if available).  Training itself is
-not tested here (too slow, needs benchmark data).
+basic sanity of the trained model (if available).  Full training is
+not tested here (too slow, needs benchmark data); batch tagging uses a
+small model trained on the CI fixtures.
 """
 
 from __future__ import annotations
@@ -12,11 +13,19 @@ from pathlib import Path
 import pytest
 
 from refex.engines.crf import (
+    FEATURE_VERSION,
+    FeatureCache,
+    _dict_to_crfsuite_features,
     _parse_case_fields,
     _parse_law_fields,
     _word_shape,
     bio_to_spans,
+    candidate_windows,
     extract_features,
+    iter_training_sequences,
+    label_tokens,
+    sequence_to_crfsuite_features,
+    stitch_window_labels,
     text_to_features,
     tokenize,
 )
@@ -110,6 +119,45 @@ class TestTextToFeatures:
         assert token_spans == []
 
 
+class TestSequenceToCrfsuiteFeatures:
+    """The memoised pipeline must match the dict path feature-for-feature."""
+
+    @staticmethod
+    def _dict_path(tokens: list[str]) -> list[list[str]]:
+        return [_dict_to_crfsuite_features(extract_features(tokens, i)) for i in range(len(tokens))]
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "",
+            "§",
+            "§ 433",
+            "Gemäß § 433 Abs. 1 BGB i.V.m. §§ 511, 513 ZPO ist die Berufung zulässig.",
+            "BGH, Urteil vom 12.03.2020 - VIII ZR 295/01 - und BVerwG 10 C 23.12 (2013)",
+        ],
+    )
+    def test_matches_dict_path(self, text):
+        tokens = [t[2] for t in tokenize(text)]
+        assert sequence_to_crfsuite_features(tokens) == self._dict_path(tokens)
+
+    def test_matches_dict_path_on_fixtures(self):
+        import json
+
+        fixtures = Path(__file__).parent.parent / "benchmarks" / "fixtures" / "documents.jsonl"
+        with fixtures.open(encoding="utf-8") as f:
+            texts = [json.loads(line)["text"] for line in f][:3]
+        for text in texts:
+            tokens = [t[2] for t in tokenize(text)]
+            assert sequence_to_crfsuite_features(tokens) == self._dict_path(tokens)
+
+    def test_repeated_tokens_share_context(self):
+        feats = sequence_to_crfsuite_features(["§", "1", "§", "1"])
+        assert "BOS" in feats[0]
+        assert "EOS" in feats[3]
+        assert "prev.is_section" in feats[1]
+        assert "next2.lower=§" in feats[0]
+
+
 class TestBioToSpans:
     def test_simple_span(self):
         text = "Gemäß § 433 BGB gilt."
@@ -146,6 +194,90 @@ class TestBioToSpans:
         assert len(spans) == 1
 
 
+class TestLabelTokens:
+    def test_labels_overlapping_tokens(self):
+        text = "Gemäß § 433 BGB gilt."
+        labels = label_tokens(tokenize(text), [(6, 15, "law")])
+        assert labels == ["O", "B-LAW_REF", "I-LAW_REF", "I-LAW_REF", "O"]
+
+    def test_partial_token_overlap(self):
+        text = "vgl.BGH, Urteil"
+        # citation starts inside the first token
+        labels = label_tokens(tokenize(text), [(4, 7, "case")])
+        assert labels == ["B-CASE_REF", "O"]
+
+    def test_no_overlap(self):
+        assert label_tokens(tokenize("a b c"), [(1, 2, "law")]) == ["O", "O", "O"]
+        assert label_tokens([], [(0, 5, "law")]) == []
+
+
+class TestFeatureCache:
+    def test_roundtrip(self, tmp_path):
+        cache = FeatureCache(tmp_path)
+        assert cache.get("§ 433 BGB") is None
+        feats = sequence_to_crfsuite_features(["§", "433", "BGB"])
+        cache.put("§ 433 BGB", feats)
+        assert cache.get("§ 433 BGB") == feats
+        assert cache.get("§ 434 BGB") is None
+
+    def test_key_includes_feature_version(self, tmp_path):
+        assert FeatureCache(tmp_path).key("x").endswith(f"-v{FEATURE_VERSION}")
+
+
+class TestIterTrainingSequences:
+    DATA_DIR = Path(__file__).parent.parent / "benchmarks" / "fixtures"
+
+    def test_workers_and_cache_match_serial(self, tmp_path, monkeypatch):
+        import refex.engines.crf as crf_module
+
+        serial = list(iter_training_sequences(self.DATA_DIR, limit=4))
+        assert len(serial) == 4
+        parallel = list(iter_training_sequences(self.DATA_DIR, limit=4, workers=2, cache_dir=tmp_path))
+        assert parallel == serial
+        assert len(list(tmp_path.rglob("*.pkl"))) == 4
+
+        # second run is served from the cache: no features are extracted
+        def no_extraction(tokens):
+            raise AssertionError("features extracted on a warm cache")
+
+        monkeypatch.setattr(crf_module, "sequence_to_crfsuite_features", no_extraction)
+        cached = list(iter_training_sequences(self.DATA_DIR, limit=4, cache_dir=tmp_path))
+        assert cached == serial
+
+    def test_labels_align_with_features(self):
+        for features, labels in iter_training_sequences(self.DATA_DIR, limit=2):
+            assert len(features) == len(labels)
+            assert any(label.startswith("B-") for label in labels)
+
+
+class TestCandidateWindows:
+    def test_windows_around_anchors(self):
+        text = " ".join(["wort"] * 50 + ["§", "433", "BGB"] + ["wort"] * 50)
+        windows = candidate_windows(text, tokenize(text), radius=5)
+        assert windows == [(45, 56)]
+
+    def test_overlapping_windows_merge(self):
+        text = "a b § 1 c d e § 2 f g h i j k l m BGH n o"
+        windows = candidate_windows(text, tokenize(text), radius=2)
+        # "§" at token 2 and 7 overlap; "BGH" at token 17 stands alone
+        assert windows == [(0, 10), (15, 20)]
+
+    def test_no_anchors(self):
+        text = "Kein Zitat hier."
+        assert candidate_windows(text, tokenize(text)) == []
+        assert candidate_windows("", []) == []
+
+
+class TestStitchWindowLabels:
+    def test_outside_windows_is_o(self):
+        labels = stitch_window_labels(6, [(1, 3), (4, 6)], [["B-LAW_REF", "I-LAW_REF"], ["O", "B-CASE_REF"]])
+        assert labels == ["O", "B-LAW_REF", "I-LAW_REF", "O", "O", "B-CASE_REF"]
+
+    def test_window_opening_inside_span_is_repaired(self):
+        labels = stitch_window_labels(4, [(2, 4)], [["I-LAW_REF", "I-LAW_REF"]])
+        assert labels == ["O", "O", "B-LAW_REF", "I-LAW_REF"]
+
+
 class TestParseLawFields:
     def test_simple_law(self):
         book, number = _parse_law_fields("§ 433 BGB")
@@ -211,3 +343,95 @@ class TestCRFExtractor:
         cits, _ = extractor.extract(text)
         for c in cits:
             assert text[c.span.start : c.span.end] == c.span.text
+
+
+@pytest.fixture(scope="module")
+def fixture_model(tmp_path_factory):
+    """A small crfsuite model trained on the CI fixtures."""
+    pytest.importorskip("pycrfsuite")
+    from refex.engines.crf import train_crf
+
+    output = tmp_path_factory.mktemp("crf") / "crf_model.pkl"
+    return train_crf(TestIterTrainingSequences.DATA_DIR, output, max_iterations=10)
+
+
+class TestCRFExtractBatch:
+    TEXTS = [
+        "Gemäß § 433 Abs. 1 BGB schuldet der Verkäufer.",
+        "",
+        "Die Berufung ist gemäß §§ 511, 513 ZPO zulässig (BGH, Urteil vom 1. 2. 2000 - VIII ZR 1/99).",
+        "Kein Zitat hier.",
+    ]
+
+    def test_matches_single_extract(self, fixture_model):
+        from refex.engines.crf import CRFExtractor
+
+        ext = CRFExtractor(fixture_model)
+        expected = [ext.extract(t) for t in self.TEXTS]
+        assert ext.extract_batch(self.TEXTS, workers=1) == expected
+        assert ext.extract_batch(self.TEXTS, workers=3) == expected
+        assert ext.extract_batch([]) == []
+
+    def test_extractors_share_tagger_pool(self, fixture_model):
+        from refex.engines.crf import CRFExtractor
+
+        a, b = CRFExtractor(fixture_model), CRFExtractor(fixture_model)
+        a.extract(self.TEXTS[0])
+        b.extract(self.TEXTS[0])
+        assert a._tagger is b._tagger
+
+    def test_retrained_model_gets_new_taggers(self, tmp_path):
+        pytest.importorskip("pycrfsuite")
+        from refex.engines.crf import CRFExtractor, train_crf
+
+        output = tmp_path / "crf_model.pkl"
+        train_crf(TestIterTrainingSequences.DATA_DIR, output, max_iterations=10)
+        before = CRFExtractor(output).extract_batch(self.TEXTS)
+        assert any(citations for citations, _ in before)
+
+        # Retrain in place with regularisation that zeroes every weight
+        train_crf(TestIterTrainingSequences.DATA_DIR, output, c1=1e6, max_iterations=10)
+        after = CRFExtractor(output).extract_batch(self.TEXTS)
+        assert after != before
+
+    def test_windowed_batch_matches_single(self, fixture_model):
+        from refex.engines.crf import CRFExtractor
+
+        ext = CRFExtractor(fixture_model, windowed=True, window_radius=8)
+        expected = [ext.extract(t) for t in self.TEXTS]
+        assert ext.extract_batch(self.TEXTS, workers=2) == expected
+        # no anchors → nothing is tagged
+        assert ext.extract("Kein Zitat hier.") == ([], [])
+
+
+def test_windowed_rejects_sklearn_model(tmp_path):
+    import pickle
+
+    from refex.engines.crf import CRFExtractor
+
+    legacy = tmp_path / "legacy.pkl"
+    legacy.write_bytes(pickle.dumps({"not": "a crfsuite model"}))
+    with pytest.raises(ValueError, match="crfsuite"):
+        CRFExtractor(legacy, windowed=True).extract("§ 1 BGB")
+
+
+def test_evaluate_crf_starts_with_cold_feature_memo(fixture_model):
+    from benchmarks.datasets import load_dataset
+
+    from refex.engines.crf import CRFExtractor, _token_features, evaluate_crf
+
+    dataset = load_dataset(TestIterTrainingSequences.DATA_DIR)
+    _token_features("warm")
+    cleared = []
+    original = _token_features.cache_clear
+
+    def spy():
+        cleared.append(_token_features.cache_info().currsize)
+        original()
+
+    _token_features.cache_clear = spy
+    try:
+        evaluate_crf(CRFExtractor(fixture_model), dataset)
+    finally:
+        _token_features.cache_clear = original
+    assert cleared and cleared[0] > 0
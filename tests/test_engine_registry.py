@@ -0,0 +1,109 @@
+"""Tests for the lazy engine registry (``refex.engines``)."""
+
+from __future__ import annotations
+
+import copy
+import pickle
+import subprocess
+import sys
+
+import pytest
+
+from refex.engines import _REGISTRY, LazyEngine, available_engines, create_engine, get_engine_factory, register_engine
+from refex.orchestrator import CitationExtractor
+
+
+def _imported_modules(statement: str) -> set[str]:
+    code = f"import sys; {statement}; print('\\n'.join(sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return set(out.stdout.split())
+
+
+def test_builtin_engines_registered():
+    assert {"regex-law", "regex-case", "crf", "transformer"} <= set(available_engines())
+
+
+def test_create_engine_by_name():
+    from refex.engines.regex import RegexLawExtractor
+
+    engine = create_engine("regex-law")
+    assert isinstance(engine, RegexLawExtractor)
+    cits, _ = engine.extract("Gemäß § 433 BGB gilt.")
+    assert cits[0].book == "bgb"
+
+
+def test_unknown_engine_raises():
+    with pytest.raises(ValueError, match="Unknown engine"):
+        get_engine_factory("no-such-engine")
+
+
+def test_register_custom_engine():
+    class Dummy:
+        def extract(self, text):
+            return [], []
+
+    register_engine("dummy-test", Dummy)
+    try:
+        assert isinstance(create_engine("dummy-test"), Dummy)
+        assert "dummy-test" in available_engines()
+    finally:
+        _REGISTRY.pop("dummy-test", None)
+    assert "dummy-test" not in available_engines()
+
+
+def test_lazy_engine_builds_on_first_use():
+    engine = LazyEngine("regex-case")
+    assert not engine.is_built
+    cits, _ = engine.extract("Das OVG Schleswig (1 KN 19/09) hat entschieden.")
+    assert engine.is_built
+    assert cits[0].file_number == "1 KN 19/09"
+
+
+def test_lazy_engine_forwards_attributes():
+    engine = LazyEngine("regex-law")
+    engine.law_book_context = "bgb"
+    assert engine.engine.law_book_context == "bgb"
+    assert engine.law_book_context == "bgb"
+
+
+def test_orchestrator_accepts_engine_names():
+    ext = CitationExtractor(engines=["regex-law"])
+    assert isinstance(ext.engines[0], LazyEngine)
+    result = ext.extract("Gemäß § 433 BGB gilt.")
+    assert [c.type for c in result.citations] == ["law"]
+
+
+def test_orchestrator_import_does_not_load_engines():
+    modules = _imported_modules("import refex.orchestrator")
+    assert "refex.orchestrator" in modules
+    assert "refex.engines.regex" not in modules
+    assert "refex.extractors.law" not in modules
+    assert "refex.extractors.case" not in modules
+
+
+def test_default_orchestrator_construction_is_lazy():
+    modules = _imported_modules("from refex.orchestrator import CitationExtractor; CitationExtractor()")
+    assert "refex.engines.regex" not in modules
+
+
+def test_transformer_module_does_not_import_crf():
+    modules = _imported_modules("import refex.engines.transformer")
+    assert "refex.engines.crf" not in modules
+
+
+@pytest.mark.parametrize("roundtrip", [lambda x: pickle.loads(pickle.dumps(x)), copy.deepcopy])
+def test_lazy_engine_pickle_and_deepcopy(roundtrip):
+    text = "Gemäß § 433 BGB gilt."
+    extractor = CitationExtractor()
+    expected = [c.span.text for c in extractor.extract(text).citations]
+
+    clone = roundtrip(CitationExtractor())
+    assert not clone.engines[0].is_built
+    assert [c.span.text for c in clone.extract(text).citations] == expected
+
+    built = LazyEngine("regex-law")
+    built.law_book_context = "bgb"
+    clone = roundtrip(built)
+    assert clone.is_built
+    assert clone.law_book_context == "bgb"
+    assert clone.engine is not built.engine
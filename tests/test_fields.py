@@ -0,0 +1,83 @@
+"""Tests for span field parsing shared by the CRF and transformer engines."""
+
+from __future__ import annotations
+
+import pytest
+
+from refex.citations import CaseCitation, LawCitation
+from refex.engines.fields import get_span_field_parser, spans_to_typed_citations
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return get_span_field_parser()
+
+
+class TestParseLaw:
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("§ 433 BGB", ("bgb", "433")),
+            ("§§ 708 ZPO", ("zpo", "708")),
+            ("§ 433 Abs. 1 BGB", ("bgb", "433")),
+            ("Art. 12 GG", ("gg", "12")),
+            # multi-word code from law_book_codes.txt
+            ("§ 33 Abs. 1 SGB X", ("sgb x", "33")),
+            ("§ 240 Abs 4 Satz 1 SGB V", ("sgb v", "240")),
+            # trailing punctuation is not part of the code
+            ("§ 1 VwGO)", ("vwgo", "1")),
+            ("§ 12", (None, "12")),
+        ],
+    )
+    def test_fields(self, parser, text, expected):
+        assert parser.parse_law(text) == expected
+
+    def test_last_book_wins(self, parser):
+        assert parser.parse_law("§ 1 BGB i.V.m. § 2 ZPO")[0] == "zpo"
+
+    def test_generic_book_pattern(self, parser):
+        assert parser.parse_law("§ 5 FooBarG")[0] == "foobarg"
+
+    def test_matches_regex_engine_book(self, parser):
+        from refex.engines.regex import RegexLawExtractor
+
+        text = "Gemäß § 33 Abs. 1 SGB X ist das zulässig."
+        (cit,), _ = RegexLawExtractor().extract(text)
+        assert parser.parse_law(cit.span.text)[0] == cit.book
+
+
+class TestParseCase:
+    def test_file_number_only(self, parser):
+        assert parser.parse_case("VIII ZR 295/01") == (None, "VIII ZR 295/01")
+
+    def test_gazetteer_court(self, parser):
+        assert parser.parse_case("BGH, Urteil vom 12.03.2020 - VIII ZR 295/01") == ("BGH", "VIII ZR 295/01")
+        assert parser.parse_case("Beschluss des OLG Düsseldorf vom 1.2.2003")[0] == "OLG Düsseldorf"
+
+    def test_heuristic_fallback(self, parser):
+        assert parser.parse_case("Schiedsstelle Nord, Urteil vom 1.2.2003")[0] == "Schiedsstelle Nord"
+
+
+class TestParseBatch:
+    def test_batch_matches_single(self, parser):
+        spans = [("§ 433 BGB", "LAW_REF"), ("BGH, VIII ZR 295/01", "CASE_REF"), ("§ 433 BGB", "LAW_REF"), ("x", "O")]
+        assert parser.parse_batch(spans) == [
+            parser.parse_law("§ 433 BGB"),
+            parser.parse_case("BGH, VIII ZR 295/01"),
+            parser.parse_law("§ 433 BGB"),
+            (None, None),
+        ]
+
+
+class TestSpansToTypedCitations:
+    def test_builds_typed_citations(self):
+        text = "§ 433 BGB und BGH, VIII ZR 295/01"
+        spans = [(0, 9, text[0:9], "LAW_REF"), (14, 33, text[14:33], "CASE_REF")]
+        law, case = spans_to_typed_citations(spans, "crf", confidence=0.8)
+        assert isinstance(law, LawCitation) and law.book == "bgb" and law.number == "433"
+        assert isinstance(case, CaseCitation) and case.court == "BGH" and case.file_number == "VIII ZR 295/01"
+        assert law.confidence == case.confidence == 0.8
+        assert law.id != case.id
+
+    def test_empty(self):
+        assert spans_to_typed_citations([], "transformer", confidence=0.85) == []
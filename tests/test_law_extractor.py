@@ -548,3 +548,11 @@ def test_citation_styles(law_extractor):
             assert m.end <= len(content)
             assert m.end > m.start
             assert len(m.get_references()) > 0
+
+
+def test_qualifier_run_without_book(law_extractor):
+    """Long runs of section qualifiers without a book must not backtrack exponentially."""
+    content = "§ 1 " + "12345 und Abs. 2 Nr. 3 " * 40 + "ohne Gesetz. Sowie § 433 Abs. 1 BGB."
+    markers = law_extractor.extract_law_ref_markers(content)
+    refs = [ref for marker in markers for ref in marker.references]
+    assert refs == [Ref(ref_type=RefType.LAW, book="bgb", section="433")]
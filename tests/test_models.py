@@ -22,3 +22,31 @@ def test_ref_marker_replace_content_with_mask():
     marker = RefMarker("§ 123 ABC", 4, 13)
     result = marker.replace_content_with_mask(content)
     assert result == "Foo _________ bar"
+
+
+def test_ref_and_marker_are_slotted():
+    """Legacy models carry no per-instance __dict__."""
+    assert not hasattr(Ref(ref_type=RefType.LAW), "__dict__")
+    marker = RefMarker("§ 1 BGB", 0, 7)
+    assert not hasattr(marker, "__dict__")
+    # The django integration still sets these attributes
+    marker.referenced_by = object()
+    marker.referenced_by_type = "law"
+
+
+def test_ref_marker_uuid_only_on_request():
+    marker = RefMarker("§ 1 BGB", 0, 7)
+    assert marker.uuid == ""
+    marker.set_uuid()
+    assert marker.uuid
+
+
+def test_typed_engines_skip_marker_uuids():
+    from refex.engines.regex import RegexLawExtractor
+    from refex.extractor import RefExtractor
+
+    markers = RegexLawExtractor().extract_law_ref_markers("Gemäß § 433 BGB gilt.")
+    assert markers and all(m.uuid == "" for m in markers)
+
+    _, legacy = RefExtractor().extract("Gemäß § 433 BGB gilt.")
+    assert legacy and all(m.uuid for m in legacy)
@@ -0,0 +1,98 @@
+"""Tests for the per-phase statistics of the regex extractors."""
+
+from __future__ import annotations
+
+from refex.engines.regex import RegexCaseExtractor, RegexLawExtractor
+from refex.extractor import RefExtractor
+from refex.extractors.stats import PhaseStats
+
+TEXT = (
+    "Vgl. BVerwG, Urteil vom 20.02.2013 - 10 C 23.12 - und BVerwGE 143, 10. "
+    "Der Anspruch folgt aus § 433 Abs. 1 BGB und § 280 BGB. Die Berufsfreiheit (Art. 12 GG) ist nicht verletzt. "
+    "Die Kostenentscheidung beruht auf §§ 708, 711 ZPO."
+)
+
+
+def test_disabled_by_default():
+    extractor = RegexLawExtractor()
+    assert extractor.phase_stats is None
+    extractor.extract(TEXT)
+    assert extractor.phase_stats is None
+
+
+def test_law_phases():
+    extractor = RegexLawExtractor()
+    stats = extractor.phase_stats = PhaseStats()
+    markers = extractor.extract_law_ref_markers(TEXT)
+    extractor.extract_law_ref_markers(TEXT)
+
+    phases = stats.phases
+    assert phases["law"].calls == 2
+    assert phases["law"].matches == 2 * len(markers) == 2 * 4
+    assert stats.chars["law"] == 2 * len(TEXT)
+    assert phases["law.multi"].matches == 2
+    assert phases["law.single_book"].matches == 2
+    assert phases["law.single_any_book"].matches == 2
+    assert phases["law.art_single"].matches == 2
+    assert phases["law.mask"].calls == 2 * 8
+    assert phases["law.mask"].masked_chars == 2 * sum(m.end - m.start for m in markers)
+    parts = sum(c.seconds for name, c in phases.items() if name.startswith("law."))
+    assert 0 < parts <= phases["law"].seconds
+
+
+def test_law_phases_with_book_context():
+    extractor = RegexLawExtractor()
+    extractor.law_book_context = "bgb"
+    stats = extractor.phase_stats = PhaseStats()
+    text = "Gemäß § 433 Abs. 1 und §§ 664 bis 670 sowie Anlage 3 gilt Folgendes."
+    markers = extractor.extract_law_ref_markers(text)
+
+    phases = stats.phases
+    assert markers
+    assert list(phases) == ["law.context", "law"]
+    assert phases["law"].calls == 1
+    assert phases["law"].matches == phases["law.context"].matches == len(markers)
+    assert stats.chars["law"] == len(text)
+    assert phases["law.context"].seconds <= phases["law"].seconds
+
+
+def test_case_phases():
+    extractor = RegexCaseExtractor()
+    stats = extractor.phase_stats = PhaseStats()
+    extractor.extract(TEXT)
+
+    phases = stats.phases
+    assert phases["case.reporter"].matches == 1
+    assert phases["case.file_number"].matches == 1
+    assert phases["case.court_search"].matches == 1
+    assert phases["case"].matches == 2
+
+
+def test_ref_extractor_shares_stats():
+    extractor = RefExtractor()
+    stats = extractor.phase_stats = PhaseStats()
+    extractor.extract(TEXT)
+    assert {"law", "case"} <= stats.phases.keys()
+
+    text = stats.format()
+    assert text.index("  law ") < text.index("    multi")
+    assert "chars/s" in text
+
+
+def test_merge_and_round_trip():
+    a, b = PhaseStats(), PhaseStats()
+    a.record_call("law", 0.5, 100, matches=1)
+    a.record("law.multi", 0.25, matches=1)
+    b.record("law.multi", 0.25, matches=2, masked_chars=10)
+    a.merge(b)
+
+    assert a.phases["law.multi"].calls == 2
+    assert a.phases["law.multi"].seconds == 0.5
+    assert a.phases["law.multi"].matches == 3
+    assert a.phases["law.multi"].masked_chars == 10
+
+    copy = PhaseStats.from_dict(a.to_dict())
+    assert copy.to_dict() == a.to_dict()
+    assert "100.0%" in copy.format()
+    a.reset()
+    assert not a.phases and not a.chars
@@ -6,7 +6,8 @@ requires downloading large weights and GPU/MPS).
 
 Model-requiring tests are marked ``@pytest.mark.slow`` and skipped by
 default; run them with ``pytest -m slow`` when you have the model
-available.
+available.  Batching and windowing are tested against a tiny randomly
+initialised model built in a temp dir (needs torch + transformers).
 """
 
 from __future__ import annotations
@@ -15,9 +16,11 @@ import pytest
 
 from refex.engines.transformer import (
     DEFAULT_LABEL_MAP,
+    _break_ranks,
     _spans_to_citations,
     _whitespace_tokenize,
     _word_labels_to_spans,
+    schedule_windows,
 )
 
 
@@ -178,3 +181,402 @@ class TestTransformerExtractor:
         cits, _ = ext.extract(text)
         for c in cits:
             assert text[c.span.start : c.span.end] == c.span.text
+
+
+@pytest.fixture(scope="module")
+def tiny_model_dir(tmp_path_factory):
+    """A randomly initialised 2-layer BERT token classifier (no download)."""
+    torch = pytest.importorskip("torch")
+    transformers = pytest.importorskip("transformers")
+
+    path = tmp_path_factory.mktemp("tiny-bert")
+    words = "Gemäß § 433 Abs. 1 BGB ZPO BGH VIII ZR 295/01 der die das und vom Urteil Beschluss".split()
+    chars = sorted(set("".join(words)) | set("0123456789abcdefghijklmnopqrstuvwxyz.,;:()/-§"))
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *chars, *(f"##{c}" for c in chars), *words]
+    (path / "vocab.txt").write_text("\n".join(dict.fromkeys(vocab)), encoding="utf-8")
+    tokenizer = transformers.BertTokenizerFast(str(path / "vocab.txt"), do_lower_case=False)
+
+    labels = ["O", "B-LAW_REF", "I-LAW_REF", "B-CASE_REF", "I-CASE_REF"]
+    config = transformers.BertConfig(
+        vocab_size=tokenizer.vocab_size,
+        hidden_size=32,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=64,
+        num_labels=len(labels),
+        id2label=dict(enumerate(labels)),
+        label2id={label: i for i, label in enumerate(labels)},
+    )
+    torch.manual_seed(0)
+    transformers.BertForTokenClassification(config).save_pretrained(path)
+    tokenizer.save_pretrained(path)
+    return path
+
+
+BATCH_TEXTS = [
+    "Gemäß § 433 Abs. 1 BGB schuldet der Verkäufer.",
+    "",
+    "Vgl. BGH, Urteil vom 1.2.2000 - VIII ZR 295/01. " * 30,
+    "§ 1 ZPO",
+]
+
+
+def _reference_extract(ext, text):
+    """Citations from one unpadded forward pass per overflow window (no batching, no pooling)."""
+    import torch
+
+    word_offsets = _whitespace_tokenize(text)
+    if not word_offsets:
+        return [], []
+    enc = ext._tokenizer(
+        [w for _, _, w in word_offsets],
+        is_split_into_words=True,
+        truncation=True,
+        max_length=ext._max_length,
+        stride=ext._stride,
+        return_overflowing_tokens=True,
+    )
+    labels: list[str | None] = [None] * len(word_offsets)
+    for w, ids in enumerate(enc["input_ids"]):
+        with torch.inference_mode():
+            logits = ext._model(input_ids=torch.tensor([ids])).logits[0]
+        previous = None
+        for tok_idx, word_id in enumerate(enc.word_ids(batch_index=w)):
+            if word_id is None or word_id == previous:
+                continue
+            previous = word_id
+            if labels[word_id] is None:  # first window wins
+                labels[word_id] = ext._id2label[int(logits[tok_idx].argmax())]
+    spans = _word_labels_to_spans([lbl or "O" for lbl in labels], word_offsets, text, ext._label_mapping)
+    return _spans_to_citations(spans), []
+
+
+class TestBatchedInference:
+    def test_batch_matches_reference(self, tiny_model_dir):
+        from refex.engines.transformer import TransformerExtractor
+
+        ext = TransformerExtractor(tiny_model_dir, max_length=64, stride=16)
+        ext._load()
+        expected = [_reference_extract(ext, t) for t in BATCH_TEXTS]
+        assert any(citations for citations, _ in expected)
+        assert [ext.extract(t) for t in BATCH_TEXTS] == expected
+        for batch_size in (1, 3, 64):
+            assert ext.extract_batch(BATCH_TEXTS, batch_size=batch_size) == expected
+
+    def test_padded_logits_match_unpadded(self, tiny_model_dir):
+        import numpy as np
+        import torch
+
+        from refex.engines.transformer import TransformerExtractor
+
+        ext = TransformerExtractor(tiny_model_dir, max_length=64, stride=16)
+        ext._load()
+        # Windows of all documents, pooled as in extract_batch
+        windows = [ids for t in BATCH_TEXTS for ids, _ in ext._encode_document(t)[1]]
+        assert len({len(ids) for ids in windows}) > 1
+        with torch.inference_mode():
+            expected = [ext._model(input_ids=torch.tensor([ids])).logits[0].numpy() for ids in windows]
+        for batch_size in (1, 3, 64):
+            for got, want in zip(ext._forward_windows(windows, batch_size), expected, strict=True):
+                np.testing.assert_allclose(got, want, atol=1e-4)
+
+    def test_long_document_is_windowed(self, tiny_model_dir):
+        from refex.engines.transformer import TransformerExtractor
+
+        ext = TransformerExtractor(tiny_model_dir, max_length=64, stride=16)
+        ext._load()
+        words = BATCH_TEXTS[2].split()
+        windows = ext._encode_words(words)
+        assert len(windows) > 1
+        assert all(len(ids) <= 64 for ids, _ in windows)
+        assert len(ext._predict_word_labels(words, BATCH_TEXTS[2], [])) == len(words)
+
+
+@pytest.fixture(scope="module")
+def tiny_onnx_dir(tiny_model_dir, tmp_path_factory):
+    pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    from refex.engines.transformer import export_onnx
+
+    path = tmp_path_factory.mktemp("tiny-onnx")
+    export_onnx(tiny_model_dir, path, quantize=True)
+    return path
+
+
+class TestOnnxBackend:
+    def _fixture_texts(self):
+        import json
+        from pathlib import Path
+
+        docs = Path(__file__).parent.parent / "benchmarks" / "fixtures" / "documents.jsonl"
+        with docs.open(encoding="utf-8") as f:
+            return [json.loads(line)["text"] for line in f][:4]
+
+    def _logits(self, ext, texts):
+        ext._load()
+        windows = [ids for t in texts for ids, _ in ext._encode_words(t.split())]
+        return windows, ext._forward_windows(windows, batch_size=4)
+
+    def test_matches_torch_on_fixtures(self, tiny_model_dir, tiny_onnx_dir):
+        import numpy as np
+
+        from refex.engines.transformer import TransformerExtractor
+
+        texts = self._fixture_texts()
+        pt = TransformerExtractor(tiny_model_dir, max_length=64, stride=16)
+        ox = TransformerExtractor(tiny_onnx_dir, backend="onnx", max_length=64, stride=16)
+        pt_windows, pt_logits = self._logits(pt, texts)
+        ox_windows, ox_logits = self._logits(ox, texts)
+        assert ox_windows == pt_windows  # same tokenization without transformers
+        for a, b in zip(pt_logits, ox_logits, strict=True):
+            np.testing.assert_allclose(a, b, atol=1e-4)
+        assert ox.extract_batch(texts) == pt.extract_batch(texts)
+
+    def test_quantized_within_tolerance(self, tiny_model_dir, tiny_onnx_dir):
+        import numpy as np
+
+        from refex.engines.transformer import TransformerExtractor
+
+        texts = self._fixture_texts()
+        _, pt_logits = self._logits(TransformerExtractor(tiny_model_dir, max_length=64, stride=16), texts)
+        q = TransformerExtractor(tiny_onnx_dir, backend="onnx", quantized=True, max_length=64, stride=16)
+        _, q_logits = self._logits(q, texts)
+        for a, b in zip(pt_logits, q_logits, strict=True):
+            np.testing.assert_allclose(a, b, atol=0.05)
+
+    def test_inference_does_not_import_torch(self, tiny_onnx_dir):
+        import subprocess
+        import sys
+
+        code = (
+            "import sys\n"
+            "from refex.engines.transformer import TransformerExtractor\n"
+            f"TransformerExtractor({str(tiny_onnx_dir)!r}, backend='onnx').extract('§ 433 BGB')\n"
+            "assert 'torch' not in sys.modules and 'transformers' not in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_unknown_backend(self):
+        from refex.engines.transformer import TransformerExtractor
+
+        with pytest.raises(ValueError, match="Unknown backend"):
+            TransformerExtractor(backend="tensorrt")
+
+
+class TestEncodingCache:
+    def test_second_run_skips_tokenization(self, tiny_model_dir, tmp_path, monkeypatch):
+        from refex.engines.transformer import TransformerExtractor
+
+        first = TransformerExtractor(tiny_model_dir, max_length=64, stride=16, encoding_cache=tmp_path)
+        expected = first.extract_batch(BATCH_TEXTS)
+        assert any(tmp_path.rglob("*.pkl"))
+
+        second = TransformerExtractor(tiny_model_dir, max_length=64, stride=16, encoding_cache=tmp_path)
+        second._load()
+
+        def fail(words):
+            raise AssertionError("tokenizer called despite cache hit")
+
+        monkeypatch.setattr(second, "_encode_words", fail)
+        assert second.extract_batch(BATCH_TEXTS) == expected
+
+    def test_fingerprint_depends_on_window_config(self, tiny_model_dir, tmp_path):
+        from refex.engines.transformer import TransformerExtractor
+
+        a = TransformerExtractor(tiny_model_dir, max_length=64, stride=16, encoding_cache=tmp_path)
+        b = TransformerExtractor(tiny_model_dir, max_length=32, stride=8, encoding_cache=tmp_path)
+        a._load()
+        b._load()
+        assert a._encoding_cache.fingerprint != b._encoding_cache.fingerprint
+
+    def test_entries_keyed_by_word_offsets(self, tiny_model_dir, tmp_path):
+        from refex.engines.transformer import TransformerExtractor
+
+        text = "Gemäß § 433 BGB schuldet der Verkäufer."
+        # One word per character pair: clearly not the whitespace tokenization
+        custom = [(i, i + 2, text[i : i + 2]) for i in range(0, len(text) - 1, 2)]
+        ext = TransformerExtractor(tiny_model_dir, max_length=64, stride=16, encoding_cache=tmp_path)
+        ext._load()
+
+        offsets, _ = ext._encode_document(text, custom)
+        assert offsets == custom
+        offsets, _ = ext._encode_document(text)
+        assert offsets == _whitespace_tokenize(text)
+        offsets, _ = ext._encode_document(text, custom)
+        assert offsets == custom
+        assert len(list(tmp_path.rglob("*.pkl"))) == 2
+
+
+class TestPretokenizedInput:
+    def test_matches_default_tokenization(self, tiny_model_dir):
+        from refex.engines.transformer import TransformerExtractor
+
+        ext = TransformerExtractor(tiny_model_dir, max_length=64, stride=16)
+        offsets = [_whitespace_tokenize(t) for t in BATCH_TEXTS]
+        assert ext.extract_batch(BATCH_TEXTS, word_offsets=offsets) == ext.extract_batch(BATCH_TEXTS)
+
+    def test_length_mismatch(self, tiny_model_dir):
+        from refex.engines.transformer import TransformerExtractor
+
+        ext = TransformerExtractor(tiny_model_dir)
+        with pytest.raises(ValueError, match="word_offsets"):
+            ext.extract_batch(["a", "b"], word_offsets=[[]])
+
+
+class TestBreakRanks:
+    def test_paragraph_and_sentence(self):
+        text = "Erster Gedanke. Zweiter Gedanke\n\nNeuer Absatz"
+        assert _break_ranks(text, _whitespace_tokenize(text)) == [0, 0, 1, 0, 2, 0]
+
+    def test_abbreviations_are_not_sentence_ends(self):
+        text = "§ 1 Abs. 2 i.V.m. § 3 vgl. BGH"
+        assert _break_ranks(text, _whitespace_tokenize(text)) == [0] * 9
+
+
+class TestScheduleWindows:
+    def test_short_input_is_one_window(self):
+        assert schedule_windows(10, list(range(10)), None, budget=16) == [(0, 10)]
+        assert schedule_windows(0, [], None, budget=16) == []
+
+    def test_windows_cover_all_tokens_within_budget(self):
+        word_starts = list(range(0, 1000, 3))
+        windows = schedule_windows(1000, word_starts, None, budget=100, overlap=10)
+        assert windows[0][0] == 0
+        assert windows[-1][1] == 1000
+        for (a, b), (c, d) in zip(windows, windows[1:]):
+            assert a < c <= b < d  # contiguous or overlapping, always advancing
+        assert all(b - a <= 100 for a, b in windows)
+        assert all(a in word_starts for a, _ in windows)
+
+    def test_cuts_at_strongest_break(self):
+        word_starts = list(range(100))
+        ranks = [0] * 100
+        ranks[80] = 1  # sentence break in the last quarter of the first window
+        ranks[85] = 2  # paragraph break
+        windows = schedule_windows(100, word_starts, ranks, budget=90, overlap=0)
+        assert windows == [(0, 85), (85, 100)]
+
+    def test_overlap_starts_at_break(self):
+        word_starts = list(range(200))
+        ranks = [0] * 200
+        ranks[96] = 1  # sentence break inside the overlap range
+        ranks[100] = 2  # paragraph break: the first window ends here
+        windows = schedule_windows(200, word_starts, ranks, budget=100, overlap=8)
+        assert windows[0] == (0, 100)
+        assert windows[1][0] == 96
+
+
+class TestAdaptiveWindows:
+    TEXT = "\n\n".join(BATCH_TEXTS[2] for _ in range(3))
+
+    def test_fewer_windows_than_overflow(self, tiny_model_dir):
+        from refex.engines.transformer import TransformerExtractor
+
+        words = self.TEXT.split()
+        offsets = _whitespace_tokenize(self.TEXT)
+        overflow = TransformerExtractor(tiny_model_dir, max_length=64, stride=16)
+        adaptive = TransformerExtractor(tiny_model_dir, max_length=64, stride=16, window_strategy="adaptive")
+        overflow._load()
+        adaptive._load()
+        fixed = overflow._encode_windows(words, self.TEXT, offsets)
+        windows = adaptive._encode_windows(words, self.TEXT, offsets)
+        assert len(windows) < len(fixed)
+        assert all(len(ids) <= 64 for ids, _ in windows)
+        covered = {w for _, word_ids in windows for w in word_ids if w is not None}
+        assert covered == set(range(len(words)))
+
+    @pytest.mark.parametrize("merge", ["first", "center", "max_logit"])
+    def test_overlap_merges(self, tiny_model_dir, merge):
+        from refex.engines.transformer import TransformerExtractor
+
+        ext = TransformerExtractor(
+            tiny_model_dir, max_length=64, stride=16, window_strategy="adaptive", overlap_merge=merge
+        )
+        words = self.TEXT.split()
+        labels = ext._predict_word_labels(words, self.TEXT, _whitespace_tokenize(self.TEXT))
+        assert len(labels) == len(words)
+        for cits, _ in ext.extract_batch([self.TEXT, "§ 1 ZPO"]):
+            for c in cits:
+                assert c.span.text in self.TEXT or c.span.text in "§ 1 ZPO"
+
+    def test_invalid_options(self):
+        from refex.engines.transformer import TransformerExtractor
+
+        with pytest.raises(ValueError, match="window_strategy"):
+            TransformerExtractor(window_strategy="sentences")
+        with pytest.raises(ValueError, match="overlap_merge"):
+            TransformerExtractor(overlap_merge="last")
+
+
+class TestThreadControls:
+    def test_torch_intra_op_threads(self, tiny_model_dir):
+        import torch
+
+        from refex.engines.transformer import TransformerExtractor
+
+        before = torch.get_num_threads()
+        try:
+            TransformerExtractor(tiny_model_dir, intra_op_threads=1)._load()
+            assert torch.get_num_threads() == 1
+        finally:
+            torch.set_num_threads(before)
+
+    def test_onnx_session_options(self, tiny_onnx_dir):
+        from refex.engines.transformer import TransformerExtractor
+
+        ext = TransformerExtractor(tiny_onnx_dir, backend="onnx", intra_op_threads=1, inter_op_threads=2)
+        ext._load()
+        options = ext._model.get_session_options()
+        assert options.intra_op_num_threads == 1
+        assert options.inter_op_num_threads == 2
+
+
+class TestPartitionCores:
+    def test_even_split(self):
+        from refex.engines.transformer import partition_cores
+
+        assert partition_cores(2, [0, 1, 2, 3]) == [[0, 1], [2, 3]]
+        assert partition_cores(3, list(range(7))) == [[0, 1, 2], [3, 4], [5, 6]]
+
+    def test_more_replicas_than_cores(self):
+        from refex.engines.transformer import partition_cores
+
+        assert partition_cores(3, [4, 5]) == [[4], [5], [4]]
+
+    def test_invalid(self):
+        from refex.engines.transformer import partition_cores
+
+        with pytest.raises(ValueError, match="replicas"):
+            partition_cores(0)
+
+
+class TestReplicaPool:
+    def test_matches_single_extractor(self, tiny_onnx_dir):
+        from refex.engines.transformer import TransformerExtractor, TransformerReplicaPool, partition_cores
+
+        kwargs = {"model": tiny_onnx_dir, "backend": "onnx", "max_length": 64, "stride": 16}
+        expected = TransformerExtractor(**kwargs).extract_batch(BATCH_TEXTS)
+        core = partition_cores(1)[0][:1]  # two replicas sharing one core
+        with TransformerReplicaPool(cores=[core, core], batch_size=1, **kwargs) as pool:
+            assert pool.extract_batch(BATCH_TEXTS) == expected
+            assert pool.extract_batch([]) == []
+
+    def test_dead_replica_is_reported(self, tiny_onnx_dir):
+        from refex.engines.transformer import TransformerReplicaPool, partition_cores
+
+        core = partition_cores(1)[0][:1]
+        pool = TransformerReplicaPool(cores=[core], model=tiny_onnx_dir, backend="onnx", max_length=64, stride=16)
+        pool.start()
+        process = pool._processes[0]
+        process.kill()
+        process.join()
+        with pytest.raises(RuntimeError, match=r"replica 0 \(pid \d+\) died with exit code -9"):
+            pool.extract_batch(BATCH_TEXTS)
+        assert pool._processes == []
+
+    def test_start_failure_is_reported(self, tmp_path):
+        from refex.engines.transformer import TransformerReplicaPool
+
+        pool = TransformerReplicaPool(replicas=1, model=tmp_path, backend="onnx")
+        with pytest.raises(RuntimeError, match="failed to start"):
+            pool.start()
@@ -0,0 +1,119 @@
+"""Tests for the interned book / court vocabularies."""
+
+from __future__ import annotations
+
+import threading
+
+import refex.citations as citations_module
+from refex.citations import ExtractionResult
+from refex.engines.regex import RegexCaseExtractor, RegexLawExtractor
+from refex.vocab import Vocabulary, get_book_vocabulary, get_court_vocabulary
+
+
+def test_vocabulary_ids_are_insertion_ordered():
+    vocab = Vocabulary(["bgb", "zpo"])
+    assert vocab.id_of("bgb") == 0
+    assert vocab.id_of("zpo") == 1
+    assert vocab.id_of("vwgo") == 2
+    assert vocab.value(2) == "vwgo"
+    assert len(vocab) == 3
+
+
+def test_vocabulary_empty_values_have_no_id():
+    vocab = Vocabulary()
+    assert vocab.id_of(None) == -1
+    assert vocab.id_of("") == -1
+    assert vocab.intern(None) is None
+    assert vocab.value(-1) is None
+
+
+def test_vocabulary_intern_returns_canonical_instance():
+    vocab = Vocabulary()
+    a = "".join(["b", "g", "b"])
+    b = "".join(["b", "g", "b"])
+    assert a is not b
+    assert vocab.intern(a) is vocab.intern(b)
+
+
+def test_vocabulary_max_size_passes_new_values_through():
+    vocab = Vocabulary(["bgb"], max_size=1)
+    assert vocab.id_of("zpo") == -1
+    assert vocab.intern("zpo") == "zpo"
+    assert "zpo" not in vocab
+    assert vocab.id_of("bgb") == 0
+
+
+def test_vocabulary_canonical_does_not_insert():
+    vocab = Vocabulary(["bgb"])
+    assert vocab.canonical("".join(["b", "g", "b"])) is vocab.values[0]
+    assert vocab.canonical("zpo") == "zpo"
+    assert "zpo" not in vocab
+    assert vocab.canonical(None) is None
+    assert len(vocab) == 1
+
+
+def test_ml_fields_do_not_grow_shared_vocabularies():
+    from refex.engines.fields import spans_to_typed_citations
+
+    books, courts = get_book_vocabulary(), get_court_vocabulary()
+    n_books, n_courts = len(books), len(courts)
+    text = "§ 12 QWERTZG, OLG Qwertz, 1 U 2/03 und § 433 BGB"
+    spans = [(0, 12, text[:12], "LAW_REF"), (14, 34, text[14:34], "CASE_REF"), (39, 48, text[39:], "LAW_REF")]
+    guessed, case, known = spans_to_typed_citations(spans, "crf", confidence=0.8)
+    assert (guessed.book, case.court) == ("qwertzg", "OLG Qwertz")
+    assert known.book is books.intern("bgb")
+    assert (len(books), len(courts)) == (n_books, n_courts)
+
+
+def test_shared_vocabularies_are_seeded_from_bundled_data():
+    assert "bgb" in get_book_vocabulary()
+    assert "sgb x" in get_book_vocabulary()
+    assert "BVerwG" in get_court_vocabulary()
+    assert "OVG Schleswig" in get_court_vocabulary()
+    assert get_book_vocabulary() is get_book_vocabulary()
+
+
+def test_regex_engines_intern_book_and_court():
+    law = RegexLawExtractor()
+    a, _ = law.extract("Gemäß § 433 BGB gilt.")
+    b, _ = law.extract("Vgl. auch § 434 BGB.")
+    assert a[0].book is b[0].book
+
+    case = RegexCaseExtractor()
+    c, _ = case.extract("Das OVG Schleswig (1 KN 19/09) und OVG Schleswig (1 KN 20/09).")
+    assert c[0].court == "OVG Schleswig"
+    assert c[0].court is c[1].court
+
+
+def test_columns_with_shared_vocab_use_global_ids():
+    cits, _ = RegexLawExtractor().extract("Gemäß § 433 BGB gilt.")
+    table = ExtractionResult(citations=cits).to_columns(shared_vocab=True)
+    assert table.book_id[0] == get_book_vocabulary().id_of("bgb")
+    assert table.book(0) == "bgb"
+
+
+def test_vocabulary_concurrent_inserts_get_distinct_ids():
+    vocab = Vocabulary()
+    values = [f"court {i}" for i in range(2000)]
+
+    def insert(offset):
+        for i in range(len(values)):
+            vocab.id_of(values[(i + offset) % len(values)])
+
+    threads = [threading.Thread(target=insert, args=(k * 397,)) for k in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(vocab) == len(values)
+    assert sorted(vocab.id_of(v) for v in values) == list(range(len(values)))
+    assert all(vocab.value(vocab.id_of(v)) == v for v in values)
+
+
+def test_columns_fall_back_to_table_ids_when_shared_vocab_full(monkeypatch):
+    full = Vocabulary(["bgb"], max_size=1)
+    monkeypatch.setattr(citations_module, "get_book_vocabulary", lambda: full)
+    cits, _ = RegexLawExtractor().extract("Gemäß § 433 BGB und § 1 ZPO gilt.")
+    table = ExtractionResult(citations=cits).to_columns(shared_vocab=True)
+    assert [table.book(i) for i in range(len(table))] == ["bgb", "zpo"]
+    assert table.books is not full.values